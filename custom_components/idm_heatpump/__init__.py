@@ -1,7 +1,42 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v0.7.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Gelernte Funktionscodes (Input/Holding) werden pro Gerät persistiert
+- IDMDataUpdateCoordinator mit Polling-Stufen (fast/normal/slow)
+- Coordinator wird beim Entladen heruntergefahren (Debouncer, Timer)
+- Deadband-Filter (pro Sensor-Klasse) + Heartbeat aus den Options in hass.data
+- Als nicht verbaut erkannte Register (Dead-Register) werden pro Gerät persistiert
+- Sofortstart: letzter Snapshot wird geladen, Entities starten mit veralteten
+  Werten, der erste Poll läuft im Hintergrund (statt blockierendem First-Refresh)
+- Mehrere Wärmepumpen (Kaskade): unique_ids und Gerät pro Config-Entry,
+  Migration v5→v6 der Entity-/Geräte-Registry, gemeinsamer IDMPollScheduler
+  staffelt die Polls (WP am selben Host/Port teilen sich eine ModbusConnection)
+- RoomTempForwarder: Timer-/Saison-Durchläufe schreiben alle Heizkreise
+  gemeinsam über write_floats() (benachbarte HK in einem Request), EEPROM-Toleranz
+  weiterhin pro HK; _last_written nur nach erfolgreichem Schreiben
+- EEPROM-Schreibbudget aus den Options an IDMModbusHandler; Schreibzähler
+  werden pro Gerät persistiert
+- RoomTempForwarder "Bei Änderung": Entprellung pro HK (ein geplanter Flush
+  statt eines Tasks pro Event, Mindestabstand aus den Options, letzter Wert
+  wird nachgeschrieben); HK-Zuordnung über vorberechnetes entity_id→HK-Dict
+- RoomTempForwarder: zuletzt geschriebene Werte werden pro Gerät persistiert und
+  beim Start per Read-Back mit der WP abgeglichen; Options-Reload schreibt kein
+  -1.0 mehr für weiterhin übernommene Heizkreise
+- Unit ID, Host und Port aus den Options werden übernommen; eine
+  ModbusConnection pro Host/Port wird von allen Wärmepumpen (Unit IDs) eines
+  Gateways geteilt
+- RegisterPlan wird einmal pro Config-Entry gebaut (hass.data "register_plan") und
+  von Coordinator, Plattformen und build_expected_unique_ids() geteilt
+- Erwartete unique_ids ohne eigene Liste: die Entity-Tabelle (descriptions.py)
+  liefert sie über den RegisterPlan, nur Raumtemperatur-Entities kommen hinzu
+- RoomTempForwarder.set_offset(): unveränderter Offset und Restore vor
+  async_start() lösen keinen Schreibvorgang aus (kein Rewrite bei jedem Reload)
+- Pipeline-Tiefe aus den Options an IDMModbusHandler (Pool der geteilten ModbusConnection)
+- Fehlgeschlagener erster Poll (ConfigEntryNotReady): Unit ID wird von der geteilten
+  Verbindung abgemeldet und der letzte Nutzer entfernt sie aus hass.data
 
 Änderungen v0.7.0:
 - Temperatur-Offset pro HK (Number-Entity, ±5°C)
@@ -17,6 +52,8 @@ Stand: 2026-02-26
 
 import logging
 from datetime import timedelta, date, time, datetime
+from functools import partial
+from time import monotonic as time_monotonic
 
 from homeassistant.const import (
     Platform,
@@ -24,13 +61,15 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_state_change_event,
     async_track_time_interval,
     async_track_time_change,
 )
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
     DOMAIN,
@@ -58,13 +97,52 @@ from .const import (
     DEFAULT_ROOM_TEMP_SEASON_END_DAY,
     CONF_ROOM_TEMP_OFFSETS,
     DEFAULT_ROOM_TEMP_OFFSETS,
+    CONF_ROOM_TEMP_MIN_INTERVAL,
+    DEFAULT_ROOM_TEMP_MIN_INTERVAL,
     ROOM_TEMP_OFFSET_DEFAULT,
     ROOM_TEMP_WRITE_TOLERANCE,
     ROOM_TEMP_NO_SENSOR,
     hc_room_temp_write_reg,
-    build_register_map,
+    CONF_FAST_INTERVAL,
+    DEFAULT_FAST_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    CONF_REGISTER_TIERS,
+    DEFAULT_REGISTER_TIERS,
+    TIER_FAST,
+    TIER_NORMAL,
+    TIER_SLOW,
+    STORAGE_VERSION,
+    STORAGE_KEY_DEAD_REGISTERS,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_KEY_WRITE_COUNTS,
+    STORAGE_KEY_ROOM_TEMP,
+    STORAGE_SAVE_DELAY,
+    CONF_WRITE_BUDGET,
+    DEFAULT_WRITE_BUDGET,
+    CONF_PIPELINE_DEPTH,
+    DEFAULT_PIPELINE_DEPTH,
+    DEADBAND_OPTIONS,
+    DEFAULT_DEADBANDS,
+    CONF_DEADBAND_HEARTBEAT,
+    DEFAULT_DEADBAND_HEARTBEAT,
+    STORAGE_KEY_FUNCTION_CODES,
+    DATA_POLL_SCHEDULER,
+    DATA_MODBUS_CONNECTIONS,
+    DEFAULT_DEVICE_NAME,
+    LEGACY_DEVICE_ID,
+    scoped_unique_id,
 )
-from .modbus_handler import IDMModbusHandler
+from .coordinator import IDMDataUpdateCoordinator
+from .modbus_handler import IDMModbusHandler, ModbusConnection
+from .register_plan import RegisterPlan, build_register_plan
+from .scheduler import IDMPollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -86,7 +164,14 @@ class RoomTempForwarder:
     Features:
     - Schreib-Intervall: bei State-Änderung, Timer (5–60 Min.) oder Deaktiviert
     - Temperatur-Offset pro HK: Wert wird vor dem Schreiben addiert (v0.7.0)
-    - EEPROM-Schutz: nur bei Differenz > 0.1°C schreiben
+    - EEPROM-Schutz: nur bei Differenz > 0.1°C schreiben (pro HK)
+    - Alle Heizkreise eines Durchlaufs werden gemeinsam geschrieben; benachbarte
+      Register (1650+i*2) in einem Modbus-Request
+    - "Bei Änderung": Events werden pro HK entprellt – höchstens ein Write je
+      min_interval, der letzte Wert wird am Ende des Intervalls nachgeschrieben
+    - Zuletzt geschriebene Werte werden pro Gerät persistiert und beim Start mit
+      den Registern der WP abgeglichen (Read-Back) – kein erneutes Schreiben
+      nach Neustart/Reload
     - Offline-Erkennung: -1.0 schreiben wenn Sensor unavailable
     - Saisonale Automatik: aktiv nur innerhalb Saison-Zeitraum
     - Master-Switch: manuell AUS übersteuert Saison-Automatik
@@ -101,29 +186,49 @@ class RoomTempForwarder:
         season_enabled: bool,
         season_start: tuple[int, int],
         season_end: tuple[int, int],
+        entry_id: str | None = None,
+        min_interval: float = DEFAULT_ROOM_TEMP_MIN_INTERVAL,
+        store: Store | None = None,
     ):
         self._hass = hass
         self._client = client
+        self.entry_id = entry_id  # Saison-Events gelten nur für diese WP
         self._entity_map = entity_map  # {"A": "sensor.xxx", "C": "sensor.yyy"}
+        self._hc_by_entity = {eid: hc for hc, eid in entity_map.items()}
+        self._min_interval = max(0.0, float(min_interval))
         self._interval = interval
         self._season_enabled = season_enabled
         self._season_start = season_start  # (month, day)
         self._season_end = season_end      # (month, day)
 
         self._last_written: dict[str, float | None] = {}
+        self._store = store  # persistiert _last_written pro Gerät
         self._unsub_listeners: list = []
         self._master_switch_on = True
         self._manual_override = False  # True wenn manuell ausgeschaltet
         self._offsets: dict[str, float] = {}  # {"A": -2.0, "C": 1.5}
+        self._started = False  # erst nach async_start() wird geschrieben
+
+        # Entprellung "Bei Änderung" (pro HK)
+        self._pending_states: dict[str, str] = {}  # letzter noch nicht geschriebener State
+        self._flush_unsubs: dict = {}  # {hc: unsub} geplanter Flush
+        self._last_flush: dict[str, float] = {}  # monotonic
 
     def get_offset(self, hc: str) -> float:
         """Liefert den aktuellen Offset für einen Heizkreis."""
         return self._offsets.get(hc, ROOM_TEMP_OFFSET_DEFAULT)
 
     def set_offset(self, hc: str, value: float):
-        """Setzt den Offset für einen Heizkreis und triggert Neuschreibung."""
+        """Setzt den Offset für einen Heizkreis und triggert Neuschreibung.
+
+        Vor async_start() (Restore der Offset-Entities beim Start/Reload) wird
+        nur der Wert übernommen; den einen, mit dem Cache abgeglichenen
+        Schreibvorgang macht async_start().
+        """
         old = self._offsets.get(hc, ROOM_TEMP_OFFSET_DEFAULT)
         self._offsets[hc] = value
+        if value == old or not self._started:
+            return
         _LOGGER.info(
             "Raumtemperatur-Offset HK %s: %.1f → %.1f°C",
             hc, old, value,
@@ -171,12 +276,52 @@ class RoomTempForwarder:
             _LOGGER.info("Raumtemperatur-Übernahme: Master-Switch AUS (manuell)")
             self._hass.async_create_task(self._write_all_inactive())
 
+    async def async_load_last_written(self):
+        """Lädt die zuletzt geschriebenen Werte und gleicht sie mit der WP ab.
+
+        Gespeicherte Werte gelten nur für dasselbe Gerät. Der Read-Back der
+        Register 1650+i*2 hat Vorrang: so wird auch ein zwischenzeitlich am
+        Navigator oder von einer anderen Instanz geänderter Wert erkannt.
+        """
+        if self._store is not None:
+            stored = await self._store.async_load()
+            if stored and stored.get("device") == self._client.device_key:
+                self._last_written.update(stored.get("last_written", {}))
+
+        for hc in self._entity_map:
+            value = await self._client.read_float(hc_room_temp_write_reg(hc))
+            if value is None:
+                continue
+            value = round(value, 1)
+            if self._last_written.get(hc) != value:
+                _LOGGER.debug(
+                    "Raumtemperatur HK %s: Read-Back %.1f°C (Cache: %s)",
+                    hc, value, self._last_written.get(hc),
+                )
+            self._last_written[hc] = value
+
+    def _async_save_last_written(self):
+        """Persistiert die zuletzt geschriebenen Werte (verzögert)."""
+        if self._store is None:
+            return
+        data = self._last_written_data()
+        self._store.async_delay_save(lambda: data, STORAGE_SAVE_DELAY)
+
+    def _last_written_data(self) -> dict:
+        return {
+            "device": self._client.device_key,
+            "last_written": dict(self._last_written),
+        }
+
     async def async_start(self):
         """Startet die Listener/Timer."""
         if not self._entity_map:
             _LOGGER.debug("Raumtemperatur-Übernahme: Keine Sensoren konfiguriert")
             return
 
+        await self.async_load_last_written()
+        self._started = True
+
         if self._interval == "disabled":
             _LOGGER.info(
                 "Raumtemperatur-Übernahme: Deaktiviert (Sensoren konfiguriert, aber Intervall=Deaktiviert)"
@@ -225,31 +370,65 @@ class RoomTempForwarder:
         else:
             await self._write_all_inactive()
 
-    async def async_stop(self):
-        """Stoppt alle Listener/Timer und schreibt -1.0."""
+    async def async_stop(self, keep: set[str] | frozenset = frozenset()):
+        """Stoppt alle Listener/Timer und schreibt -1.0.
+
+        Heizkreise in keep behalten ihren Wert (Reload mit weiterhin aktiver
+        Übernahme); der neue Forwarder übernimmt sie über den gespeicherten
+        Cache, statt -1.0 und danach wieder den echten Wert zu schreiben.
+        """
+        self._started = False
         for unsub in self._unsub_listeners:
             unsub()
         self._unsub_listeners.clear()
-        await self._write_all_inactive()
+        for unsub in self._flush_unsubs.values():
+            unsub()
+        self._flush_unsubs.clear()
+        self._pending_states.clear()
+        release = [hc for hc in self._entity_map if hc not in keep]
+        if release:
+            await self._write_values(dict.fromkeys(release, ROOM_TEMP_NO_SENSOR))
+        if self._store is not None:
+            await self._store.async_save(self._last_written_data())
         _LOGGER.info("Raumtemperatur-Übernahme: Gestoppt")
 
     @callback
     def _async_state_changed(self, event):
-        """Callback bei State-Änderung eines Quell-Sensors."""
+        """Callback bei State-Änderung eines Quell-Sensors.
+
+        Merkt sich nur den neuesten State und plant höchstens einen Flush pro
+        HK: sofort, wenn der letzte Write länger als min_interval zurückliegt,
+        sonst am Ende des Intervalls (Trailing Edge).
+        """
         if not self.is_active:
             return
-        entity_id = event.data.get("entity_id")
         new_state = event.data.get("new_state")
         if new_state is None:
             return
+        hc = self._hc_by_entity.get(event.data.get("entity_id"))
+        if hc is None:
+            return
 
-        # Finde den zugehörigen Heizkreis
-        for hc, eid in self._entity_map.items():
-            if eid == entity_id:
-                self._hass.async_create_task(
-                    self._write_single(hc, new_state.state)
-                )
-                break
+        self._pending_states[hc] = new_state.state
+        if hc in self._flush_unsubs:
+            return  # Flush bereits geplant – nimmt den neuesten State mit
+
+        last = self._last_flush.get(hc)
+        delay = 0.0
+        if last is not None:
+            delay = max(0.0, last + self._min_interval - time_monotonic())
+        self._flush_unsubs[hc] = async_call_later(
+            self._hass, delay, partial(self._async_flush, hc),
+        )
+
+    async def _async_flush(self, hc: str, _now=None):
+        """Schreibt den zuletzt gemeldeten State eines HK."""
+        self._flush_unsubs.pop(hc, None)
+        state_value = self._pending_states.pop(hc, None)
+        if state_value is None or not self.is_active:
+            return
+        self._last_flush[hc] = time_monotonic()
+        await self._write_single(hc, state_value)
 
     async def _async_timer_tick(self, now=None):
         """Timer-Callback: Alle konfigurierten Werte schreiben."""
@@ -272,7 +451,7 @@ class RoomTempForwarder:
             # Switch-State aktualisieren
             self._hass.bus.async_fire(
                 f"{DOMAIN}_room_temp_season_changed",
-                {"active": True},
+                {"active": True, "entry_id": self.entry_id},
             )
         elif not in_season and was_on:
             _LOGGER.info("Raumtemperatur-Übernahme: Saison beendet – deaktiviere")
@@ -280,16 +459,19 @@ class RoomTempForwarder:
             await self._write_all_inactive()
             self._hass.bus.async_fire(
                 f"{DOMAIN}_room_temp_season_changed",
-                {"active": False},
+                {"active": False, "entry_id": self.entry_id},
             )
 
     async def _write_single(self, hc: str, state_value: str):
         """Schreibt einen einzelnen Temperaturwert mit EEPROM-Schutz und Offset."""
-        register = hc_room_temp_write_reg(hc)
+        value = self._target_value(hc, state_value)
+        if value is not None:
+            await self._write_values({hc: value})
 
+    def _target_value(self, hc: str, state_value: str) -> float | None:
+        """Zu schreibender Wert für einen HK (inkl. Offset), None bei ungültigem State."""
         if state_value in (STATE_UNAVAILABLE, STATE_UNKNOWN, None, ""):
-            await self._write_if_changed(hc, register, ROOM_TEMP_NO_SENSOR)
-            return
+            return ROOM_TEMP_NO_SENSOR
 
         try:
             temp = round(float(state_value), 1)
@@ -298,7 +480,7 @@ class RoomTempForwarder:
                 "Raumtemperatur HK %s: Ungültiger Wert '%s' von %s",
                 hc, state_value, self._entity_map.get(hc),
             )
-            return
+            return None
 
         # Offset anwenden (v0.7.0)
         offset = self.get_offset(hc)
@@ -309,42 +491,51 @@ class RoomTempForwarder:
                 "Raumtemperatur HK %s: %.1f°C + Offset %.1f°C = %.1f°C",
                 hc, temp, offset, adjusted_temp,
             )
+        return adjusted_temp
 
-        await self._write_if_changed(hc, register, adjusted_temp)
-
-    async def _write_if_changed(self, hc: str, register: int, value: float):
-        """Schreibt nur wenn Differenz > Toleranz (EEPROM-Schutz)."""
+    def _needs_write(self, hc: str, value: float) -> bool:
+        """EEPROM-Schutz: nur schreiben wenn Differenz > Toleranz."""
         last = self._last_written.get(hc)
+        return last is None or abs(value - last) > ROOM_TEMP_WRITE_TOLERANCE
 
-        if last is not None:
-            if abs(value - last) <= ROOM_TEMP_WRITE_TOLERANCE:
-                return
+    async def _write_values(self, values: dict[str, float]):
+        """Schreibt die geänderten Werte {hc: wert} gemeinsam.
 
-        try:
-            await self._client.write_float(register, value)
-            self._last_written[hc] = value
+        Die Toleranz wird pro HK geprüft; die verbleibenden Register
+        (1650+i*2) gehen über write_floats() raus – benachbarte Heizkreise
+        in einem Request.
+        """
+        values = {hc: value for hc, value in values.items() if self._needs_write(hc, value)}
+        if not values:
+            return
+
+        registers = {hc_room_temp_write_reg(hc): value for hc, value in values.items()}
+        if await self._client.write_floats(registers):
+            self._last_written.update(values)
+            self._async_save_last_written()
             _LOGGER.debug(
-                "Raumtemperatur HK %s: %.1f°C → Register %d",
-                hc, value, register,
+                "Raumtemperatur: %s → Register %s",
+                ", ".join(f"HK {hc} {value:.1f}°C" for hc, value in values.items()),
+                sorted(registers),
             )
-        except Exception as e:
+        else:
             _LOGGER.error(
-                "Raumtemperatur HK %s: Schreibfehler Register %d: %s",
-                hc, register, e,
+                "Raumtemperatur: Schreibfehler Register %s", sorted(registers),
             )
 
     async def _write_all_active(self):
-        """Liest alle konfigurierten Sensoren und schreibt die Werte."""
+        """Liest alle konfigurierten Sensoren und schreibt die Werte gemeinsam."""
+        values = {}
         for hc, entity_id in self._entity_map.items():
             state = self._hass.states.get(entity_id)
-            state_value = state.state if state else STATE_UNAVAILABLE
-            await self._write_single(hc, state_value)
+            value = self._target_value(hc, state.state if state else STATE_UNAVAILABLE)
+            if value is not None:
+                values[hc] = value
+        await self._write_values(values)
 
     async def _write_all_inactive(self):
-        """Schreibt -1.0 in alle konfigurierten Register."""
-        for hc in self._entity_map:
-            register = hc_room_temp_write_reg(hc)
-            await self._write_if_changed(hc, register, ROOM_TEMP_NO_SENSOR)
+        """Schreibt -1.0 in alle konfigurierten Register (gemeinsam)."""
+        await self._write_values(dict.fromkeys(self._entity_map, ROOM_TEMP_NO_SENSOR))
         _LOGGER.info("Raumtemperatur-Übernahme: -1.0 in alle Register geschrieben")
 
 
@@ -353,37 +544,19 @@ class RoomTempForwarder:
 # ===================================================================
 
 def build_expected_unique_ids(
-    heating_circuits: list[str],
-    sensor_groups: list[str],
+    plan: RegisterPlan,
     room_temp_entities: dict | None = None,
+    device_id: str | None = None,
 ) -> set[str]:
     """Erzeugt die Menge aller unique_ids, die bei der aktuellen Konfiguration
-    existieren sollen. Wird zum Aufräumen verwaister Entitäten verwendet."""
-
-    ids: set[str] = set()
-
-    # --- Basis-Sensoren (immer) ---
-    ids.update([
-        "idm_aussentemperatur", "idm_aussentemperatur_gemittelt",
-        "idm_wp_vorlauf", "idm_ruecklauf", "idm_ladefuehler",
-        "idm_durchfluss", "idm_luftansaug", "idm_luftansaug_2",
-        "idm_waermespeicher", "idm_ww_oben", "idm_ww_unten",
-        "idm_ww_zapftemp", "idm_interne_meldung",
-        "idm_betriebsart_warmepumpe", "idm_status_warmepumpe",
-        "idm_wp_power", "idm_thermische_leistung",
-        "idm_en_heizen", "idm_en_gesamt", "idm_en_kuehlen",
-        "idm_en_warmwasser", "idm_en_abtauung", "idm_en_passivkuehlung",
-        "idm_en_solar", "idm_en_eheizer",
-    ])
+    existieren sollen. Wird zum Aufräumen verwaister Entitäten verwendet.
 
-    # --- Basis-Numbers (immer) ---
-    ids.update(["idm_ww_target", "idm_ww_start", "idm_ww_stop"])
+    Alle Entities der Entity-Tabelle stammen aus dem Register-Plan
+    (plan.unique_ids), hier kommen nur die Raumtemperatur-Entities hinzu,
+    die von der Forwarder-Konfiguration abhängen.
+    Mit device_id werden die unique_ids des Config-Entries geliefert."""
 
-    # --- Basis-Selects (immer) ---
-    ids.add("idm_betriebsart")
-
-    # --- Basis-Switches (immer) ---
-    ids.update(["idm_heat_request", "idm_ww_request", "idm_ww_onetime"])
+    ids: set[str] = set(plan.unique_ids)
 
     # --- Raumtemperatur-Master-Switch (wenn Entities konfiguriert) ---
     if room_temp_entities:
@@ -393,86 +566,15 @@ def build_expected_unique_ids(
             key = hc.lower()
             ids.add(f"idm_hk{key}_room_temp_offset")
 
-    # --- Pro Heizkreis (immer) ---
-    for hc in heating_circuits:
-        key = hc.lower()
-        ids.update([
-            f"idm_hk{key}_vorlauftemperatur",
-            f"idm_hk{key}_soll_vorlauf",
-            f"idm_hk{key}_aktive_betriebsart",
-        ])
-        ids.update([
-            f"idm_hk{key}_temp_normal",
-            f"idm_hk{key}_temp_eco",
-            f"idm_hk{key}_curve",
-            f"idm_hk{key}_parallel",
-            f"idm_hk{key}_heat_limit",
-        ])
-        ids.add(f"idm_hk{key}_betriebsart")
-
-    # --- Solar-Gruppe ---
-    if "solar" in sensor_groups:
-        ids.update([
-            "idm_solar_kollektor", "idm_solar_ruecklauf",
-            "idm_solar_ladetemp", "idm_solar_leistung",
-            "idm_solar_betriebsart",
-        ])
-
-    # --- PV/Batterie-Gruppe ---
-    if "pv_battery" in sensor_groups:
-        ids.update([
-            "idm_pv_ueberschuss", "idm_e_heizstab",
-            "idm_pv_produktion", "idm_hausverbrauch",
-            "idm_batterie_entladung", "idm_batterie_fuellstand",
-            "idm_smartgrid_status", "idm_strompreis",
-            "idm_pv_zielwert",
-        ])
-
-    # --- Kühlungs-Gruppe ---
-    if "cooling" in sensor_groups:
-        ids.update([
-            "idm_kuehlanforderung_wp", "idm_ww_anforderung_wp",
-            "idm_cool_request",
-        ])
-        for hc in heating_circuits:
-            key = hc.lower()
-            ids.update([
-                f"idm_hk{key}_cool_normal",
-                f"idm_hk{key}_cool_eco",
-                f"idm_hk{key}_cool_limit",
-                f"idm_hk{key}_cool_vl",
-            ])
-
-    # --- Diagnose-Gruppe ---
-    if "diagnostic" in sensor_groups:
-        ids.update([
-            "idm_summenstoerung", "idm_evu_sperre",
-            "idm_verdichter_1", "idm_ladepumpe",
-            "idm_variabler_eingang", "idm_umschaltventil",
-            "idm_zirkulationspumpe", "idm_leistungsbegrenzung",
-        ])
-
-    # --- Einzelraumregelung-Gruppe ---
-    if "room_control" in sensor_groups:
-        ids.add("idm_feuchtesensor")
-        for hc in heating_circuits:
-            key = hc.lower()
-            ids.add(f"idm_hk{key}_raumtemperatur")
-
-    # --- Erweiterte Temperaturen-Gruppe ---
-    if "extended_temps" in sensor_groups:
-        ids.update([
-            "idm_luftwaermetauscher", "idm_waermesenke_ruecklauf",
-            "idm_waermesenke_vorlauf", "idm_kaeltespeicher",
-        ])
-
+    if device_id is not None:
+        return {scoped_unique_id(device_id, key) for key in ids}
     return ids
 
 
-async def _async_cleanup_entities(hass, entry, heating_circuits, sensor_groups, room_temp_entities):
+async def _async_cleanup_entities(hass, entry, plan, room_temp_entities):
     """Entfernt verwaiste Entitäten, die nicht mehr zur Konfiguration gehören."""
     registry = er.async_get(hass)
-    expected = build_expected_unique_ids(heating_circuits, sensor_groups, room_temp_entities)
+    expected = build_expected_unique_ids(plan, room_temp_entities, entry.entry_id)
 
     entries = er.async_entries_for_config_entry(registry, entry.entry_id)
     removed = 0
@@ -507,18 +609,43 @@ async def async_setup_entry(hass, entry):
     hass.data.setdefault(DOMAIN, {})
 
     # --- Konfiguration auslesen ---
-    host = entry.data["host"]
-    port = entry.data.get("port", 502)
-    unit_id = entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+    host = _get_config(entry, "host")
+    port = _get_config(entry, "port", 502)
+    unit_id = _get_config(entry, CONF_UNIT_ID, DEFAULT_UNIT_ID)
 
     update_interval = _get_config(entry, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
     heating_circuits = _get_config(entry, CONF_HEATING_CIRCUITS, DEFAULT_HEATING_CIRCUITS)
     sensor_groups = _get_config(entry, CONF_SENSOR_GROUPS, DEFAULT_SENSOR_GROUPS)
+    tier_intervals = {
+        TIER_FAST: _get_config(entry, CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+        TIER_NORMAL: update_interval,
+        TIER_SLOW: _get_config(entry, CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+    }
+    register_tier_overrides = _get_config(entry, CONF_REGISTER_TIERS, DEFAULT_REGISTER_TIERS)
+    write_budget = _get_config(entry, CONF_WRITE_BUDGET, DEFAULT_WRITE_BUDGET)
+    pipeline_depth = _get_config(entry, CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH)
+    adaptive_bounds = None
+    if _get_config(entry, CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING):
+        adaptive_bounds = (
+            _get_config(entry, CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL),
+            _get_config(entry, CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+        )
+
+    # Deadband-Filter pro Sensor-Klasse: {klasse: (absolut, relativ %)}
+    deadbands = {
+        device_class: (
+            float(_get_config(entry, conf_abs, DEFAULT_DEADBANDS[device_class][0])),
+            float(_get_config(entry, conf_rel, DEFAULT_DEADBANDS[device_class][1])),
+        )
+        for device_class, (conf_abs, conf_rel) in DEADBAND_OPTIONS.items()
+    }
+    deadband_heartbeat = _get_config(entry, CONF_DEADBAND_HEARTBEAT, DEFAULT_DEADBAND_HEARTBEAT)
 
     # Raumtemperatur-Übernahme Konfiguration
     room_temp_entities = _get_config(entry, CONF_ROOM_TEMP_ENTITIES, DEFAULT_ROOM_TEMP_ENTITIES)
     room_temp_interval = _get_config(entry, CONF_ROOM_TEMP_INTERVAL, DEFAULT_ROOM_TEMP_INTERVAL)
     room_temp_offsets = _get_config(entry, CONF_ROOM_TEMP_OFFSETS, DEFAULT_ROOM_TEMP_OFFSETS)
+    room_temp_min_interval = _get_config(entry, CONF_ROOM_TEMP_MIN_INTERVAL, DEFAULT_ROOM_TEMP_MIN_INTERVAL)
     season_enabled = _get_config(entry, CONF_ROOM_TEMP_SEASON_ENABLED, DEFAULT_ROOM_TEMP_SEASON_ENABLED)
     season_start = (
         _get_config(entry, CONF_ROOM_TEMP_SEASON_START_MONTH, DEFAULT_ROOM_TEMP_SEASON_START_MONTH),
@@ -529,36 +656,86 @@ async def async_setup_entry(hass, entry):
         _get_config(entry, CONF_ROOM_TEMP_SEASON_END_DAY, DEFAULT_ROOM_TEMP_SEASON_END_DAY),
     )
 
-    # --- Geteilter Modbus-Client ---
-    client = IDMModbusHandler(host, port, unit_id)
-    await client.connect()
+    # --- Modbus-Client; TCP-Verbindung pro Host/Port geteilt (Gateway, mehrere Unit IDs) ---
+    connections = hass.data.setdefault(DATA_MODBUS_CONNECTIONS, {})
+    connection = connections.get(f"{host}:{port}")
+    if connection is None:
+        connection = connections[f"{host}:{port}"] = ModbusConnection(host, port)
+    client = IDMModbusHandler(
+        host, port, unit_id, write_budget, connection=connection,
+        pipeline_depth=pipeline_depth,
+    )
+
+    # --- Gelernte Funktionscodes (Input/Holding) laden ---
+    fc_store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_FUNCTION_CODES}.{entry.entry_id}")
+    stored = await fc_store.async_load()
+    if stored and stored.get("device") == client.device_key:
+        client.load_function_codes(stored.get("function_codes", {}))
+
+    dead_store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_DEAD_REGISTERS}.{entry.entry_id}")
+    snapshot_store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_SNAPSHOT}.{entry.entry_id}")
+
+    # --- EEPROM-Schreibzähler (Tag/Woche, Token-Buckets) laden ---
+    write_count_store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_WRITE_COUNTS}.{entry.entry_id}")
+    stored = await write_count_store.async_load()
+    if stored and stored.get("device") == client.device_key:
+        client.write_budget.load(stored)
 
-    # --- Register-Map aufbauen (Basis + Gruppen + HK) ---
-    register_map = build_register_map(heating_circuits, sensor_groups)
+    # --- Gemeinsamer Poll-Scheduler aller Wärmepumpen (gestaffelte Polls) ---
+    scheduler = hass.data.get(DATA_POLL_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = IDMPollScheduler()
+
+    # --- Register-Plan einmalig aufbauen (Basis + Gruppen + HK) ---
+    plan = build_register_plan(heating_circuits, sensor_groups, register_tier_overrides)
     _LOGGER.info(
         "iDM Coordinator: %d Register für HK %s, Gruppen %s",
-        len(register_map),
+        len(plan),
         heating_circuits,
         sensor_groups,
     )
 
-    # --- DataUpdateCoordinator ---
-    async def _async_update_data():
-        try:
-            data = await client.read_all(register_map)
-            return data
-        except Exception as err:
-            raise UpdateFailed(f"Modbus-Fehler: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
+    # --- DataUpdateCoordinator (Polling-Stufen) ---
+    coordinator = IDMDataUpdateCoordinator(
         hass,
-        _LOGGER,
+        client,
+        plan,
+        tier_intervals,
         name=f"iDM W\u00e4rmepumpe ({host})",
-        update_method=_async_update_data,
-        update_interval=timedelta(seconds=update_interval),
+        function_code_store=fc_store,
+        dead_register_store=dead_store,
+        snapshot_store=snapshot_store,
+        write_count_store=write_count_store,
+        adaptive_bounds=adaptive_bounds,
+        device_id=entry.entry_id,
+        device_name=entry.title or DEFAULT_DEVICE_NAME,
+        scheduler=scheduler,
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # --- Als nicht verbaut erkannte Register laden ---
+    stored = await dead_store.async_load()
+    if stored and stored.get("device") == client.device_key:
+        coordinator.load_dead_registers(stored.get("dead_registers", []))
+
+    # --- Letzten Snapshot laden: Sofortstart, erster Poll im Hintergrund ---
+    stored = await snapshot_store.async_load()
+    if (
+        stored
+        and stored.get("device") == client.device_key
+        and coordinator.restore_snapshot(stored)
+    ):
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} erster Poll {host}",
+        )
+    else:
+        try:
+            await client.connect()
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Unit ID wieder von der (ggf. geteilten) Verbindung abmelden,
+            # sonst bleibt der Slot bis zum nächsten Setup-Versuch belegt
+            await _async_release_client(hass, client)
+            raise
 
     # --- RoomTempForwarder erstellen ---
     forwarder = None
@@ -571,16 +748,24 @@ async def async_setup_entry(hass, entry):
             season_enabled=season_enabled,
             season_start=season_start,
             season_end=season_end,
+            entry_id=entry.entry_id,
+            min_interval=room_temp_min_interval,
+            store=Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_ROOM_TEMP}.{entry.entry_id}"),
         )
 
+    scheduler.register(entry.entry_id)
+
     # --- Alles in hass.data ablegen ---
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "client": client,
         "host": host,
+        "register_plan": plan,
         "heating_circuits": heating_circuits,
         "sensor_groups": sensor_groups,
         "update_interval": update_interval,
+        "deadbands": deadbands,
+        "deadband_heartbeat": deadband_heartbeat,
         "room_temp_entities": room_temp_entities,
         "room_temp_forwarder": forwarder,
         "room_temp_offsets": room_temp_offsets,
@@ -595,32 +780,72 @@ async def async_setup_entry(hass, entry):
         await forwarder.async_start()
 
     # Verwaiste Entitäten aufräumen
-    await _async_cleanup_entities(hass, entry, heating_circuits, sensor_groups, room_temp_entities)
+    await _async_cleanup_entities(hass, entry, plan, room_temp_entities)
 
     return True
 
 
 async def _async_update_listener(hass, entry):
     _LOGGER.info("iDM W\u00e4rmepumpe: Options ge\u00e4ndert, Integration wird neu geladen")
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None:
+        entry_data["reloading"] = True
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _room_temp_circuits_kept(entry) -> set[str]:
+    """Heizkreise, die nach einem Options-Reload weiter übernommen werden."""
+    if _get_config(entry, CONF_ROOM_TEMP_INTERVAL, DEFAULT_ROOM_TEMP_INTERVAL) == "disabled":
+        return set()
+    return set(_get_config(entry, CONF_ROOM_TEMP_ENTITIES, DEFAULT_ROOM_TEMP_ENTITIES))
+
+
+async def _async_release_client(hass, client):
+    """Meldet den Handler ab; die letzte Unit ID schließt die geteilte Verbindung."""
+    await client.close()
+    connections = hass.data.get(DATA_MODBUS_CONNECTIONS, {})
+    key = f"{client.host}:{client.port}"
+    if key in connections and not connections[key].units:
+        connections.pop(key)
+        _LOGGER.info("iDM Modbus-Verbindung geschlossen")
+
+
 async def async_unload_entry(hass, entry):
     # Forwarder stoppen
     entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
     forwarder = entry_data.get("room_temp_forwarder")
     if forwarder:
-        await forwarder.async_stop()
+        # Bei Options-Reload kein -1.0 für weiter übernommene HK (EEPROM)
+        keep = _room_temp_circuits_kept(entry) if entry_data.get("reloading") else set()
+        await forwarder.async_stop(keep)
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         entry_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if entry_data and "coordinator" in entry_data:
+            await entry_data["coordinator"].async_shutdown()
         if entry_data and "client" in entry_data:
-            await entry_data["client"].close()
-            _LOGGER.info("iDM Modbus-Verbindung geschlossen")
+            await _async_release_client(hass, entry_data["client"])
+        scheduler = hass.data.get(DATA_POLL_SCHEDULER)
+        if scheduler is not None:
+            scheduler.unregister(entry.entry_id)
+            if not scheduler.members:
+                hass.data.pop(DATA_POLL_SCHEDULER)
     return unload_ok
 
 
+async def async_remove_entry(hass, entry):
+    """Entfernt persistierte Gerätedaten beim Löschen der Integration."""
+    for key in (
+        STORAGE_KEY_FUNCTION_CODES,
+        STORAGE_KEY_DEAD_REGISTERS,
+        STORAGE_KEY_SNAPSHOT,
+        STORAGE_KEY_WRITE_COUNTS,
+        STORAGE_KEY_ROOM_TEMP,
+    ):
+        await Store(hass, STORAGE_VERSION, f"{key}.{entry.entry_id}").async_remove()
+
+
 # ===================================================================
 # Migration
 # ===================================================================
@@ -668,4 +893,35 @@ async def async_migrate_entry(hass, config_entry):
             config_entry, data=new_data, version=5
         )
 
+    if config_entry.version == 5:
+        _LOGGER.info("Migriere iDM Config von Version 5 → 6")
+        await _async_migrate_device_identity(hass, config_entry)
+        hass.config_entries.async_update_entry(config_entry, version=6)
+
     return True
+
+
+async def _async_migrate_device_identity(hass, config_entry):
+    """Version 5 → 6: unique_ids und Geräte-Identifier pro Config-Entry.
+
+    Bisher waren alle unique_ids feste Strings ("idm_aussentemperatur") und das
+    Gerät hieß immer ("idm_heatpump", "idm_system") – zwei Wärmepumpen
+    kollidierten. Entity-IDs und Historie bleiben bei der Migration erhalten.
+    """
+    device_id = config_entry.entry_id
+    prefix = scoped_unique_id(device_id, "")
+
+    @callback
+    def _migrate_unique_id(entity_entry):
+        if entity_entry.unique_id.startswith(prefix):
+            return None
+        return {"new_unique_id": scoped_unique_id(device_id, entity_entry.unique_id)}
+
+    await er.async_migrate_entries(hass, device_id, _migrate_unique_id)
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, LEGACY_DEVICE_ID)})
+    if device is not None and device_id in device.config_entries:
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, device_id)},
+        )
@@ -1,7 +1,23 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v0.7.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Options-Flow: neuer Schritt "Polling" (Intervalle fast/slow, Register-Stufen)
+- Options-Flow: neuer Schritt "Deadband" (absolut/relativ pro Sensor-Klasse, Heartbeat)
+- Config-Version 6 (unique_ids pro Config-Entry); weitere Wärmepumpen erhalten
+  den Host im Titel/Gerätenamen
+- Options "Polling": EEPROM-Schreibbudget pro Register und Tag
+- Raumtemperatur-Schritt: Mindestabstand pro HK für "Bei Änderung"
+- Duplikat-Prüfung über Host, Port und Unit ID: mehrere Wärmepumpen hinter
+  einem Modbus-TCP-Gateway; Titel dann mit Unit ID
+- Verbindungstest per Modbus-Handshake (async_probe) statt blockierendem
+  socket.create_connection(); neue Fehler "no_response"/"invalid_unit_id",
+  Latenz und Außentemperatur werden im nächsten Schritt angezeigt
+- Hardware-Scan nach dem Verbindungstest: erkannte Heizkreise und
+  Sensor-Gruppen werden im Schritt "Heizkreise & Sensorgruppen" vorausgewählt
+- Options "Polling": Pipeline-Tiefe (parallele Modbus-Verbindungen für Block-Reads)
 
 Änderungen v0.7.0:
 - Schreib-Intervall: "Deaktiviert" als Standard
@@ -14,7 +30,8 @@ Stand: 2026-02-26
 - Config-Version 4
 """
 
-import socket
+import logging
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
@@ -28,10 +45,12 @@ from homeassistant.helpers.selector import (
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
+    ObjectSelector,
 )
 
 from .const import (
     DOMAIN,
+    DEFAULT_DEVICE_NAME,
     DEFAULT_PORT,
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
@@ -58,7 +77,34 @@ from .const import (
     DEFAULT_ROOM_TEMP_SEASON_END_MONTH,
     DEFAULT_ROOM_TEMP_SEASON_END_DAY,
     ROOM_TEMP_INTERVAL_OPTIONS,
+    CONF_FAST_INTERVAL,
+    DEFAULT_FAST_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    CONF_REGISTER_TIERS,
+    DEFAULT_REGISTER_TIERS,
+    POLL_TIERS,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    CONF_WRITE_BUDGET,
+    DEFAULT_WRITE_BUDGET,
+    CONF_PIPELINE_DEPTH,
+    DEFAULT_PIPELINE_DEPTH,
+    MAX_PIPELINE_DEPTH,
+    CONF_ROOM_TEMP_MIN_INTERVAL,
+    DEFAULT_ROOM_TEMP_MIN_INTERVAL,
+    DEADBAND_OPTIONS,
+    DEFAULT_DEADBANDS,
+    CONF_DEADBAND_HEARTBEAT,
+    DEFAULT_DEADBAND_HEARTBEAT,
 )
+from .modbus_handler import ModbusProbeError, async_discover, async_probe
+
+_LOGGER = logging.getLogger(__name__)
 
 # -------------------------------------------------------------------
 # Selektoren
@@ -118,6 +164,14 @@ ROOM_TEMP_INTERVAL_SELECTOR = SelectSelector(
     )
 )
 
+# "Bei Änderung": Mindestabstand pro HK
+ROOM_TEMP_MIN_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=0, max=3600, step=10, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
 MONTH_SELECTOR = NumberSelector(
     NumberSelectorConfig(min=1, max=12, step=1, mode=NumberSelectorMode.BOX)
 )
@@ -126,6 +180,66 @@ DAY_SELECTOR = NumberSelector(
     NumberSelectorConfig(min=1, max=31, step=1, mode=NumberSelectorMode.BOX)
 )
 
+FAST_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=2, max=300, step=1, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+SLOW_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=30, max=3600, step=10, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+# Grenzen für adaptives Polling (schnellste Stufe)
+ADAPTIVE_MIN_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=2, max=60, step=1, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+ADAPTIVE_MAX_INTERVAL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=10, max=900, step=5, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
+# Schreibzugriffe pro Register und Tag (0 = unbegrenzt)
+WRITE_BUDGET_SELECTOR = NumberSelector(
+    NumberSelectorConfig(min=0, max=5000, step=10, mode=NumberSelectorMode.BOX)
+)
+
+# Parallele TCP-Verbindungen für Block-Reads (1 = seriell)
+PIPELINE_DEPTH_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=1, max=MAX_PIPELINE_DEPTH, step=1, mode=NumberSelectorMode.SLIDER,
+    )
+)
+
+# Deadband absolut (°C / kW / kWh) und relativ (%)
+DEADBAND_ABS_SELECTOR = NumberSelector(
+    NumberSelectorConfig(min=0, max=5, step=0.01, mode=NumberSelectorMode.BOX)
+)
+
+DEADBAND_REL_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=0, max=50, step=0.5, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="%",
+    )
+)
+
+DEADBAND_HEARTBEAT_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=60, max=3600, step=60, mode=NumberSelectorMode.BOX,
+        unit_of_measurement="s",
+    )
+)
+
 
 # -------------------------------------------------------------------
 # Schema-Builder
@@ -136,6 +250,7 @@ def _build_room_temp_schema(
     current_entities: dict,
     current_interval: str,
     current_season_enabled: bool,
+    current_min_interval: int = DEFAULT_ROOM_TEMP_MIN_INTERVAL,
 ) -> vol.Schema:
     """Schema für Schritt 3a: Sensoren, Intervall, Saison-Toggle."""
     fields = {}
@@ -152,6 +267,12 @@ def _build_room_temp_schema(
         default=current_interval,
     )] = ROOM_TEMP_INTERVAL_SELECTOR
 
+    # Mindestabstand bei "Bei Änderung"
+    fields[vol.Required(
+        CONF_ROOM_TEMP_MIN_INTERVAL,
+        default=current_min_interval,
+    )] = ROOM_TEMP_MIN_INTERVAL_SELECTOR
+
     # Saisonale Automatik (nur Toggle)
     fields[vol.Required(
         CONF_ROOM_TEMP_SEASON_ENABLED,
@@ -188,6 +309,98 @@ def _build_season_schema(
     })
 
 
+def _build_polling_schema(
+    current_fast: int,
+    current_slow: int,
+    current_tiers: dict,
+    current_adaptive: bool,
+    current_adaptive_min: int,
+    current_adaptive_max: int,
+    current_write_budget: int,
+    current_pipeline_depth: int,
+) -> vol.Schema:
+    """Schema für Options-Schritt "Polling": Stufen-Intervalle + Overrides."""
+    return vol.Schema({
+        vol.Required(CONF_FAST_INTERVAL, default=current_fast): FAST_INTERVAL_SELECTOR,
+        vol.Required(CONF_SLOW_INTERVAL, default=current_slow): SLOW_INTERVAL_SELECTOR,
+        vol.Optional(CONF_REGISTER_TIERS, default=current_tiers): ObjectSelector(),
+        vol.Required(CONF_ADAPTIVE_POLLING, default=current_adaptive): BooleanSelector(),
+        vol.Required(
+            CONF_ADAPTIVE_MIN_INTERVAL, default=current_adaptive_min,
+        ): ADAPTIVE_MIN_INTERVAL_SELECTOR,
+        vol.Required(
+            CONF_ADAPTIVE_MAX_INTERVAL, default=current_adaptive_max,
+        ): ADAPTIVE_MAX_INTERVAL_SELECTOR,
+        vol.Required(
+            CONF_WRITE_BUDGET, default=current_write_budget,
+        ): WRITE_BUDGET_SELECTOR,
+        vol.Required(
+            CONF_PIPELINE_DEPTH, default=current_pipeline_depth,
+        ): PIPELINE_DEPTH_SELECTOR,
+    })
+
+
+def _build_deadband_schema(
+    current_deadbands: dict[str, tuple[float, float]],
+    current_heartbeat: int,
+) -> vol.Schema:
+    """Schema für Options-Schritt "Deadband": absolut/relativ pro Klasse."""
+    fields = {}
+    for device_class, (conf_abs, conf_rel) in DEADBAND_OPTIONS.items():
+        absolute, relative = current_deadbands[device_class]
+        fields[vol.Required(conf_abs, default=absolute)] = DEADBAND_ABS_SELECTOR
+        fields[vol.Required(conf_rel, default=relative)] = DEADBAND_REL_SELECTOR
+    fields[vol.Required(
+        CONF_DEADBAND_HEARTBEAT, default=current_heartbeat,
+    )] = DEADBAND_HEARTBEAT_SELECTOR
+    return vol.Schema(fields)
+
+
+def _parse_register_tiers(value) -> dict[str, str] | None:
+    """Prüft {adresse: stufe}-Overrides. None bei ungültiger Eingabe."""
+    if not value:
+        return {}
+    if not isinstance(value, dict):
+        return None
+    tiers = {}
+    for address, tier in value.items():
+        try:
+            address = int(address)
+        except (TypeError, ValueError):
+            return None
+        if tier not in POLL_TIERS:
+            return None
+        tiers[str(address)] = tier
+    return tiers
+
+
+def _probe_placeholders(probe: dict | None, unit_id: int) -> dict[str, str]:
+    """Ergebnis des Verbindungstests für die Formular-Beschreibung."""
+    probe = probe or {}
+    latency = probe.get("latency_ms")
+    outdoor = probe.get("outdoor_temp")
+    return {
+        "unit_id": str(unit_id),
+        "latency": f"{latency:.0f}" if latency is not None else "–",
+        "outdoor_temp": f"{outdoor:.1f}" if outdoor is not None else "–",
+    }
+
+
+def _discovery_summary(discovered: tuple[list[str], list[str]] | None) -> str:
+    """Ergebnis des Hardware-Scans als Kurztext (HK + Gruppen)."""
+    if not discovered or not discovered[0]:
+        return "–"
+    circuits, groups = discovered
+    return f"HK {', '.join(circuits)}; {', '.join(groups) or '–'}"
+
+
+def _entry_address(entry) -> tuple[str, int, int]:
+    """(Host, Port, Unit ID) eines Config-Entries (Options vor Data)."""
+    def get(key, default=None):
+        return entry.options.get(key, entry.data.get(key, default))
+    return get(CONF_HOST), get(CONF_PORT, DEFAULT_PORT), get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+
+
 def _extract_room_temp_entities(user_input: dict, heating_circuits: list[str]) -> dict:
     """Extrahiert die Entity-Zuordnungen aus dem Formular-Input."""
     entities = {}
@@ -207,6 +420,9 @@ def _store_room_temp_input(target: dict, user_input: dict, heating_circuits: lis
     target[CONF_ROOM_TEMP_INTERVAL] = user_input.get(
         CONF_ROOM_TEMP_INTERVAL, DEFAULT_ROOM_TEMP_INTERVAL
     )
+    target[CONF_ROOM_TEMP_MIN_INTERVAL] = int(user_input.get(
+        CONF_ROOM_TEMP_MIN_INTERVAL, DEFAULT_ROOM_TEMP_MIN_INTERVAL
+    ))
     target[CONF_ROOM_TEMP_SEASON_ENABLED] = user_input.get(
         CONF_ROOM_TEMP_SEASON_ENABLED, DEFAULT_ROOM_TEMP_SEASON_ENABLED
     )
@@ -241,11 +457,24 @@ def _store_season_defaults(target: dict):
 # ===================================================================
 
 class IDMHeatpumpConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
-    VERSION = 5
+    VERSION = 6
 
     def __init__(self):
         super().__init__()
         self._user_input = {}
+        self._probe: dict | None = None  # Ergebnis des Verbindungstests
+        self._discovered: tuple[list[str], list[str]] | None = None  # Hardware-Scan
+
+    def _entry_title(self) -> str:
+        """Titel = Gerätename; ab der zweiten Wärmepumpe mit Host (Kaskade)."""
+        if not self._async_current_entries():
+            return DEFAULT_DEVICE_NAME
+        host = self._user_input[CONF_HOST]
+        unit_id = self._user_input.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+        if any(_entry_address(entry)[0] == host for entry in self._async_current_entries()):
+            # Gateway: weitere Wärmepumpe am selben Host
+            return f"{DEFAULT_DEVICE_NAME} ({host}/{unit_id})"
+        return f"{DEFAULT_DEVICE_NAME} ({host})"
 
     async def async_step_user(self, user_input=None):
         """Schritt 1: Verbindungsdaten."""
@@ -254,21 +483,26 @@ class IDMHeatpumpConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             host = user_input[CONF_HOST]
             port = user_input.get(CONF_PORT, DEFAULT_PORT)
+            unit_id = user_input.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
 
+            # Mehrere Wärmepumpen hinter einem Gateway: gleiche Adresse, andere Unit ID
             for entry in self._async_current_entries():
-                if (
-                    entry.data.get(CONF_HOST) == host
-                    and entry.data.get(CONF_PORT, DEFAULT_PORT) == port
-                ):
+                if _entry_address(entry) == (host, port, unit_id):
                     return self.async_abort(reason="already_configured")
 
             try:
-                sock = socket.create_connection((host, port), timeout=3)
-                sock.close()
-            except OSError:
-                errors["base"] = "cannot_connect"
+                self._probe = await async_probe(host, port, unit_id)
+            except ModbusProbeError as e:
+                _LOGGER.debug("iDM Verbindungstest %s:%s fehlgeschlagen: %s", host, port, e)
+                errors["base"] = e.reason
             else:
                 self._user_input = user_input
+                # Hardware-Scan: nur Vorauswahl, bei Fehler gelten die Standardwerte
+                try:
+                    self._discovered = await async_discover(host, port, unit_id)
+                except Exception as e:
+                    _LOGGER.debug("iDM Hardware-Scan %s:%s fehlgeschlagen: %s", host, port, e)
+                    self._discovered = None
                 return await self.async_step_circuits()
 
         schema = vol.Schema(
@@ -305,21 +539,31 @@ class IDMHeatpumpConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._user_input[CONF_SENSOR_GROUPS] = selected_sg
             return await self.async_step_room_temp()
 
+        # Vorauswahl aus dem Hardware-Scan (kein HK erkannt → Standardwerte)
+        circuits, groups = DEFAULT_HEATING_CIRCUITS, DEFAULT_SENSOR_GROUPS
+        if self._discovered and self._discovered[0]:
+            circuits, groups = self._discovered
+
         schema = vol.Schema(
             {
                 vol.Required(
                     CONF_HEATING_CIRCUITS,
-                    default=DEFAULT_HEATING_CIRCUITS,
+                    default=circuits,
                 ): HEATING_CIRCUIT_SELECTOR,
                 vol.Required(
                     CONF_SENSOR_GROUPS,
-                    default=DEFAULT_SENSOR_GROUPS,
+                    default=groups,
                 ): SENSOR_GROUP_SELECTOR,
             }
         )
 
+        placeholders = _probe_placeholders(
+            self._probe, self._user_input.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+        )
+        placeholders["discovered"] = _discovery_summary(self._discovered)
         return self.async_show_form(
-            step_id="circuits", data_schema=schema, errors={}
+            step_id="circuits", data_schema=schema, errors={},
+            description_placeholders=placeholders,
         )
 
     async def async_step_room_temp(self, user_input=None):
@@ -338,7 +582,7 @@ class IDMHeatpumpConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Saison deaktiviert → Defaults setzen und fertig
             _store_season_defaults(self._user_input)
             return self.async_create_entry(
-                title="iDM W\u00e4rmepumpe",
+                title=self._entry_title(),
                 data=self._user_input,
             )
 
@@ -358,7 +602,7 @@ class IDMHeatpumpConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             _store_season_input(self._user_input, user_input)
             return self.async_create_entry(
-                title="iDM W\u00e4rmepumpe",
+                title=self._entry_title(),
                 data=self._user_input,
             )
 
@@ -387,6 +631,7 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
         super().__init__()
         self._entry = config_entry
         self._options = {}
+        self._probe: dict | None = None
 
     def _get(self, key, default=None):
         """Holt einen Wert aus options → data → default."""
@@ -401,23 +646,25 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             host = user_input.get(CONF_HOST, self._get(CONF_HOST, "0.0.0.0"))
             port = user_input.get(CONF_PORT, self._get(CONF_PORT, DEFAULT_PORT))
+            unit_id = user_input.get(CONF_UNIT_ID, self._get(CONF_UNIT_ID, DEFAULT_UNIT_ID))
 
             for entry in self.hass.config_entries.async_entries(DOMAIN):
                 if (
                     entry.entry_id != self._entry.entry_id
-                    and entry.data.get(CONF_HOST) == host
-                    and entry.data.get(CONF_PORT, DEFAULT_PORT) == port
+                    and _entry_address(entry) == (host, port, unit_id)
                 ):
                     return self.async_abort(reason="already_configured")
 
             try:
-                sock = socket.create_connection((host, port), timeout=3)
-                sock.close()
-            except OSError:
-                errors["base"] = "cannot_connect_options"
+                self._probe = await async_probe(host, port, unit_id)
+            except ModbusProbeError as e:
+                _LOGGER.debug("iDM Verbindungstest %s:%s fehlgeschlagen: %s", host, port, e)
+                errors["base"] = (
+                    "cannot_connect_options" if e.reason == "cannot_connect" else e.reason
+                )
             else:
                 self._options = dict(user_input)
-                return await self.async_step_room_temp()
+                return await self.async_step_polling()
 
         schema = vol.Schema(
             {
@@ -449,8 +696,72 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
             step_id="init", data_schema=schema, errors=errors
         )
 
+    async def async_step_polling(self, user_input=None):
+        """Options Schritt 2: Polling-Stufen."""
+        errors = {}
+
+        if user_input is not None:
+            tiers = _parse_register_tiers(user_input.get(CONF_REGISTER_TIERS))
+            if tiers is None:
+                errors["base"] = "invalid_register_tiers"
+            elif int(user_input[CONF_ADAPTIVE_MIN_INTERVAL]) > int(user_input[CONF_ADAPTIVE_MAX_INTERVAL]):
+                errors["base"] = "invalid_adaptive_bounds"
+            else:
+                self._options[CONF_FAST_INTERVAL] = int(user_input[CONF_FAST_INTERVAL])
+                self._options[CONF_SLOW_INTERVAL] = int(user_input[CONF_SLOW_INTERVAL])
+                self._options[CONF_REGISTER_TIERS] = tiers
+                self._options[CONF_ADAPTIVE_POLLING] = bool(user_input[CONF_ADAPTIVE_POLLING])
+                self._options[CONF_ADAPTIVE_MIN_INTERVAL] = int(user_input[CONF_ADAPTIVE_MIN_INTERVAL])
+                self._options[CONF_ADAPTIVE_MAX_INTERVAL] = int(user_input[CONF_ADAPTIVE_MAX_INTERVAL])
+                self._options[CONF_WRITE_BUDGET] = int(user_input[CONF_WRITE_BUDGET])
+                self._options[CONF_PIPELINE_DEPTH] = int(user_input[CONF_PIPELINE_DEPTH])
+                return await self.async_step_deadband()
+
+        schema = _build_polling_schema(
+            current_fast=self._get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+            current_slow=self._get(CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+            current_tiers=self._get(CONF_REGISTER_TIERS, DEFAULT_REGISTER_TIERS),
+            current_adaptive=self._get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            current_adaptive_min=self._get(CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL),
+            current_adaptive_max=self._get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL),
+            current_write_budget=self._get(CONF_WRITE_BUDGET, DEFAULT_WRITE_BUDGET),
+            current_pipeline_depth=self._get(CONF_PIPELINE_DEPTH, DEFAULT_PIPELINE_DEPTH),
+        )
+
+        return self.async_show_form(
+            step_id="polling", data_schema=schema, errors=errors,
+            description_placeholders=_probe_placeholders(
+                self._probe, self._options.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+            ),
+        )
+
+    async def async_step_deadband(self, user_input=None):
+        """Options Schritt 3: Deadband-Filter für Float-Sensoren."""
+        if user_input is not None:
+            for conf_abs, conf_rel in DEADBAND_OPTIONS.values():
+                self._options[conf_abs] = float(user_input[conf_abs])
+                self._options[conf_rel] = float(user_input[conf_rel])
+            self._options[CONF_DEADBAND_HEARTBEAT] = int(user_input[CONF_DEADBAND_HEARTBEAT])
+            return await self.async_step_room_temp()
+
+        current_deadbands = {
+            device_class: (
+                self._get(conf_abs, DEFAULT_DEADBANDS[device_class][0]),
+                self._get(conf_rel, DEFAULT_DEADBANDS[device_class][1]),
+            )
+            for device_class, (conf_abs, conf_rel) in DEADBAND_OPTIONS.items()
+        }
+        schema = _build_deadband_schema(
+            current_deadbands=current_deadbands,
+            current_heartbeat=self._get(CONF_DEADBAND_HEARTBEAT, DEFAULT_DEADBAND_HEARTBEAT),
+        )
+
+        return self.async_show_form(
+            step_id="deadband", data_schema=schema, errors={}
+        )
+
     async def async_step_room_temp(self, user_input=None):
-        """Options Schritt 2: Raumtemperatur-Übernahme."""
+        """Options Schritt 4: Raumtemperatur-Übernahme."""
         heating_circuits = self._options.get(
             CONF_HEATING_CIRCUITS,
             self._get(CONF_HEATING_CIRCUITS, DEFAULT_HEATING_CIRCUITS),
@@ -459,7 +770,7 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             _store_room_temp_input(self._options, user_input, heating_circuits)
 
-            # Saison aktiviert → weiter zu Schritt 3
+            # Saison aktiviert → weiter zu Schritt 5
             if self._options.get(CONF_ROOM_TEMP_SEASON_ENABLED, False):
                 return await self.async_step_room_temp_season()
 
@@ -476,6 +787,9 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
             current_season_enabled=self._get(
                 CONF_ROOM_TEMP_SEASON_ENABLED, DEFAULT_ROOM_TEMP_SEASON_ENABLED
             ),
+            current_min_interval=self._get(
+                CONF_ROOM_TEMP_MIN_INTERVAL, DEFAULT_ROOM_TEMP_MIN_INTERVAL
+            ),
         )
 
         return self.async_show_form(
@@ -483,7 +797,7 @@ class IDMHeatpumpOptionsFlow(config_entries.OptionsFlow):
         )
 
     async def async_step_room_temp_season(self, user_input=None):
-        """Options Schritt 3: Saison-Zeitraum (nur wenn Toggle aktiv)."""
+        """Options Schritt 5: Saison-Zeitraum (nur wenn Toggle aktiv)."""
         if user_input is not None:
             _store_season_input(self._options, user_input)
             return self.async_create_entry(title="", data=self._options)
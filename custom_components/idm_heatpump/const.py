@@ -1,7 +1,36 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v0.7.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Register-Größen + Grenzen für Block-Lesen (max. 125 Register, Lückentoleranz)
+- Storage-Keys für persistierte Gerätedaten (Funktionscode-Cache)
+- Polling-Stufen (fast/normal/slow) pro Register + Intervalle (Options)
+- Cooldown für gebündelten Register-Refresh nach Schreibzugriffen
+- Deadband-Filter (absolut/relativ) pro Sensor-Klasse + Heartbeat als Option
+- Poll-Metriken: Zähler-Keys, Latenz-Histogramm-Buckets, Modbus-Framegrößen
+- Dead-Register-Pruning: Schwelle, Re-Probe-Intervall, Storage-Key
+- Snapshot-Persistenz: Storage-Key, Speicherintervall, maximales Alter
+- Adaptives Polling: Grenzen (Options), Aktivitätsstufen, Schwellen
+- Mehrere Wärmepumpen: get_device_info()/scoped_unique_id() pro Config-Entry,
+  Konstanten für den gemeinsamen Poll-Scheduler
+- Verbindungsüberwachung: Circuit-Breaker-Zustände, Schwelle, Backoff + Jitter
+- Modbus-Limit für zusammengefasste Schreibzugriffe (Write-Queue)
+- EEPROM-Schreibbudget: Option, Burst, Storage-Key für die Schreibzähler
+- CONF_ROOM_TEMP_MIN_INTERVAL: Mindestabstand der Raumtemperatur-Writes bei "Bei Änderung"
+- STORAGE_KEY_ROOM_TEMP: zuletzt geschriebene Raumtemperaturen pro Gerät
+- DATA_MODBUS_CONNECTIONS: geteilte Modbus-Verbindungen pro Host/Port
+- PROBE_TIMEOUT/PROBE_GATEWAY_EXCEPTIONS für den Verbindungstest im Config-Flow
+- Hardware-Erkennung: DISCOVERY_*-Register + is_valid_value() (INVALID_FLOAT/
+  INVALID_UCHAR); Auswertung in register_plan.detect_hardware()
+- HC_ADDRESSES: HC-Adressen einmalig vorberechnet (hc_reg ohne Lambda-Aufruf)
+- Register-Maps, -Typen und -Stufen (BASE_REGISTERS, GROUP_REGISTERS,
+  REGISTER_TIERS, HC_REGISTER_*, AUTO_DETECT_*) entfernt: sie werden aus der
+  Entity-Tabelle (descriptions.py) abgeleitet
+- READ_PLAN_CACHE_SIZE: Größe des Block-Plan-Caches (LRU) pro Handler
+- Pipeline-Tiefe (Pool paralleler TCP-Verbindungen) als Option + AIMD-Grenzen
+- WRITE_COALESCE_WINDOW: Sammelfenster der Write-Queue
 
 Änderungen v0.7.0:
 - Temperatur-Offset pro HK (Number-Entity, ±5°C)
@@ -24,6 +53,127 @@ DEFAULT_UPDATE_INTERVAL = 30
 CONF_UNIT_ID = "unit_id"
 DEFAULT_UNIT_ID = 1
 
+# Geräte-Identität: ab Config-Version 6 pro Config-Entry (Kaskaden mit mehreren WP)
+DEFAULT_DEVICE_NAME = "iDM Wärmepumpe"
+LEGACY_DEVICE_ID = "idm_system"
+
+# Gemeinsamer Poll-Scheduler aller Wärmepumpen (hass.data-Key)
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+# Geteilte Modbus-Verbindungen {"host:port": ModbusConnection} (Gateway mit mehreren Unit IDs)
+DATA_MODBUS_CONNECTIONS = f"{DOMAIN}_modbus_connections"
+POLL_STAGGER_SECONDS = 2.0  # Mindestabstand zwischen zwei read_all()-Starts
+
+# -------------------------------------------------------------------
+# Polling-Stufen: fast / normal (= update_interval) / slow
+# -------------------------------------------------------------------
+TIER_FAST = "fast"
+TIER_NORMAL = "normal"
+TIER_SLOW = "slow"
+POLL_TIERS = [TIER_FAST, TIER_NORMAL, TIER_SLOW]
+
+CONF_FAST_INTERVAL = "fast_interval"
+DEFAULT_FAST_INTERVAL = 10
+CONF_SLOW_INTERVAL = "slow_interval"
+DEFAULT_SLOW_INTERVAL = 300
+
+# Overrides {"<adresse>": "fast"|"normal"|"slow"} aus den Options
+CONF_REGISTER_TIERS = "register_tiers"
+DEFAULT_REGISTER_TIERS = {}
+
+# -------------------------------------------------------------------
+# Deadband-Filter für Float-Sensoren (Recorder-Entlastung)
+# -------------------------------------------------------------------
+# Pro Sensor-Klasse (device_class): (absolut, relativ in %).
+# Ein neuer Wert wird erst geschrieben, wenn er um mehr als
+# max(absolut, relativ * |letzter Wert|) vom zuletzt geschriebenen abweicht.
+DEADBAND_CLASSES = ["temperature", "power", "energy"]
+
+CONF_DEADBAND_TEMPERATURE = "deadband_temperature"
+CONF_DEADBAND_TEMPERATURE_REL = "deadband_temperature_rel"
+CONF_DEADBAND_POWER = "deadband_power"
+CONF_DEADBAND_POWER_REL = "deadband_power_rel"
+CONF_DEADBAND_ENERGY = "deadband_energy"
+CONF_DEADBAND_ENERGY_REL = "deadband_energy_rel"
+
+# {klasse: (CONF absolut, CONF relativ)}
+DEADBAND_OPTIONS = {
+    "temperature": (CONF_DEADBAND_TEMPERATURE, CONF_DEADBAND_TEMPERATURE_REL),
+    "power": (CONF_DEADBAND_POWER, CONF_DEADBAND_POWER_REL),
+    "energy": (CONF_DEADBAND_ENERGY, CONF_DEADBAND_ENERGY_REL),
+}
+
+DEFAULT_DEADBANDS = {
+    "temperature": (0.1, 0.0),   # °C
+    "power": (0.05, 2.0),        # kW, %
+    "energy": (0.1, 0.0),        # kWh
+}
+
+# Spätestens nach dieser Zeit wird ein unterdrückter Wert doch geschrieben
+CONF_DEADBAND_HEARTBEAT = "deadband_heartbeat"
+DEFAULT_DEADBAND_HEARTBEAT = 600  # Sekunden
+
+# Schreibzugriffe innerhalb dieses Fensters werden mit einem Read zurückgelesen
+REGISTER_REFRESH_COOLDOWN = 1.5  # Sekunden
+
+# -------------------------------------------------------------------
+# Poll-Metriken (Diagnose-Sensoren + Diagnose-Download)
+# -------------------------------------------------------------------
+# Zähler pro read_all()-Durchlauf
+POLL_METRIC_KEYS = [
+    "duration_ms",
+    "registers",
+    "requests",
+    "bytes",
+    "failed_requests",
+    "failed_registers",
+    "retries",
+    "reconnects",
+]
+
+# Obergrenzen (ms) der Latenz-Histogramme pro Register; letzter Bucket = darüber
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+
+# Modbus-TCP-Framegrößen (MBAP 7 Byte + PDU) für die Byte-Zählung
+MODBUS_READ_REQUEST_BYTES = 12
+MODBUS_READ_RESPONSE_BYTES = 9  # + 2 Byte pro Register
+MODBUS_EXCEPTION_BYTES = 9
+
+# -------------------------------------------------------------------
+# Verbindungsüberwachung: Circuit Breaker + exponentielles Backoff
+# -------------------------------------------------------------------
+CIRCUIT_CLOSED = "closed"        # Verbindung ok, Requests laufen normal
+CIRCUIT_OPEN = "open"            # Verbindung gestört, Requests schlagen sofort fehl
+CIRCUIT_HALF_OPEN = "half_open"  # Reconnect-Versuch läuft
+CIRCUIT_FAILURE_THRESHOLD = 3    # Fehlschläge in Folge (Connect/kompletter Poll)
+RECONNECT_BACKOFF_INITIAL = 5.0  # Sekunden bis zum ersten Reconnect-Versuch
+RECONNECT_BACKOFF_MAX = 300.0    # Obergrenze des Backoffs
+RECONNECT_BACKOFF_JITTER = 0.2   # ±20 % Zufall, damit Reconnects nicht synchron laufen
+
+# Verbindungstest im Config-/Options-Flow (Modbus-Handshake)
+PROBE_TIMEOUT = 3.0              # Sekunden für Connect und Read
+PROBE_GATEWAY_EXCEPTIONS = (0x0A, 0x0B)  # Gateway: Pfad/Ziel-Unit nicht erreichbar
+
+# -------------------------------------------------------------------
+# Persistenz (homeassistant.helpers.storage.Store)
+# -------------------------------------------------------------------
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # Sekunden
+STORAGE_KEY_FUNCTION_CODES = f"{DOMAIN}.function_codes"
+STORAGE_KEY_DEAD_REGISTERS = f"{DOMAIN}.dead_registers"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.snapshot"
+STORAGE_KEY_WRITE_COUNTS = f"{DOMAIN}.write_counts"
+STORAGE_KEY_ROOM_TEMP = f"{DOMAIN}.room_temp_written"
+
+# EEPROM-Schreibbudget: Token-Bucket pro Register
+CONF_WRITE_BUDGET = "write_budget"
+DEFAULT_WRITE_BUDGET = 500   # Schreibzugriffe pro Register und Tag (0 = unbegrenzt)
+WRITE_BUDGET_BURST = 20      # Schreibzugriffe, die ohne Wartezeit möglich sind
+WRITE_COALESCE_WINDOW = 0.1  # s Sammelfenster der Write-Queue (Slider, Automationen)
+
+# Snapshot der Register-Werte für den Sofortstart
+SNAPSHOT_SAVE_INTERVAL = 300      # Sekunden zwischen zwei Speichervorgängen
+SNAPSHOT_MAX_AGE = 24 * 3600      # Ältere Snapshots werden verworfen
+
 CONF_HEATING_CIRCUITS = "heating_circuits"
 DEFAULT_HEATING_CIRCUITS = ["A", "C"]
 ALL_HEATING_CIRCUITS = ["A", "B", "C", "D", "E", "F", "G"]
@@ -53,6 +203,7 @@ CONF_ROOM_TEMP_SEASON_START_MONTH = "room_temp_season_start_month"
 CONF_ROOM_TEMP_SEASON_START_DAY = "room_temp_season_start_day"
 CONF_ROOM_TEMP_SEASON_END_MONTH = "room_temp_season_end_month"
 CONF_ROOM_TEMP_SEASON_END_DAY = "room_temp_season_end_day"
+CONF_ROOM_TEMP_MIN_INTERVAL = "room_temp_min_interval"
 
 DEFAULT_ROOM_TEMP_ENTITIES = {}
 DEFAULT_ROOM_TEMP_INTERVAL = "disabled"
@@ -61,6 +212,8 @@ DEFAULT_ROOM_TEMP_SEASON_START_MONTH = 10
 DEFAULT_ROOM_TEMP_SEASON_START_DAY = 1
 DEFAULT_ROOM_TEMP_SEASON_END_MONTH = 4
 DEFAULT_ROOM_TEMP_SEASON_END_DAY = 30
+# "Bei Änderung": Mindestabstand zwischen zwei Writes pro HK (Sekunden)
+DEFAULT_ROOM_TEMP_MIN_INTERVAL = 60
 
 # Schreib-Register: Basis 1650 + i*2 (FLOAT)
 REG_ROOM_TEMP_WRITE_BASE = 1650
@@ -99,6 +252,31 @@ REG_TYPE_FLOAT = "float"   # 32-bit IEEE754, 2 Register
 REG_TYPE_UCHAR = "uchar"   # 8-bit unsigned (Low-Byte eines WORD)
 REG_TYPE_WORD = "word"      # 16-bit unsigned
 
+# Anzahl 16-bit Register pro Datentyp
+REG_TYPE_SIZES = {
+    REG_TYPE_FLOAT: 2,
+    REG_TYPE_UCHAR: 1,
+    REG_TYPE_WORD: 1,
+}
+
+# -------------------------------------------------------------------
+# Block-Lesen (read_all)
+# -------------------------------------------------------------------
+MODBUS_MAX_READ_REGISTERS = 125  # Modbus-Limit pro Read-Request
+READ_BLOCK_MAX_GAP = 8           # Max. Lücke (Register), die mitgelesen wird
+# Gecachte Block-Pläne pro Handler (LRU): 7 Stufen-Kombinationen + Reserve
+# für Read-Backs/Dead-Register-Probes, die sonst den Cache füllen würden
+READ_PLAN_CACHE_SIZE = 10
+
+# Pipeline: parallele Block-Reads über einen Pool von TCP-Verbindungen
+# (pymodbus serialisiert die Requests eines Clients; 1 = seriell)
+CONF_PIPELINE_DEPTH = "pipeline_depth"
+DEFAULT_PIPELINE_DEPTH = 1
+MAX_PIPELINE_DEPTH = 4
+PIPELINE_GROW_AFTER = 20             # beantwortete Requests in Folge → Fenster +1
+PIPELINE_RECONNECT_INTERVAL = 300    # s zwischen Versuchen, den Pool aufzufüllen
+MODBUS_MAX_WRITE_REGISTERS = 123  # Modbus-Limit pro Write-Multiple-Request
+
 # -------------------------------------------------------------------
 # Auto-Detect: Ungültige Werte für nicht verbaute Sensoren
 # -------------------------------------------------------------------
@@ -106,6 +284,13 @@ INVALID_FLOAT = -1.0
 INVALID_UCHAR = 255
 AUTO_DETECT_THRESHOLD = 3
 
+# Dead-Register-Pruning: Register, die DEAD_REGISTER_THRESHOLD Polls in Folge
+# einen Modbus-Fehler (bzw. -1.0 bei Auto-Detect-Registern) liefern, werden
+# aus dem Polling genommen und nur noch alle DEAD_REGISTER_REPROBE_INTERVAL
+# Sekunden geprüft.
+DEAD_REGISTER_THRESHOLD = 5
+DEAD_REGISTER_REPROBE_INTERVAL = 3600  # Sekunden
+
 # -------------------------------------------------------------------
 # Heizkreis-Register-Mapping (Navigator 10)
 # Index: A=0, B=1, C=2, D=3, E=4, F=5, G=6
@@ -132,36 +317,17 @@ HC_REGISTERS = {
     "room_temp":   lambda i: 1364 + i * 2,
 }
 
-HC_REGISTER_TYPES = {
-    "vl":          REG_TYPE_FLOAT,
-    "vl_soll":     REG_TYPE_FLOAT,
-    "active_mode": REG_TYPE_UCHAR,
-    "mode":        REG_TYPE_UCHAR,
-    "temp_normal": REG_TYPE_FLOAT,
-    "temp_eco":    REG_TYPE_FLOAT,
-    "curve":       REG_TYPE_FLOAT,
-    "heat_limit":  REG_TYPE_UCHAR,
-    "parallel":    REG_TYPE_UCHAR,
-    "cool_normal": REG_TYPE_FLOAT,
-    "cool_eco":    REG_TYPE_FLOAT,
-    "cool_limit":  REG_TYPE_UCHAR,
-    "cool_vl":     REG_TYPE_UCHAR,
-    "room_temp":   REG_TYPE_FLOAT,
-}
-
-# Welche HC-Register gehören zu welcher Sensor-Gruppe?
-HC_REGISTER_GROUPS = {
-    "cool_normal": "cooling",
-    "cool_eco":    "cooling",
-    "cool_limit":  "cooling",
-    "cool_vl":     "cooling",
-    "room_temp":   "room_control",
+# Einmalig vorberechnete HC-Adressen {(heizkreis, name): adresse}
+HC_ADDRESSES = {
+    (hc, name): address(idx)
+    for hc, idx in HC_INDEX.items()
+    for name, address in HC_REGISTERS.items()
 }
 
 
 def hc_reg(circuit: str, register_name: str) -> int:
-    """Berechnet die Register-Adresse für einen Heizkreis."""
-    return HC_REGISTERS[register_name](HC_INDEX[circuit])
+    """Register-Adresse für einen Heizkreis (aus HC_ADDRESSES)."""
+    return HC_ADDRESSES[(circuit, register_name)]
 
 
 # -------------------------------------------------------------------
@@ -256,135 +422,74 @@ REG_HEATSINK_RETURN      = 1068
 REG_HEATSINK_SUPPLY      = 1070
 REG_COLD_STORAGE_TEMP    = 1010
 
-
 # -------------------------------------------------------------------
-# Register-Maps pro Gruppe
+# Adaptives Polling: Intervalle folgen der Aktivität der Wärmepumpe
 # -------------------------------------------------------------------
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+DEFAULT_ADAPTIVE_MIN_INTERVAL = 5     # Sekunden (schnellste Stufe bei hoher Aktivität)
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 120   # Sekunden (schnellste Stufe im Leerlauf)
+
+ACTIVITY_IDLE = "idle"
+ACTIVITY_NORMAL = "normal"
+ACTIVITY_HIGH = "high"
+
+# REG_WP_MODE: Warmwasser (4) und Abtauen (8) ändern sich im Sekundentakt
+ADAPTIVE_HIGH_MODES = [4, 8]
+# Temperaturen, deren Änderungsrate die Aktivität mitbestimmt
+ADAPTIVE_RATE_REGISTERS = [REG_WP_VL_TEMP, REG_RETURN_TEMP, REG_LOAD_TEMP]
+ADAPTIVE_RATE_HIGH = 0.05    # K/s (3 K/min) → hohe Aktivität
+ADAPTIVE_RATE_IDLE = 0.005   # K/s (0,3 K/min) → Leerlauf möglich
+ADAPTIVE_IDLE_POLLS = 3      # Auswertungen in Folge, bevor auf Leerlauf gewechselt wird
 
-BASE_REGISTERS = {
-    REG_OUTDOOR_TEMP:        REG_TYPE_FLOAT,
-    REG_OUTDOOR_TEMP_AVG:    REG_TYPE_FLOAT,
-    REG_WP_VL_TEMP:          REG_TYPE_FLOAT,
-    REG_RETURN_TEMP:         REG_TYPE_FLOAT,
-    REG_LOAD_TEMP:           REG_TYPE_FLOAT,
-    REG_HEATBUFFER_TEMP:     REG_TYPE_FLOAT,
-    REG_WW_TOP_TEMP:         REG_TYPE_FLOAT,
-    REG_WW_BOTTOM_TEMP:      REG_TYPE_FLOAT,
-    REG_WW_TAP_TEMP:         REG_TYPE_FLOAT,
-    REG_AIR_INLET_TEMP:      REG_TYPE_FLOAT,
-    REG_AIR_INLET_TEMP_2:    REG_TYPE_FLOAT,
-    REG_EN_HEATING:          REG_TYPE_FLOAT,
-    REG_EN_TOTAL:            REG_TYPE_FLOAT,
-    REG_EN_COOLING:          REG_TYPE_FLOAT,
-    REG_EN_DHW:              REG_TYPE_FLOAT,
-    REG_EN_DEFROST:          REG_TYPE_FLOAT,
-    REG_EN_PASSIVE_COOL:     REG_TYPE_FLOAT,
-    REG_EN_SOLAR:            REG_TYPE_FLOAT,
-    REG_EN_EHEATER:          REG_TYPE_FLOAT,
-    REG_THERMAL_POWER:       REG_TYPE_FLOAT,
-    REG_WP_POWER:            REG_TYPE_FLOAT,
-    REG_INTERNAL_MESSAGE:    REG_TYPE_UCHAR,
-    REG_WP_MODE:             REG_TYPE_UCHAR,
-    REG_WP_STATUS:           REG_TYPE_UCHAR,
-    REG_SYSTEM_MODE:         REG_TYPE_UCHAR,
-    REG_FLOW_SENSOR:         REG_TYPE_UCHAR,
-    REG_WW_TARGET:           REG_TYPE_UCHAR,
-    REG_WW_START:            REG_TYPE_UCHAR,
-    REG_WW_STOP:             REG_TYPE_UCHAR,
-    REG_HEAT_REQUEST:        REG_TYPE_UCHAR,
-    REG_WW_REQUEST:          REG_TYPE_UCHAR,
-    REG_WW_ONETIME:          REG_TYPE_UCHAR,
-}
 
-GROUP_REGISTERS = {
-    "solar": {
-        REG_SOLAR_COLLECTOR_TEMP: REG_TYPE_FLOAT,
-        REG_SOLAR_RETURN_TEMP:    REG_TYPE_FLOAT,
-        REG_SOLAR_CHARGE_TEMP:    REG_TYPE_FLOAT,
-        REG_SOLAR_POWER:          REG_TYPE_FLOAT,
-        REG_SOLAR_MODE:           REG_TYPE_UCHAR,
-    },
-    "pv_battery": {
-        REG_PV_SURPLUS:          REG_TYPE_FLOAT,
-        REG_EHEIZSTAB:           REG_TYPE_FLOAT,
-        REG_PV_PRODUKTION:       REG_TYPE_FLOAT,
-        REG_HAUSVERBRAUCH:       REG_TYPE_FLOAT,
-        REG_BATTERIE_ENTLADUNG:  REG_TYPE_FLOAT,
-        REG_BATTERIE_FUELLSTAND: REG_TYPE_WORD,
-        REG_SMARTGRID_STATUS:    REG_TYPE_UCHAR,
-        REG_PV_TARGET:           REG_TYPE_FLOAT,
-        REG_CURRENT_ELEC_PRICE:  REG_TYPE_FLOAT,
-    },
-    "cooling": {
-        REG_COOLING_REQUEST_WP:  REG_TYPE_UCHAR,
-        REG_WW_REQUEST_WP:       REG_TYPE_UCHAR,
-        REG_COOL_REQUEST:        REG_TYPE_UCHAR,
-    },
-    "diagnostic": {
-        REG_FAULT_SUMMARY:       REG_TYPE_UCHAR,
-        REG_EVU_LOCK:            REG_TYPE_UCHAR,
-        REG_COMPRESSOR_1:        REG_TYPE_UCHAR,
-        REG_CHARGE_PUMP:         REG_TYPE_WORD,
-        REG_VARIABLE_INPUT:      REG_TYPE_UCHAR,
-        REG_SWITCH_VALVE_HC:     REG_TYPE_WORD,
-        REG_CIRC_PUMP:           REG_TYPE_WORD,
-        REG_POWER_LIMIT:         REG_TYPE_FLOAT,
-    },
-    "room_control": {
-        REG_HUMIDITY_SENSOR:     REG_TYPE_FLOAT,
-    },
-    "extended_temps": {
-        REG_HEAT_EXCHANGER_TEMP: REG_TYPE_FLOAT,
-        REG_HEATSINK_RETURN:     REG_TYPE_FLOAT,
-        REG_HEATSINK_SUPPLY:     REG_TYPE_FLOAT,
-        REG_COLD_STORAGE_TEMP:   REG_TYPE_FLOAT,
-    },
+# -------------------------------------------------------------------
+# Hardware-Erkennung (Config-Flow): welche HK/Gruppen sind verbaut?
+# -------------------------------------------------------------------
+# Ein Heizkreis gilt als verbaut, wenn alle diese Register gültig sind
+DISCOVERY_HC_REGISTERS = ["vl", "active_mode"]
+
+# Fühler-Register pro Gruppe: mindestens eines gültig → Gruppe verbaut.
+# Gruppen ohne Eintrag (Anforderungen, Status) lassen sich nicht erkennen
+# und behalten ihre Vorauswahl (DEFAULT_SENSOR_GROUPS).
+DISCOVERY_GROUP_REGISTERS = {
+    "solar": [REG_SOLAR_COLLECTOR_TEMP, REG_SOLAR_RETURN_TEMP, REG_SOLAR_CHARGE_TEMP],
+    "pv_battery": [REG_PV_SURPLUS, REG_PV_PRODUKTION, REG_HAUSVERBRAUCH],
+    "room_control": [REG_HUMIDITY_SENSOR],
+    "extended_temps": [
+        REG_HEAT_EXCHANGER_TEMP,
+        REG_HEATSINK_RETURN,
+        REG_HEATSINK_SUPPLY,
+        REG_COLD_STORAGE_TEMP,
+    ],
 }
+# Raumfühler der Heizkreise zählen für "room_control" mit
+DISCOVERY_GROUP_HC_REGISTERS = {"room_control": ["room_temp"]}
 
-# Abwärtskompatibilität
-STATIC_REGISTERS = dict(BASE_REGISTERS)
-for _grp_regs in GROUP_REGISTERS.values():
-    STATIC_REGISTERS.update(_grp_regs)
-
-
-def build_register_map(
-    heating_circuits: list[str],
-    sensor_groups: list[str] | None = None,
-) -> dict[int, str]:
-    """Baut vollständige Register-Map inkl. dynamischer Heizkreis-Register.
-
-    Args:
-        heating_circuits: Aktive Heizkreise (z.B. ["A", "C"])
-        sensor_groups: Aktive Sensor-Gruppen. None = alle aktiv.
-
-    Returns: {register_address: register_type}
-    """
-    if sensor_groups is None:
-        sensor_groups = ALL_SENSOR_GROUPS
-
-    registers = dict(BASE_REGISTERS)
 
-    for group in sensor_groups:
-        if group in GROUP_REGISTERS:
-            registers.update(GROUP_REGISTERS[group])
+def is_valid_value(reg_type: str, value) -> bool:
+    """False für fehlende Werte und die Kennungen nicht verbauter Fühler."""
+    if value is None:
+        return False
+    if reg_type == REG_TYPE_FLOAT:
+        return value != INVALID_FLOAT
+    if reg_type == REG_TYPE_UCHAR:
+        return value != INVALID_UCHAR
+    return True
 
-    for hc in heating_circuits:
-        idx = HC_INDEX[hc]
-        for name, reg_type in HC_REGISTER_TYPES.items():
-            group = HC_REGISTER_GROUPS.get(name)
-            if group is not None and group not in sensor_groups:
-                continue
-            addr = HC_REGISTERS[name](idx)
-            registers[addr] = reg_type
 
-    return registers
+def scoped_unique_id(device_id: str, key: str) -> str:
+    """unique_id einer Entity im Kontext eines Config-Entries."""
+    return f"{device_id}_{key}"
 
 
-def get_device_info(host: str) -> dict:
-    """Zentrales device_info dict für alle Entities."""
+def get_device_info(host: str, device_id: str, name: str = DEFAULT_DEVICE_NAME) -> dict:
+    """Zentrales device_info dict für alle Entities (ein Gerät pro Config-Entry)."""
     return {
-        "identifiers": {("idm_heatpump", "idm_system")},
-        "name": "iDM Wärmepumpe",
+        "identifiers": {(DOMAIN, device_id)},
+        "name": name,
         "manufacturer": "iDM Energiesysteme",
         "model": "AERO ALM 4\u201312",
         "configuration_url": f"http://{host}",
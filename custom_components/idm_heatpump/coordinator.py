@@ -0,0 +1,740 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Eigener DataUpdateCoordinator mit Polling-Stufen (fast/normal/slow)
+- Fällige Stufen werden pro Tick zu einer Register-Map zusammengefasst und mit
+  einem read_all() gelesen; das Ergebnis wird in den letzten Snapshot gemergt
+- Persistenz der gelernten Funktionscodes (Input/Holding)
+- Gezielter Refresh nach Schreibzugriffen: async_request_register_refresh()
+  liest nur die geschriebenen Register (gebündelt per Debouncer) zurück
+- Änderungs-Diff pro Register: Entities (Listener-Context = Register) werden
+  nur benachrichtigt, wenn sich ihr Register geändert hat
+- Zähler für aufeinanderfolgende ungültige Reads pro Register (Auto-Detect)
+- diagnostics(): Stufen, Intervalle und ungültige Reads für den Diagnose-Download
+- Dead-Register-Pruning: Register mit DEAD_REGISTER_THRESHOLD Fehlern in Folge
+  (bzw. -1.0 bei Auto-Detect) werden nur noch selten geprüft; persistiert
+- Snapshot: restore_snapshot() für den Sofortstart (Werte als veraltet markiert),
+  Speichern alle SNAPSHOT_SAVE_INTERVAL Sekunden und beim Herunterfahren
+- Adaptives Polling (optional): Betriebsart, Status, Verdichter und Änderungsrate
+  der Temperaturen bestimmen die Aktivität; Intervalle werden innerhalb der
+  konfigurierten Grenzen skaliert (hoch sofort, Leerlauf mit Hysterese)
+- Geräte-Identität (device_id/device_name) pro Config-Entry; Poll-Starts
+  mehrerer Wärmepumpen werden über den gemeinsamen IDMPollScheduler gestaffelt
+- EEPROM-Schreibzähler (client.write_budget) werden nach Polls und Register-Refresh
+  verzögert sowie beim Herunterfahren gespeichert
+- Register-Map, Stufen-Maps und Auto-Detect-Register kommen aus dem geteilten
+  RegisterPlan (coordinator.plan) statt aus eigenen Kopien
+- Register-Refresh mergt in self.data und benachrichtigt nur die Listener
+  (Poll-Timer und last_update_success bleiben); bei veralteten Daten oder
+  Fehlern bleiben die Register vorgemerkt und laufen im nächsten Poll mit
+- Listener-Index aus eigener Buchführung (Callback + Register); An- und
+  Abmelden laufen über super(), ohne Zugriff auf _listeners
+- Register-Refresh liest mit read_all(poll=False): kein Poll für Circuit
+  Breaker und Poll-Metriken
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    ACTIVITY_HIGH,
+    ACTIVITY_IDLE,
+    ACTIVITY_NORMAL,
+    ADAPTIVE_HIGH_MODES,
+    ADAPTIVE_IDLE_POLLS,
+    ADAPTIVE_RATE_HIGH,
+    ADAPTIVE_RATE_IDLE,
+    ADAPTIVE_RATE_REGISTERS,
+    AUTO_DETECT_THRESHOLD,
+    DEFAULT_DEVICE_NAME,
+    LEGACY_DEVICE_ID,
+    DEAD_REGISTER_REPROBE_INTERVAL,
+    DEAD_REGISTER_THRESHOLD,
+    INVALID_FLOAT,
+    INVALID_UCHAR,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_INTERVAL,
+    POLL_TIERS,
+    REGISTER_REFRESH_COOLDOWN,
+    REG_TYPE_FLOAT,
+    REG_TYPE_UCHAR,
+    REG_COMPRESSOR_1,
+    REG_WP_MODE,
+    REG_WP_STATUS,
+    STORAGE_SAVE_DELAY,
+    TIER_FAST,
+    TIER_NORMAL,
+    TIER_SLOW,
+)
+from .modbus_handler import IDMModbusHandler
+from .register_plan import RegisterPlan
+from .scheduler import IDMPollScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IDMDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator mit mehreren Polling-Stufen.
+
+    Der Coordinator tickt mit dem kürzesten Stufen-Intervall. Pro Tick werden
+    nur die fälligen Stufen gelesen, alle Stufen landen aber in einem
+    gemeinsamen Snapshot (coordinator.data).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: IDMModbusHandler,
+        plan: RegisterPlan,
+        tier_intervals: dict[str, int],
+        name: str,
+        function_code_store: Store | None = None,
+        dead_register_store: Store | None = None,
+        snapshot_store: Store | None = None,
+        write_count_store: Store | None = None,
+        adaptive_bounds: tuple[int, int] | None = None,
+        device_id: str = LEGACY_DEVICE_ID,
+        device_name: str = DEFAULT_DEVICE_NAME,
+        scheduler: IDMPollScheduler | None = None,
+    ):
+        self.client = client
+        # Geräte-Identität (Config-Entry) für unique_ids und device_info
+        self.device_id = device_id
+        self.device_name = device_name
+        self._scheduler = scheduler
+        # Vorberechneter Register-Plan (mit den Plattformen geteilt)
+        self.plan = plan
+        self.register_map = plan.register_map
+        self.register_tiers = plan.tiers
+        self._fc_store = function_code_store
+        self._dead_store = dead_register_store
+        self._snapshot_store = snapshot_store
+        self._write_count_store = write_count_store
+
+        # Snapshot: beim Start geladene Werte gelten bis zum ersten Poll als veraltet
+        self._stale = False
+        self._snapshot_time: float | None = None
+        self._last_snapshot_save: float | None = None
+        self._auto_detect_registers = plan.auto_detect
+
+        # Dead-Register: aus dem Polling genommen, seltene Re-Probes
+        self._dead_registers: set[int] = set()
+        self._dead_counts: dict[int, int] = {}
+        self._last_dead_probe = time.monotonic()
+
+        # Register-Map pro Stufe (aus dem Plan, nur lesend)
+        self._tier_maps = plan.tier_maps
+
+        self._tier_intervals: dict[str, float] = {}
+        self._set_tier_intervals(tier_intervals)
+        self._base_intervals = dict(self._tier_intervals)
+
+        # Adaptives Polling: (min, max) für die schnellste Stufe oder None
+        self._adaptive_bounds = adaptive_bounds
+        self._activity = ACTIVITY_NORMAL
+        self._idle_evaluations = 0
+        self._change_rate = 0.0
+        self._rate_samples: dict[int, tuple[float, float]] = {}
+        self._last_tier_read: dict[str, float] = {}
+        self._map_cache: dict[tuple[str, ...], dict[int, str]] = {}
+
+        # Änderungs-Diff + Listener-Index {register: [callbacks]}
+        self._changed_registers: set[int] | None = None
+        self._listener_index: dict[object, list[CALLBACK_TYPE]] | None = None
+        # Eigene Buchführung {remove_callback: (callback, context)} statt des
+        # privaten DataUpdateCoordinator._listeners
+        self._listener_contexts: dict[CALLBACK_TYPE, tuple[CALLBACK_TYPE, object]] = {}
+        self._last_notified_success = True
+        self._invalid_counts: dict[int, int] = {}
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=timedelta(seconds=self._tick_seconds()),
+        )
+
+        # Gezielter Refresh nach Schreibzugriffen
+        self._pending_registers: set[int] = set()
+        self._register_refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REGISTER_REFRESH_COOLDOWN,
+            immediate=False,
+            function=self._async_refresh_pending_registers,
+        )
+
+        _LOGGER.info(
+            "iDM Polling-Stufen: %s",
+            ", ".join(
+                f"{tier}={len(self._tier_maps[tier])} Register/{self._tier_intervals[tier]:.0f}s"
+                for tier in POLL_TIERS
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Stufen
+    # ------------------------------------------------------------------
+
+    def _set_tier_intervals(self, tier_intervals: dict[str, int]) -> None:
+        """Übernimmt die Intervalle; fast <= normal <= slow."""
+        normal = float(tier_intervals[TIER_NORMAL])
+        self._tier_intervals = {
+            TIER_FAST: min(float(tier_intervals[TIER_FAST]), normal),
+            TIER_NORMAL: normal,
+            TIER_SLOW: max(float(tier_intervals[TIER_SLOW]), normal),
+        }
+
+    def _tick_seconds(self) -> float:
+        """Kürzestes Intervall einer Stufe, die Register enthält."""
+        intervals = [
+            self._tier_intervals[tier]
+            for tier in POLL_TIERS
+            if self._tier_maps[tier]
+        ]
+        return min(intervals) if intervals else self._tier_intervals[TIER_NORMAL]
+
+    # ------------------------------------------------------------------
+    # Adaptives Polling
+    # ------------------------------------------------------------------
+
+    @property
+    def activity(self) -> str:
+        """Aktuelle Aktivitätsstufe (idle/normal/high)."""
+        return self._activity
+
+    def _update_change_rate(self, fresh: dict[int, any], now: float) -> None:
+        """Größte Änderungsrate (K/s) der Vorlauf-/Rücklauf-/Ladetemperatur.
+
+        Wird nur aktualisiert, wenn die Register in diesem Tick gelesen wurden.
+        """
+        rates = []
+        for address in ADAPTIVE_RATE_REGISTERS:
+            value = fresh.get(address)
+            if not isinstance(value, (int, float)) or value == INVALID_FLOAT:
+                continue
+            previous = self._rate_samples.get(address)
+            self._rate_samples[address] = (now, value)
+            if previous is not None and now > previous[0]:
+                rates.append(abs(value - previous[1]) / (now - previous[0]))
+        if rates:
+            self._change_rate = max(rates)
+
+    def _classify_activity(self, data: dict[int, any]) -> str:
+        """Bestimmt die Aktivitätsstufe aus Betriebsart, Status und Verdichter.
+
+        - high:   Warmwasser/Abtauen oder schnelle Temperaturänderung
+        - idle:   Bereit, Status 0, Verdichter aus und Temperaturen stabil
+        - normal: alles andere (z. B. Heiz-/Kühlbetrieb im Beharrungszustand)
+        """
+        mode = data.get(REG_WP_MODE)
+        if mode in ADAPTIVE_HIGH_MODES or self._change_rate >= ADAPTIVE_RATE_HIGH:
+            return ACTIVITY_HIGH
+        if (
+            mode in (0, None)
+            and not data.get(REG_WP_STATUS)
+            and not data.get(REG_COMPRESSOR_1)
+            and self._change_rate < ADAPTIVE_RATE_IDLE
+        ):
+            return ACTIVITY_IDLE
+        return ACTIVITY_NORMAL
+
+    def _adaptive_intervals(self, activity: str) -> dict[str, float]:
+        """Skaliert die konfigurierten Intervalle auf die Aktivitätsstufe.
+
+        Alle Stufen werden mit demselben Faktor skaliert, sodass die schnellste
+        Stufe min (high), ihr konfiguriertes Intervall (normal) bzw. max (idle)
+        erreicht. Keine Stufe wird schneller als min; langsamer als max wird
+        eine Stufe nur, wenn sie schon so konfiguriert ist.
+        """
+        if activity == ACTIVITY_NORMAL:
+            return dict(self._base_intervals)
+        min_interval, max_interval = self._adaptive_bounds
+        fast = self._base_intervals[TIER_FAST]
+        target = min_interval if activity == ACTIVITY_HIGH else max_interval
+        factor = target / fast
+        return {
+            tier: max(float(min_interval), min(interval * factor, max(interval, float(max_interval))))
+            for tier, interval in self._base_intervals.items()
+        }
+
+    def _adapt_poll_interval(self, data: dict[int, any]) -> None:
+        """Passt Stufen-Intervalle und Tick an die Aktivität an.
+
+        Wechsel nach oben erfolgen sofort, in den Leerlauf erst nach
+        ADAPTIVE_IDLE_POLLS Auswertungen in Folge (kein Flattern).
+        """
+        if self._adaptive_bounds is None:
+            return
+        activity = self._classify_activity(data)
+        if activity == ACTIVITY_IDLE and self._activity != ACTIVITY_IDLE:
+            self._idle_evaluations += 1
+            if self._idle_evaluations < ADAPTIVE_IDLE_POLLS:
+                activity = ACTIVITY_NORMAL
+        else:
+            self._idle_evaluations = 0
+        if activity == self._activity:
+            return
+
+        self._activity = activity
+        self._tier_intervals = self._adaptive_intervals(activity)
+        self.update_interval = timedelta(seconds=self._tick_seconds())
+        _LOGGER.debug(
+            "iDM Aktivität %s (%.3f K/s): Intervalle %s",
+            activity,
+            self._change_rate,
+            ", ".join(f"{tier}={self._tier_intervals[tier]:.0f}s" for tier in POLL_TIERS),
+        )
+
+    def _due_tiers(self, now: float) -> tuple[str, ...]:
+        """Stufen, die in diesem Tick gelesen werden müssen."""
+        if self.data is None:
+            return tuple(tier for tier in POLL_TIERS if self._tier_maps[tier])
+        # Halber Tick Toleranz, damit Vielfache des Ticks nicht verrutschen
+        tolerance = self._tick_seconds() / 2
+        return tuple(
+            tier
+            for tier in POLL_TIERS
+            if self._tier_maps[tier]
+            and (
+                tier not in self._last_tier_read
+                or now - self._last_tier_read[tier] >= self._tier_intervals[tier] - tolerance
+            )
+        )
+
+    def _map_for(self, tiers: tuple[str, ...]) -> dict[int, str]:
+        """Gemeinsame Register-Map der fälligen Stufen ohne Dead-Register (gecacht)."""
+        register_map = self._map_cache.get(tiers)
+        if register_map is None:
+            register_map = {}
+            for tier in tiers:
+                register_map.update(self._tier_maps[tier])
+            for address in self._dead_registers:
+                register_map.pop(address, None)
+            self._map_cache[tiers] = register_map
+        return register_map
+
+    # ------------------------------------------------------------------
+    # Update
+    # ------------------------------------------------------------------
+
+    async def _async_update_data(self):
+        now = time.monotonic()
+        tiers = self._due_tiers(now)
+        probe = bool(self._dead_registers) and (
+            now - self._last_dead_probe >= DEAD_REGISTER_REPROBE_INTERVAL
+        )
+        pending = {
+            address: self.register_map[address]
+            for address in self._pending_registers
+            if address in self.register_map
+        }
+        if not tiers and not probe and not pending:
+            self._changed_registers = set()
+            return self.data
+
+        register_map = self._map_for(tiers)
+        if probe:
+            register_map = {
+                **register_map,
+                **{address: self.register_map[address] for address in self._dead_registers},
+            }
+        if pending:
+            # Liegengebliebene Read-Backs (veraltet/fehlgeschlagen) mitlesen
+            register_map = {**register_map, **pending}
+
+        if self._scheduler is not None:
+            await self._scheduler.async_wait_for_slot(self.device_id, self._tick_seconds())
+
+        try:
+            fresh = await self.client.read_all(register_map)
+        except Exception as err:
+            raise UpdateFailed(f"Modbus-Fehler: {err}") from err
+
+        for tier in tiers:
+            self._last_tier_read[tier] = now
+        if probe:
+            self._last_dead_probe = now
+        self._pending_registers.difference_update(pending)
+
+        self._async_save_function_codes()
+        self._async_save_write_counts()
+        self._update_dead_registers(fresh)
+        data = self._merge(fresh)
+        self._update_change_rate(fresh, now)
+        self._adapt_poll_interval(data)
+        self._async_save_snapshot(now)
+        return data
+
+    # ------------------------------------------------------------------
+    # Snapshot-Merge + Änderungs-Diff
+    # ------------------------------------------------------------------
+
+    def _merge(self, fresh: dict[int, any]) -> dict[int, any]:
+        """Mergt frisch gelesene Werte in den Snapshot und merkt sich den Diff."""
+        if self.data is None:
+            self._changed_registers = None
+            for address, value in fresh.items():
+                self._count_invalid(address, value)
+            return dict(fresh)
+
+        if self._stale:
+            # Erster echter Poll nach Snapshot-Start: alle Entities aktualisieren
+            self._stale = False
+            data = dict(self.data)
+            for address, value in fresh.items():
+                self._count_invalid(address, value)
+            data.update(fresh)
+            self._changed_registers = None
+            return data
+
+        data = dict(self.data)
+        changed = set()
+        for address, value in fresh.items():
+            if self._count_invalid(address, value):
+                changed.add(address)
+            if address not in data or data[address] != value:
+                changed.add(address)
+        data.update(fresh)
+        self._changed_registers = changed
+        return data
+
+    def _count_invalid(self, address: int, value) -> bool:
+        """Zählt aufeinanderfolgende ungültige Reads eines Registers.
+
+        Gibt True zurück, wenn AUTO_DETECT_THRESHOLD gerade erreicht wurde
+        (Verfügbarkeit der Auto-Detect-Entities ändert sich).
+        """
+        reg_type = self.register_map.get(address)
+        invalid = value is None or (
+            (reg_type == REG_TYPE_FLOAT and value == INVALID_FLOAT)
+            or (reg_type == REG_TYPE_UCHAR and value == INVALID_UCHAR)
+        )
+        if not invalid:
+            self._invalid_counts.pop(address, None)
+            return False
+        count = self._invalid_counts.get(address, 0) + 1
+        self._invalid_counts[address] = count
+        return count == AUTO_DETECT_THRESHOLD
+
+    # ------------------------------------------------------------------
+    # Snapshot (Sofortstart mit zuletzt gelesenen Werten)
+    # ------------------------------------------------------------------
+
+    @property
+    def is_stale(self) -> bool:
+        """True solange die Daten nur aus dem geladenen Snapshot stammen."""
+        return self._stale
+
+    @property
+    def snapshot_time(self) -> str | None:
+        """Zeitpunkt des geladenen Snapshots (ISO, UTC)."""
+        if self._snapshot_time is None:
+            return None
+        return datetime.fromtimestamp(self._snapshot_time, timezone.utc).isoformat()
+
+    def restore_snapshot(self, stored: dict) -> bool:
+        """Übernimmt einen gespeicherten Snapshot als Startdaten.
+
+        Gibt False zurück, wenn der Snapshot zu alt oder leer ist. Register
+        mit ungültigem Wert starten direkt als ungültig (Auto-Detect).
+        """
+        saved_at = stored.get("saved_at")
+        if not isinstance(saved_at, (int, float)) or time.time() - saved_at > SNAPSHOT_MAX_AGE:
+            return False
+        data = dict.fromkeys(self.register_map)
+        for address, value in stored.get("data", {}).items():
+            address = int(address)
+            if address in data:
+                data[address] = value
+        if all(value is None for value in data.values()):
+            return False
+
+        # Ungültige Werte (-1.0/255) gelten sofort als nicht verbaut (Auto-Detect)
+        for address, value in data.items():
+            if value is not None:
+                self._count_invalid(address, value)
+                if address in self._invalid_counts:
+                    self._invalid_counts[address] = AUTO_DETECT_THRESHOLD
+        self.data = data
+        self._stale = True
+        self._snapshot_time = saved_at
+        _LOGGER.info(
+            "iDM: Start mit gespeichertem Snapshot vom %s (%d Register)",
+            self.snapshot_time, sum(1 for value in data.values() if value is not None),
+        )
+        return True
+
+    def _snapshot_data(self) -> dict:
+        return {
+            "device": self.client.device_key,
+            "saved_at": time.time(),
+            "data": {
+                str(address): value
+                for address, value in (self.data or {}).items()
+                if value is not None
+            },
+        }
+
+    def _async_save_snapshot(self, now: float) -> None:
+        """Speichert den Snapshot höchstens alle SNAPSHOT_SAVE_INTERVAL Sekunden."""
+        if self._snapshot_store is None:
+            return
+        if self._last_snapshot_save is not None and now - self._last_snapshot_save < SNAPSHOT_SAVE_INTERVAL:
+            return
+        self._last_snapshot_save = now
+        self._snapshot_store.async_delay_save(self._snapshot_data, STORAGE_SAVE_DELAY)
+
+    # ------------------------------------------------------------------
+    # Dead-Register-Pruning
+    # ------------------------------------------------------------------
+
+    @property
+    def dead_registers(self) -> set[int]:
+        """Register, die als nicht verbaut aus dem Polling genommen wurden."""
+        return set(self._dead_registers)
+
+    def load_dead_registers(self, addresses) -> None:
+        """Übernimmt persistierte Dead-Register (nur Adressen der aktuellen Map).
+
+        Auto-Detect-Entities dieser Register starten direkt als unavailable.
+        """
+        self._dead_registers = {
+            int(address) for address in addresses if int(address) in self.register_map
+        }
+        for address in self._dead_registers:
+            self._invalid_counts[address] = AUTO_DETECT_THRESHOLD
+        self._map_cache.clear()
+        if self._dead_registers:
+            _LOGGER.info(
+                "iDM: %d nicht verbaute Register werden nur alle %ss geprüft: %s",
+                len(self._dead_registers),
+                DEAD_REGISTER_REPROBE_INTERVAL,
+                sorted(self._dead_registers),
+            )
+
+    def _is_dead_value(self, address: int, value) -> bool:
+        return value is None or (
+            address in self._auto_detect_registers and value == INVALID_FLOAT
+        )
+
+    def _update_dead_registers(self, fresh: dict[int, any]) -> None:
+        """Zählt Fehler pro Register und nimmt tote Register aus dem Polling.
+
+        Fällt mehr als die Hälfte der Register aus, liegt eher ein
+        Verbindungsproblem vor – dann wird nichts gezählt.
+        """
+        dead_values = {
+            address for address, value in fresh.items() if self._is_dead_value(address, value)
+        }
+        if len(dead_values) * 2 > len(fresh):
+            return
+
+        changed = False
+        for address in fresh:
+            if address in dead_values:
+                count = self._dead_counts.get(address, 0) + 1
+                self._dead_counts[address] = count
+                if count >= DEAD_REGISTER_THRESHOLD and address not in self._dead_registers:
+                    self._dead_registers.add(address)
+                    changed = True
+                    _LOGGER.info(
+                        "iDM: Register %s liefert keine gültigen Werte – "
+                        "wird nur noch alle %ss geprüft",
+                        address, DEAD_REGISTER_REPROBE_INTERVAL,
+                    )
+            else:
+                self._dead_counts.pop(address, None)
+                if address in self._dead_registers:
+                    self._dead_registers.discard(address)
+                    changed = True
+                    _LOGGER.info("iDM: Register %s liefert wieder gültige Werte", address)
+
+        if changed:
+            self._map_cache.clear()
+            self._async_save_dead_registers()
+
+    def _async_save_dead_registers(self) -> None:
+        """Persistiert die Dead-Register (verzögert)."""
+        if self._dead_store is None:
+            return
+        dead = sorted(self._dead_registers)
+        device = self.client.device_key
+        self._dead_store.async_delay_save(
+            lambda: {"device": device, "dead_registers": dead},
+            STORAGE_SAVE_DELAY,
+        )
+
+    def invalid_count(self, address: int) -> int:
+        """Anzahl aufeinanderfolgender ungültiger Reads (None/-1.0/255)."""
+        return self._invalid_counts.get(address, 0)
+
+    # ------------------------------------------------------------------
+    # Listener: nur geänderte Register benachrichtigen
+    # ------------------------------------------------------------------
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context=None
+    ) -> CALLBACK_TYPE:
+        """Registriert einen Listener; Context = Register-Adresse der Entity."""
+        remove = super().async_add_listener(update_callback, context)
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._listener_contexts.pop(remove_listener, None)
+            self._listener_index = None
+
+        self._listener_contexts[remove_listener] = (update_callback, context)
+        self._listener_index = None
+        return remove_listener
+
+    def _build_listener_index(self) -> dict[object, list[CALLBACK_TYPE]]:
+        index: dict[object, list[CALLBACK_TYPE]] = {}
+        for update_callback, context in self._listener_contexts.values():
+            index.setdefault(context, []).append(update_callback)
+        return index
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Benachrichtigt nur Listener, deren Register sich geändert hat.
+
+        Listener ohne Context sowie alle Listener bei erstem Update oder
+        Änderung der Verfügbarkeit werden immer benachrichtigt.
+        """
+        changed, self._changed_registers = self._changed_registers, None
+        success_changed = self.last_update_success != self._last_notified_success
+        self._last_notified_success = self.last_update_success
+
+        if changed is None or success_changed or not self.last_update_success:
+            super().async_update_listeners()
+            return
+
+        if self._listener_index is None:
+            self._listener_index = self._build_listener_index()
+        index = self._listener_index
+
+        for update_callback in index.get(None, ()):
+            update_callback()
+        for address in changed:
+            for update_callback in index.get(address, ()):
+                update_callback()
+
+    # ------------------------------------------------------------------
+    # Diagnose
+    # ------------------------------------------------------------------
+
+    def diagnostics(self) -> dict:
+        """Zustand für den Diagnose-Download (Stufen, ungültige Reads)."""
+        now = time.monotonic()
+        return {
+            "last_update_success": self.last_update_success,
+            "stale": self._stale,
+            "snapshot_time": self.snapshot_time,
+            "tick_seconds": self._tick_seconds(),
+            "adaptive": (
+                {
+                    "activity": self._activity,
+                    "change_rate": round(self._change_rate, 4),
+                    "min_interval": self._adaptive_bounds[0],
+                    "max_interval": self._adaptive_bounds[1],
+                }
+                if self._adaptive_bounds is not None else None
+            ),
+            "tiers": {
+                tier: {
+                    "interval": self._tier_intervals[tier],
+                    "registers": len(self._tier_maps[tier]),
+                    "seconds_since_read": (
+                        round(now - self._last_tier_read[tier], 1)
+                        if tier in self._last_tier_read else None
+                    ),
+                }
+                for tier in POLL_TIERS
+            },
+            "invalid_counts": dict(sorted(self._invalid_counts.items())),
+            "dead_registers": sorted(self._dead_registers),
+        }
+
+    # ------------------------------------------------------------------
+    # Gezielter Refresh (nach Schreibzugriffen)
+    # ------------------------------------------------------------------
+
+    async def async_request_register_refresh(self, *addresses: int) -> None:
+        """Fordert das Zurücklesen einzelner Register an.
+
+        Mehrere Anfragen innerhalb von REGISTER_REFRESH_COOLDOWN werden zu
+        einem read_all() über genau diese Register zusammengefasst.
+        """
+        self._pending_registers.update(addresses)
+        await self._register_refresh_debouncer.async_call()
+
+    async def _async_refresh_pending_registers(self) -> None:
+        """Liest die vorgemerkten Register und mergt sie in den Snapshot.
+
+        Bewusst ohne async_set_updated_data(): Poll-Timer und
+        last_update_success bleiben unberührt. Solange die Daten veraltet sind
+        oder das Lesen fehlschlägt, bleiben die Register vorgemerkt und werden
+        mit dem nächsten erfolgreichen Poll gelesen.
+        """
+        if self.data is None or self._stale or not self.last_update_success:
+            return
+        pending, self._pending_registers = self._pending_registers, set()
+        register_map = {
+            address: self.register_map[address]
+            for address in pending
+            if address in self.register_map
+        }
+        if not register_map:
+            return
+
+        try:
+            fresh = await self.client.read_all(register_map, poll=False)
+        except Exception as err:
+            _LOGGER.debug("iDM Register-Refresh %s fehlgeschlagen: %s", sorted(register_map), err)
+            self._pending_registers.update(register_map)
+            return
+
+        self._async_save_write_counts()
+        self.data = self._merge(fresh)
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stoppt den Register-Refresh-Debouncer und sichert den Snapshot."""
+        self._register_refresh_debouncer.async_shutdown()
+        if self._snapshot_store is not None and self.data and not self._stale:
+            await self._snapshot_store.async_save(self._snapshot_data())
+        if self._write_count_store is not None and self.client.write_budget.changed:
+            await self._write_count_store.async_save(self._write_count_data())
+        await super().async_shutdown()
+
+    def _async_save_function_codes(self) -> None:
+        """Persistiert neu gelernte Funktionscodes (verzögert)."""
+        if self._fc_store is None or not self.client.function_codes_changed:
+            return
+        codes = self.client.pop_function_codes()
+        device = self.client.device_key
+        self._fc_store.async_delay_save(
+            lambda: {"device": device, "function_codes": codes},
+            STORAGE_SAVE_DELAY,
+        )
+
+    def _write_count_data(self) -> dict:
+        return {"device": self.client.device_key, **self.client.write_budget.as_dict()}
+
+    def _async_save_write_counts(self) -> None:
+        """Persistiert die EEPROM-Schreibzähler (verzögert), wenn sie sich geändert haben."""
+        if self._write_count_store is None or not self.client.write_budget.changed:
+            return
+        data = self._write_count_data()
+        self._write_count_store.async_delay_save(lambda: data, STORAGE_SAVE_DELAY)
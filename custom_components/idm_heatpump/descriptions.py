@@ -0,0 +1,526 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- ENTITY_DESCRIPTIONS: eine deklarative Tabelle aller Entities (Plattform,
+  Entity-Art, unique_id, Register, Typ, Sensor-Gruppe, Polling-Stufe,
+  Expansion pro Heizkreis). Aus ihr entstehen die Entities der Plattformen,
+  die Register-Map (RegisterPlan) und die erwarteten unique_ids für das
+  Aufräumen verwaister Entitäten.
+- Ohne Home-Assistant-Import (wie const.py), damit Simulator und Benchmark
+  dieselbe Register-Map verwenden. Einheiten, Geräteklassen und
+  Entity-Kategorien stehen als Strings in der Tabelle; die Plattformen
+  wandeln sie in die HA-Enums um.
+"""
+
+from functools import partial
+from types import MappingProxyType
+from typing import NamedTuple
+
+from .const import (
+    HC_ADDRESSES,
+    REG_TYPE_FLOAT,
+    REG_TYPE_UCHAR,
+    REG_TYPE_WORD,
+    TIER_FAST,
+    TIER_NORMAL,
+    TIER_SLOW,
+    # Basis-Register
+    REG_OUTDOOR_TEMP,
+    REG_OUTDOOR_TEMP_AVG,
+    REG_WP_VL_TEMP,
+    REG_RETURN_TEMP,
+    REG_LOAD_TEMP,
+    REG_FLOW_SENSOR,
+    REG_AIR_INLET_TEMP,
+    REG_AIR_INLET_TEMP_2,
+    REG_HEATBUFFER_TEMP,
+    REG_WW_TOP_TEMP,
+    REG_WW_BOTTOM_TEMP,
+    REG_WW_TAP_TEMP,
+    REG_INTERNAL_MESSAGE,
+    REG_WP_MODE,
+    REG_WP_STATUS,
+    REG_SYSTEM_MODE,
+    REG_WP_POWER,
+    REG_THERMAL_POWER,
+    REG_EN_HEATING,
+    REG_EN_TOTAL,
+    REG_EN_COOLING,
+    REG_EN_DHW,
+    REG_EN_DEFROST,
+    REG_EN_PASSIVE_COOL,
+    REG_EN_SOLAR,
+    REG_EN_EHEATER,
+    REG_WW_TARGET,
+    REG_WW_START,
+    REG_WW_STOP,
+    REG_HEAT_REQUEST,
+    REG_WW_REQUEST,
+    REG_WW_ONETIME,
+    # Solar-Gruppe
+    REG_SOLAR_COLLECTOR_TEMP,
+    REG_SOLAR_RETURN_TEMP,
+    REG_SOLAR_CHARGE_TEMP,
+    REG_SOLAR_POWER,
+    REG_SOLAR_MODE,
+    # PV/Batterie-Gruppe
+    REG_PV_SURPLUS,
+    REG_EHEIZSTAB,
+    REG_PV_PRODUKTION,
+    REG_HAUSVERBRAUCH,
+    REG_BATTERIE_ENTLADUNG,
+    REG_BATTERIE_FUELLSTAND,
+    REG_SMARTGRID_STATUS,
+    REG_PV_TARGET,
+    REG_CURRENT_ELEC_PRICE,
+    # Kühlungs-Gruppe
+    REG_COOLING_REQUEST_WP,
+    REG_WW_REQUEST_WP,
+    REG_COOL_REQUEST,
+    # Diagnose-Gruppe
+    REG_FAULT_SUMMARY,
+    REG_EVU_LOCK,
+    REG_COMPRESSOR_1,
+    REG_CHARGE_PUMP,
+    REG_VARIABLE_INPUT,
+    REG_SWITCH_VALVE_HC,
+    REG_CIRC_PUMP,
+    REG_POWER_LIMIT,
+    # Einzelraumregelung-Gruppe
+    REG_HUMIDITY_SENSOR,
+    # Erweiterte Temperaturen-Gruppe
+    REG_HEAT_EXCHANGER_TEMP,
+    REG_HEATSINK_RETURN,
+    REG_HEATSINK_SUPPLY,
+    REG_COLD_STORAGE_TEMP,
+)
+
+PLATFORM_SENSOR = "sensor"
+PLATFORM_NUMBER = "number"
+PLATFORM_SELECT = "select"
+PLATFORM_SWITCH = "switch"
+
+# Entity-Arten (Klasse innerhalb der Plattform)
+KIND_FLOAT = "float"              # sensor: IDMFloatSensor, number: IDMFloatNumber
+KIND_AUTO_FLOAT = "auto_float"    # sensor: IDMAutoDetectFloatSensor (Auto-Detect-Register)
+KIND_MAPPED = "mapped"            # sensor: IDMMappedSensor
+KIND_WORD = "word"                # sensor: IDMWordSensor
+KIND_FLOW = "flow"                # sensor: IDMFlowSensor
+KIND_MESSAGE = "message"          # sensor: IDMInternalMessageSensor
+KIND_POLL_METRIC = "poll_metric"  # sensor: IDMPollMetricSensor (ohne Register)
+KIND_WRITE_COUNT = "write_count"  # sensor: IDMWriteCountSensor (ohne Register)
+KIND_UCHAR = "uchar"              # number: IDMUcharNumber
+KIND_MODE = "mode"                # select: IDMModeSelect
+KIND_REQUEST = "request"          # switch: IDMSwitch
+
+# Werte der HA-Enums (UnitOf*, SensorDeviceClass, SensorStateClass, EntityCategory)
+_CELSIUS = "°C"
+_KILO_WATT = "kW"
+_KILO_WATT_HOUR = "kWh"
+_PERCENTAGE = "%"
+_DIAGNOSTIC = "diagnostic"
+_CONFIG = "config"
+
+_TEMPERATURE = {"unit": _CELSIUS, "device_class": "temperature", "state_class": "measurement"}
+_POWER = {"unit": _KILO_WATT, "device_class": "power", "state_class": "measurement"}
+_ENERGY = {"unit": _KILO_WATT_HOUR, "device_class": "energy", "state_class": "total_increasing"}
+
+# -------------------------------------------------------------------
+# Werte-/Icon-Maps
+# -------------------------------------------------------------------
+WP_MODE_MAP = {0: "Bereit", 1: "Heizbetrieb", 2: "Kühlbetrieb", 3: "Unbekannt",
+               4: "Warmwasser", 8: "Abtauen"}
+
+HC_ACTIVE_MODE_MAP = {0: "Aus", 1: "Heizen", 2: "Kühlen"}
+
+# SmartGrid Status Mapping
+SMARTGRID_MAP = {
+    0: "Aus",
+    1: "Normalbetrieb",
+    2: "Empfehlung: Einschalten",
+    3: "Einschaltbefehl",
+    4: "Abschaltbefehl",
+}
+
+# Variabler Eingang Mapping
+VARIABLE_INPUT_MAP = {
+    0: "Keine Funktion",
+    1: "EVU-Sperre",
+    2: "Sperre Verdichter",
+    3: "Externer Fehler",
+    4: "Sommerbetrieb",
+    5: "Winterbetrieb",
+}
+
+REQUEST_MAP = {0: "Keine Anforderung", 1: "Anforderung aktiv"}
+
+SYSTEM_OPTIONS = {
+    "Standby": 0,
+    "Automatik": 1,
+    "Abwesend": 2,
+    "Urlaub": 3,
+    "Nur Warmwasser": 4,
+    "Nur Heizen/Kühlen": 5,
+}
+
+SYSTEM_INFO = {
+    "Standby": "Gerät auf Standby. Frostschutz ist aktiv.",
+    "Automatik": "Bei Einstellung „Automatik“ läuft das System nach den eingestellten Heiz-, Kühl- und Warmwasserladezeiten.",
+    "Abwesend": "Bei Einstellung „Abwesend“ läuft das System im Eco-Betrieb. Räume mit Eco-Temperatur. Warmwasser gemäß eingestellten Ladezeiten.",
+    "Urlaub": "Bei Einstellung „Urlaub“ läuft das System für Heizen und Kühlen im Eco-Betrieb. Die Warmwasserladung kann ein-/ausgeschaltet werden.",
+    "Nur Warmwasser": "Bei der Einstellung „Nur Warmwasser“ läuft die Wärmepumpe nur für Warmwasserladung ohne Heizbetrieb.",
+    "Nur Heizen/Kühlen": "Bei der Einstellung „Nur Heizen/Kühlen“ arbeitet die Anlage nur für Raumheizen bzw. aktives Kühlen. Keine Warmwasserladung.",
+}
+
+SYSTEM_ICONS = {
+    "Standby": "mdi:power-standby",
+    "Automatik": "mdi:home-account",
+    "Abwesend": "mdi:home-thermometer-outline",
+    "Urlaub": "mdi:bag-suitcase-outline",
+    "Nur Warmwasser": "mdi:water-thermometer",
+    "Nur Heizen/Kühlen": "mdi:heat-wave",
+}
+
+HK_OPTIONS = {
+    "Aus": 0,
+    "Zeitprogramm": 1,
+    "Normal": 2,
+    "Eco": 3,
+    "Manuell Heizen": 4,
+    "Manuell Kühlen": 5,
+}
+
+SOLAR_OPTIONS = {
+    "Automatik": 0,
+    "Warmwasser": 1,
+    "Heizung": 2,
+    "Warmwasser + Heizung": 3,
+    "Wärmequelle / Pool": 4,
+}
+
+
+class IDMEntityDescription(NamedTuple):
+    """Eine Zeile der Entity-Tabelle.
+
+    register ist eine Adresse, ein HC-Registername (str, siehe HC_REGISTERS:
+    eine Entity pro Heizkreis, {key} in key/translation_key = Heizkreis in
+    Kleinbuchstaben) oder None für Entities ohne Register.
+    """
+
+    platform: str
+    kind: str
+    key: str                  # unique_id-Key (ohne Config-Entry)
+    translation_key: str
+    register: int | str | None
+    reg_type: str | None
+    group: str | None         # Sensor-Gruppe, None = immer
+    tier: str
+    params: MappingProxyType  # Konstruktor-Argumente der Entity-Klasse
+
+    @property
+    def per_circuit(self) -> bool:
+        return isinstance(self.register, str)
+
+    @property
+    def auto_detect(self) -> bool:
+        """Register liefert -1.0, wenn der Fühler nicht verbaut ist."""
+        return self.kind == KIND_AUTO_FLOAT
+
+
+def _describe(
+    platform: str,
+    kind: str,
+    key: str,
+    register: int | str | None = None,
+    reg_type: str | None = None,
+    group: str | None = None,
+    tier: str = TIER_NORMAL,
+    translation_key: str | None = None,
+    **params,
+) -> IDMEntityDescription:
+    if translation_key is None:
+        translation_key = key.removeprefix("idm_")
+    return IDMEntityDescription(
+        platform, kind, key, translation_key, register, reg_type, group, tier,
+        MappingProxyType(params),
+    )
+
+
+_sensor = partial(_describe, PLATFORM_SENSOR)
+_number = partial(_describe, PLATFORM_NUMBER)
+_select = partial(_describe, PLATFORM_SELECT)
+_switch = partial(_describe, PLATFORM_SWITCH)
+
+_F = REG_TYPE_FLOAT
+_U = REG_TYPE_UCHAR
+_W = REG_TYPE_WORD
+
+
+ENTITY_DESCRIPTIONS: tuple[IDMEntityDescription, ...] = (
+    # ===================================================================
+    # BASIS (immer aktiv)
+    # ===================================================================
+    # Außentemperaturen
+    _sensor(KIND_FLOAT, "idm_aussentemperatur", REG_OUTDOOR_TEMP, _F, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_aussentemperatur_gemittelt", REG_OUTDOOR_TEMP_AVG, _F, **_TEMPERATURE),
+    # Wärmepumpe direkt
+    _sensor(KIND_FLOAT, "idm_wp_vorlauf", REG_WP_VL_TEMP, _F, tier=TIER_FAST, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_ruecklauf", REG_RETURN_TEMP, _F, tier=TIER_FAST, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_ladefuehler", REG_LOAD_TEMP, _F, tier=TIER_FAST, **_TEMPERATURE),
+    _sensor(KIND_FLOW, "idm_durchfluss", REG_FLOW_SENSOR, _U, tier=TIER_FAST),
+    _sensor(KIND_FLOAT, "idm_luftansaug", REG_AIR_INLET_TEMP, _F, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_luftansaug_2", REG_AIR_INLET_TEMP_2, _F, **_TEMPERATURE),
+    # Wärmespeicher / Warmwasser
+    _sensor(KIND_FLOAT, "idm_waermespeicher", REG_HEATBUFFER_TEMP, _F, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_ww_oben", REG_WW_TOP_TEMP, _F, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_ww_unten", REG_WW_BOTTOM_TEMP, _F, **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_ww_zapftemp", REG_WW_TAP_TEMP, _F, **_TEMPERATURE),
+    # System: Interne Meldung
+    _sensor(KIND_MESSAGE, "idm_interne_meldung", REG_INTERNAL_MESSAGE, _U,
+            entity_category=_DIAGNOSTIC),
+    # Betriebsart + Status WP
+    _sensor(KIND_MAPPED, "idm_betriebsart_warmepumpe", REG_WP_MODE, _U, tier=TIER_FAST,
+            value_map=WP_MODE_MAP,
+            icon_map={
+                "Bereit": "mdi:power-standby",
+                "Heizbetrieb": "mdi:radiator",
+                "Kühlbetrieb": "mdi:snowflake",
+                "Abtauen": "mdi:water-sync",
+                "Warmwasser": "mdi:water-boiler",
+            }),
+    _sensor(KIND_MAPPED, "idm_status_warmepumpe", REG_WP_STATUS, _U, tier=TIER_FAST,
+            value_map={0: "Bereit", 1: "Heizbetrieb"},
+            icon_map={"Bereit": "mdi:power-standby", "Heizbetrieb": "mdi:radiator"}),
+    # Leistungen
+    _sensor(KIND_FLOAT, "idm_wp_power", REG_WP_POWER, _F, tier=TIER_FAST, **_POWER),
+    _sensor(KIND_FLOAT, "idm_thermische_leistung", REG_THERMAL_POWER, _F, tier=TIER_FAST, **_POWER),
+    # Energiemengen
+    _sensor(KIND_FLOAT, "idm_en_heizen", REG_EN_HEATING, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_gesamt", REG_EN_TOTAL, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_kuehlen", REG_EN_COOLING, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_warmwasser", REG_EN_DHW, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_abtauung", REG_EN_DEFROST, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_passivkuehlung", REG_EN_PASSIVE_COOL, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_solar", REG_EN_SOLAR, _F, tier=TIER_SLOW, **_ENERGY),
+    _sensor(KIND_FLOAT, "idm_en_eheizer", REG_EN_EHEATER, _F, tier=TIER_SLOW, **_ENERGY),
+    # Warmwasser-Sollwerte
+    _number(KIND_UCHAR, "idm_ww_target", REG_WW_TARGET, _U, tier=TIER_SLOW,
+            min_value=30, max_value=60, step=1, default=46),
+    _number(KIND_UCHAR, "idm_ww_start", REG_WW_START, _U, tier=TIER_SLOW,
+            min_value=30, max_value=50, step=1, default=46),
+    _number(KIND_UCHAR, "idm_ww_stop", REG_WW_STOP, _U, tier=TIER_SLOW,
+            min_value=46, max_value=67, step=1, default=50),
+    # System-Betriebsart
+    _select(KIND_MODE, "idm_betriebsart", REG_SYSTEM_MODE, _U, tier=TIER_SLOW,
+            options_map=SYSTEM_OPTIONS, info_map=SYSTEM_INFO, icon_map=SYSTEM_ICONS),
+    # Anforderungen
+    _switch(KIND_REQUEST, "idm_heat_request", REG_HEAT_REQUEST, _U,
+            icon_on="mdi:radiator", icon_off="mdi:radiator-off"),
+    _switch(KIND_REQUEST, "idm_ww_request", REG_WW_REQUEST, _U,
+            icon_on="mdi:water-boiler", icon_off="mdi:water-boiler-off"),
+    _switch(KIND_REQUEST, "idm_ww_onetime", REG_WW_ONETIME, _U,
+            icon_on="mdi:water-boiler", icon_off="mdi:water-boiler-off"),
+
+    # ===================================================================
+    # PRO HEIZKREIS (immer aktiv)
+    # ===================================================================
+    _sensor(KIND_FLOAT, "idm_hk{key}_vorlauftemperatur", "vl", _F, tier=TIER_FAST,
+            translation_key="hk{key}_vorlauf", **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_hk{key}_soll_vorlauf", "vl_soll", _F, **_TEMPERATURE),
+    _sensor(KIND_MAPPED, "idm_hk{key}_aktive_betriebsart", "active_mode", _U,
+            value_map=HC_ACTIVE_MODE_MAP,
+            icon_map={
+                "Aus": "mdi:power-standby",
+                "Heizen": "mdi:radiator",
+                "Kühlen": "mdi:snowflake",
+            }),
+    _number(KIND_FLOAT, "idm_hk{key}_temp_normal", "temp_normal", _F, tier=TIER_SLOW,
+            min_value=15, max_value=30, step=0.5, default=22),
+    _number(KIND_FLOAT, "idm_hk{key}_temp_eco", "temp_eco", _F, tier=TIER_SLOW,
+            min_value=10, max_value=25, step=0.5, default=18),
+    _number(KIND_FLOAT, "idm_hk{key}_curve", "curve", _F, tier=TIER_SLOW,
+            min_value=0.1, max_value=3.5, step=0.1, default=0.6),
+    _number(KIND_UCHAR, "idm_hk{key}_parallel", "parallel", _U, tier=TIER_SLOW,
+            min_value=0, max_value=30, step=1, default=0),
+    _number(KIND_UCHAR, "idm_hk{key}_heat_limit", "heat_limit", _U, tier=TIER_SLOW,
+            min_value=0, max_value=50, step=1, default=15),
+    _select(KIND_MODE, "idm_hk{key}_betriebsart", "mode", _U, tier=TIER_SLOW,
+            options_map=HK_OPTIONS),
+
+    # ===================================================================
+    # SOLAR-GRUPPE
+    # ===================================================================
+    _sensor(KIND_FLOAT, "idm_solar_kollektor", REG_SOLAR_COLLECTOR_TEMP, _F, "solar", **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_solar_ruecklauf", REG_SOLAR_RETURN_TEMP, _F, "solar", **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_solar_ladetemp", REG_SOLAR_CHARGE_TEMP, _F, "solar", **_TEMPERATURE),
+    _sensor(KIND_FLOAT, "idm_solar_leistung", REG_SOLAR_POWER, _F, "solar", tier=TIER_FAST, **_POWER),
+    _select(KIND_MODE, "idm_solar_betriebsart", REG_SOLAR_MODE, _U, "solar", tier=TIER_SLOW,
+            options_map=SOLAR_OPTIONS),
+
+    # ===================================================================
+    # PV / BATTERIE-GRUPPE
+    # ===================================================================
+    _sensor(KIND_FLOAT, "idm_pv_ueberschuss", REG_PV_SURPLUS, _F, "pv_battery", **_POWER),
+    _sensor(KIND_FLOAT, "idm_e_heizstab", REG_EHEIZSTAB, _F, "pv_battery", **_POWER),
+    _sensor(KIND_FLOAT, "idm_pv_produktion", REG_PV_PRODUKTION, _F, "pv_battery", **_POWER),
+    _sensor(KIND_FLOAT, "idm_hausverbrauch", REG_HAUSVERBRAUCH, _F, "pv_battery", **_POWER),
+    _sensor(KIND_FLOAT, "idm_batterie_entladung", REG_BATTERIE_ENTLADUNG, _F, "pv_battery", **_POWER),
+    _sensor(KIND_WORD, "idm_batterie_fuellstand", REG_BATTERIE_FUELLSTAND, _W, "pv_battery",
+            unit=_PERCENTAGE, entity_category=_DIAGNOSTIC),
+    _sensor(KIND_MAPPED, "idm_smartgrid_status", REG_SMARTGRID_STATUS, _U, "pv_battery",
+            value_map=SMARTGRID_MAP,
+            icon_map={
+                "Aus": "mdi:transmission-tower-off",
+                "Normalbetrieb": "mdi:transmission-tower",
+                "Empfehlung: Einschalten": "mdi:flash",
+                "Einschaltbefehl": "mdi:flash-alert",
+                "Abschaltbefehl": "mdi:flash-off",
+            }),
+    _sensor(KIND_FLOAT, "idm_strompreis", REG_CURRENT_ELEC_PRICE, _F, "pv_battery",
+            unit="ct/kWh", device_class=None, state_class="measurement"),
+    _number(KIND_FLOAT, "idm_pv_zielwert", REG_PV_TARGET, _F, "pv_battery", tier=TIER_SLOW,
+            min_value=0.0, max_value=50.0, step=0.1, default=0.0, unit=_KILO_WATT),
+
+    # ===================================================================
+    # KÜHLUNGS-GRUPPE
+    # ===================================================================
+    _sensor(KIND_MAPPED, "idm_kuehlanforderung_wp", REG_COOLING_REQUEST_WP, _U, "cooling",
+            value_map=REQUEST_MAP,
+            icon_map={
+                "Keine Anforderung": "mdi:snowflake-off",
+                "Anforderung aktiv": "mdi:snowflake-alert",
+            }),
+    _sensor(KIND_MAPPED, "idm_ww_anforderung_wp", REG_WW_REQUEST_WP, _U, "cooling",
+            value_map=REQUEST_MAP,
+            icon_map={
+                "Keine Anforderung": "mdi:water-boiler-off",
+                "Anforderung aktiv": "mdi:water-boiler-alert",
+            }),
+    _switch(KIND_REQUEST, "idm_cool_request", REG_COOL_REQUEST, _U, "cooling",
+            icon_on="mdi:snowflake", icon_off="mdi:snowflake-off"),
+    # Kühl-Numbers pro Heizkreis
+    _number(KIND_FLOAT, "idm_hk{key}_cool_normal", "cool_normal", _F, "cooling", tier=TIER_SLOW,
+            min_value=18, max_value=30, step=0.5, default=24),
+    _number(KIND_FLOAT, "idm_hk{key}_cool_eco", "cool_eco", _F, "cooling", tier=TIER_SLOW,
+            min_value=20, max_value=32, step=0.5, default=26),
+    _number(KIND_UCHAR, "idm_hk{key}_cool_limit", "cool_limit", _U, "cooling", tier=TIER_SLOW,
+            min_value=10, max_value=40, step=1, default=20),
+    _number(KIND_UCHAR, "idm_hk{key}_cool_vl", "cool_vl", _U, "cooling", tier=TIER_SLOW,
+            min_value=10, max_value=25, step=1, default=18),
+
+    # ===================================================================
+    # DIAGNOSE-GRUPPE (Default-Disabled!)
+    # ===================================================================
+    _sensor(KIND_MAPPED, "idm_summenstoerung", REG_FAULT_SUMMARY, _U, "diagnostic",
+            value_map={0: "Keine Störung", 1: "Störung aktiv"},
+            icon_map={
+                "Keine Störung": "mdi:check-circle-outline",
+                "Störung aktiv": "mdi:alert-circle",
+            },
+            entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_MAPPED, "idm_evu_sperre", REG_EVU_LOCK, _U, "diagnostic",
+            value_map={0: "Nicht gesperrt", 1: "Gesperrt"},
+            icon_map={
+                "Nicht gesperrt": "mdi:lock-open-outline",
+                "Gesperrt": "mdi:lock",
+            },
+            entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_MAPPED, "idm_verdichter_1", REG_COMPRESSOR_1, _U, "diagnostic", tier=TIER_FAST,
+            value_map={0: "Aus", 1: "Ein"},
+            icon_map={"Aus": "mdi:engine-off-outline", "Ein": "mdi:engine"},
+            entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_WORD, "idm_ladepumpe", REG_CHARGE_PUMP, _W, "diagnostic",
+            unit=_PERCENTAGE, entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_MAPPED, "idm_variabler_eingang", REG_VARIABLE_INPUT, _U, "diagnostic",
+            value_map=VARIABLE_INPUT_MAP,
+            entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_WORD, "idm_umschaltventil", REG_SWITCH_VALVE_HC, _W, "diagnostic",
+            unit=_PERCENTAGE, entity_category=_DIAGNOSTIC, default_enabled=False),
+    _sensor(KIND_WORD, "idm_zirkulationspumpe", REG_CIRC_PUMP, _W, "diagnostic",
+            unit=_PERCENTAGE, entity_category=_DIAGNOSTIC, default_enabled=False),
+    _number(KIND_FLOAT, "idm_leistungsbegrenzung", REG_POWER_LIMIT, _F, "diagnostic", tier=TIER_SLOW,
+            min_value=0.0, max_value=100.0, step=1.0, default=100.0, unit=_KILO_WATT,
+            entity_category=_CONFIG, default_enabled=False),
+
+    # ===================================================================
+    # EINZELRAUMREGELUNG-GRUPPE (Auto-Detect!)
+    # ===================================================================
+    _sensor(KIND_AUTO_FLOAT, "idm_hk{key}_raumtemperatur", "room_temp", _F, "room_control",
+            **_TEMPERATURE),
+    _sensor(KIND_AUTO_FLOAT, "idm_feuchtesensor", REG_HUMIDITY_SENSOR, _F, "room_control",
+            unit=_PERCENTAGE, device_class="humidity", state_class="measurement"),
+
+    # ===================================================================
+    # ERWEITERTE TEMPERATUREN-GRUPPE (Auto-Detect!)
+    # ===================================================================
+    _sensor(KIND_AUTO_FLOAT, "idm_luftwaermetauscher", REG_HEAT_EXCHANGER_TEMP, _F, "extended_temps",
+            **_TEMPERATURE),
+    _sensor(KIND_AUTO_FLOAT, "idm_waermesenke_ruecklauf", REG_HEATSINK_RETURN, _F, "extended_temps",
+            **_TEMPERATURE),
+    _sensor(KIND_AUTO_FLOAT, "idm_waermesenke_vorlauf", REG_HEATSINK_SUPPLY, _F, "extended_temps",
+            **_TEMPERATURE),
+    _sensor(KIND_AUTO_FLOAT, "idm_kaeltespeicher", REG_COLD_STORAGE_TEMP, _F, "extended_temps",
+            **_TEMPERATURE),
+
+    # ===================================================================
+    # OHNE REGISTER: Poll-Diagnose (standardmäßig deaktiviert) + EEPROM-Schreibzähler
+    # total=True: Summe seit dem Start (total_metrics), sonst Wert des letzten Polls
+    # ===================================================================
+    _sensor(KIND_POLL_METRIC, "idm_poll_dauer", metric="duration_ms",
+            unit="ms", device_class="duration"),
+    _sensor(KIND_POLL_METRIC, "idm_poll_requests", metric="requests"),
+    _sensor(KIND_POLL_METRIC, "idm_poll_bytes", metric="bytes",
+            unit="B", device_class="data_size"),
+    _sensor(KIND_POLL_METRIC, "idm_poll_fehler_requests", metric="failed_requests"),
+    _sensor(KIND_POLL_METRIC, "idm_poll_fehler_register", metric="failed_registers"),
+    _sensor(KIND_POLL_METRIC, "idm_poll_wiederholungen", metric="retries"),
+    _sensor(KIND_POLL_METRIC, "idm_modbus_reconnects", metric="reconnects", total=True),
+    _sensor(KIND_WRITE_COUNT, "idm_schreibzugriffe_heute", counter="daily_counts"),
+    _sensor(KIND_WRITE_COUNT, "idm_schreibzugriffe_woche", counter="weekly_counts"),
+    _sensor(KIND_WRITE_COUNT, "idm_schreibzugriffe_verworfen", counter="rejected_counts"),
+)
+
+
+class ExpandedEntity(NamedTuple):
+    """Eine Entity der aktuellen Konfiguration (Beschreibung pro Heizkreis aufgelöst)."""
+
+    description: IDMEntityDescription
+    key: str
+    translation_key: str
+    address: int | None
+    circuit: str | None
+
+
+def expand_descriptions(
+    heating_circuits: list[str],
+    sensor_groups: list[str],
+    descriptions: tuple[IDMEntityDescription, ...] = ENTITY_DESCRIPTIONS,
+) -> tuple[ExpandedEntity, ...]:
+    """Alle Entities der Konfiguration in Tabellen-Reihenfolge.
+
+    Beschreibungen inaktiver Sensor-Gruppen entfallen, HC-Beschreibungen
+    werden für jeden aktiven Heizkreis aufgelöst.
+    """
+    entities = []
+    for description in descriptions:
+        if description.group is not None and description.group not in sensor_groups:
+            continue
+        if not description.per_circuit:
+            entities.append(ExpandedEntity(
+                description, description.key, description.translation_key,
+                description.register, None,
+            ))
+            continue
+        for hc in heating_circuits:
+            key = hc.lower()
+            entities.append(ExpandedEntity(
+                description,
+                description.key.format(key=key),
+                description.translation_key.format(key=key),
+                HC_ADDRESSES[(hc, description.register)],
+                hc,
+            ))
+    return tuple(entities)
@@ -0,0 +1,79 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Diagnose-Download: Konfiguration, Polling-Stufen, Read-Plan, Poll-Metriken
+  und Latenz-Histogramme pro Register
+- Zustand des Circuit Breakers (Verbindungsüberwachung)
+- Zähler der Write-Queue (angefordert, zusammengefasst, Requests)
+- EEPROM-Schreibzähler und Schreibbudget
+- Kurzübersicht des Register-Plans (Register pro Stufe, Auto-Detect,
+  unique_id-Keys der Entities pro Register)
+- Gelernte, nicht lesbare Lücken der Block-Reads (modbus.block_breaks)
+"""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+
+from .const import DOMAIN, LATENCY_BUCKETS_MS
+
+TO_REDACT = {CONF_HOST, "room_temp_entities"}
+
+
+def _histogram_labels() -> list[str]:
+    labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS]
+    labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+    return labels
+
+
+async def async_get_config_entry_diagnostics(hass, entry) -> dict:
+    """Diagnose-Daten für einen Config-Entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    client = entry_data["client"]
+
+    labels = _histogram_labels()
+    histograms = {
+        address: dict(zip(labels, counts))
+        for address, counts in sorted(client.latency_histograms.items())
+    }
+    plan = [
+        {
+            "function": block.function,
+            "start": block.start,
+            "count": block.count,
+            "registers": len(block.registers),
+            "fallback": block.fallback,
+        }
+        for block in client.get_read_plan(coordinator.register_map)
+    ]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": coordinator.diagnostics(),
+        "register_plan": coordinator.plan.diagnostics(),
+        "modbus": {
+            "connected": client.is_connected,
+            "connection": client.connection_diagnostics(),
+            "writes": client.write_stats,
+            "write_budget": {
+                "daily_budget": client.write_budget.daily_budget,
+                "today": client.write_budget.daily_counts,
+                "week": client.write_budget.weekly_counts,
+                "rejected": client.write_budget.rejected_counts,
+            },
+            "function_codes": len(client.function_codes),
+            "block_breaks": client.block_breaks,
+            "read_plan": plan,
+        },
+        "metrics": {
+            "last_poll": client.last_poll_metrics,
+            "total": client.total_metrics,
+            "latency_histograms": histograms,
+        },
+    }
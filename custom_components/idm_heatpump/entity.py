@@ -0,0 +1,44 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- IDMRegisterEntity: gemeinsame Basis für Entities, deren Wert aus einem
+  Register des Coordinator-Snapshots stammt. Solange nur der beim Start
+  geladene Snapshot vorliegt, tragen sie das Attribut "veraltet".
+- description_kwargs(): Konstruktor-Argumente einer Zeile der Entity-Tabelle
+  (descriptions.py), Entity-Kategorie als HA-Enum
+"""
+
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+ATTR_STALE = "veraltet"
+ATTR_SNAPSHOT_TIME = "snapshot_zeit"
+
+
+def description_kwargs(description) -> dict:
+    """Konstruktor-Argumente einer Tabellenzeile (params ohne HA-Typen)."""
+    kwargs = dict(description.params)
+    if kwargs.get("entity_category") is not None:
+        kwargs["entity_category"] = EntityCategory(kwargs["entity_category"])
+    return kwargs
+
+
+class IDMRegisterEntity(CoordinatorEntity):
+    """Coordinator-Entity für ein Register (Listener-Context = Register)."""
+
+    def __init__(self, coordinator, register):
+        super().__init__(coordinator, context=register)
+        self._register = register
+
+    @property
+    def extra_state_attributes(self):
+        """Markiert wiederhergestellte Snapshot-Werte bis zum ersten Poll."""
+        if not self.coordinator.is_stale:
+            return None
+        return {
+            ATTR_STALE: True,
+            ATTR_SNAPSHOT_TIME: self.coordinator.snapshot_time,
+        }
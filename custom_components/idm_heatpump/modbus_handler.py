@@ -1,7 +1,61 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v4.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Read-Planer: read_all() fasst die Register-Map zu zusammenhängenden Blöcken
+  (max. 125 Register, kleine Lücken werden mitgelesen) zusammen und dekodiert
+  FLOAT/UCHAR/WORD aus dem Block. Ein Request pro Block statt pro Register.
+- Fallback auf Einzel-Reads, wenn ein Block-Read fehlschlägt
+- Funktionscode-Cache: Pro FLOAT-Adresse wird gelernt, ob sie als Input- oder
+  Holding-Register lesbar ist (function_codes / load_function_codes()).
+  Bekannte Adressen werden direkt mit dem passenden Funktionscode gelesen.
+- Pipeline (optional, pipeline_depth > 1): pymodbus (ab 3.10) serialisiert
+  die Requests eines Clients, parallele Block-Reads laufen daher über einen
+  Pool zusätzlicher TCP-Verbindungen; ein AIMD-Fenster (halbiert bei Requests
+  ohne Antwort, +1 nach PIPELINE_GROW_AFTER Antworten) begrenzt die Requests
+  in Flight. Standard bleibt seriell über eine Verbindung
+- Poll-Metriken pro read_all(): Dauer, Requests, Bytes, Fehler, Retries,
+  Reconnects (last_poll_metrics/total_metrics) + Latenz-Histogramme pro Register
+- BlockDecoder: vorkompiliertes struct-Layout pro Block (beim Planen erzeugt),
+  dekodiert alle FLOAT/UCHAR/WORD eines Block-Reads mit einem unpack_from()
+- ConnectionSupervisor: Circuit Breaker (closed/open/half_open) mit
+  exponentiellem Backoff + Jitter. Bei offenem Breaker schlagen Reads und
+  Writes sofort fehl (ModbusCircuitOpenError), der Reconnect läuft als
+  Hintergrund-Task; keine Einzel-Read-Fallbacks ohne Verbindung
+- Write-Queue: write_float/write_word/write_uchar werden serialisiert, Werte
+  für dieselbe Adresse zusammengefasst (letzter Wert gewinnt) und benachbarte
+  Register mit einem write_registers() geschrieben. Anliegende Writes werden
+  vor dem nächsten Block-Read eines Polls ausgeführt (Vorrang)
+- Write-Queue sammelt WRITE_COALESCE_WINDOW lang, bevor sie schreibt: auch
+  ohne laufenden Flush/Poll werden kurz nacheinander angeforderte Werte
+  (Slider, Automationen) zusammengefasst
+- write_floats(): mehrere FLOAT-Werte gemeinsam einreihen (Raumtemperaturen
+  aller Heizkreise in einem Request)
+- WriteBudget: Schreibzugriffe pro Register und Tag/Woche zählen, Token-Bucket
+  pro Register (Budget pro Tag, Burst); bei leerem Bucket wird der Write mit
+  WriteBudgetExceededError verworfen. Zähler werden vom Coordinator persistiert
+- Unit ID wird bei allen Reads/Writes übergeben (device_id); bisher wirkte
+  CONF_UNIT_ID nicht
+- ModbusConnection: eine TCP-Verbindung pro Host/Port, geteilt von mehreren
+  Wärmepumpen (Unit IDs) hinter einem Gateway; Circuit Breaker pro Verbindung,
+  Request-Plätze werden reihum an die Unit IDs vergeben (fair), Writes zuerst
+- async_probe(): nicht blockierender Verbindungstest für den Config-Flow
+  (liest REG_OUTDOOR_TEMP über die Unit ID, prüft die antwortende Unit, misst
+  die Latenz); Fehler als ModbusProbeError mit Fehlerschlüssel
+- async_discover(): Hardware-Scan (Kennregister HK A–G + Gruppen-Fühler per
+  Block-Read) für die Vorauswahl im Config-Flow
+- Hardware-Erkennung (build_discovery_register_map/detect_hardware) aus register_plan
+- Block-Plan-Cache als LRU (READ_PLAN_CACHE_SIZE): Read-Back- und Probe-Maps
+  lassen den Cache nicht mehr unbegrenzt wachsen
+- Nicht lesbare Lücken: schlägt ein Block-Read fehl, wird der Block an der
+  mittleren Lücke geteilt; sind beide Hälften lesbar, wird die Lücke gelernt
+  (block_breaks) und der Block ab dem nächsten Poll ohne sie geplant
+- read_all() läuft pro Handler seriell; der Read-Back nach Writes (poll=False)
+  zählt weder für den Circuit Breaker noch für die Poll-Metriken
+- WriteBudget.refund(): schlägt ein Write fehl (Timeout, abgelehnt), wird das
+  Token zurückgegeben; Bucket und Tages-/Wochenzähler bleiben konsistent
 
 Änderungen v4.0 (Refactoring Schritt 1):
 - Neue Methode read_all(): Liest alle Register aus einer Map in einem Durchlauf
@@ -10,20 +64,810 @@ Stand: 2026-02-26
 - Bestehende Einzelmethoden (read_float, read_uchar, etc.) bleiben erhalten
 """
 
+import asyncio
+import bisect
 import logging
+import random
 import struct
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import NamedTuple
+
 from pymodbus.client import AsyncModbusTcpClient
-from .const import DEFAULT_PORT, DEFAULT_UNIT_ID, REG_TYPE_FLOAT, REG_TYPE_UCHAR, REG_TYPE_WORD
+from pymodbus.exceptions import ModbusException
+from .const import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    RECONNECT_BACKOFF_INITIAL,
+    RECONNECT_BACKOFF_JITTER,
+    RECONNECT_BACKOFF_MAX,
+    DEFAULT_PORT,
+    DEFAULT_UNIT_ID,
+    DEFAULT_PIPELINE_DEPTH,
+    MAX_PIPELINE_DEPTH,
+    PIPELINE_GROW_AFTER,
+    PIPELINE_RECONNECT_INTERVAL,
+    PROBE_GATEWAY_EXCEPTIONS,
+    PROBE_TIMEOUT,
+    REG_OUTDOOR_TEMP,
+    DEFAULT_WRITE_BUDGET,
+    WRITE_BUDGET_BURST,
+    WRITE_COALESCE_WINDOW,
+    LATENCY_BUCKETS_MS,
+    MODBUS_EXCEPTION_BYTES,
+    MODBUS_READ_REQUEST_BYTES,
+    MODBUS_READ_RESPONSE_BYTES,
+    POLL_METRIC_KEYS,
+    MODBUS_MAX_READ_REGISTERS,
+    MODBUS_MAX_WRITE_REGISTERS,
+    READ_BLOCK_MAX_GAP,
+    READ_PLAN_CACHE_SIZE,
+    REG_TYPE_FLOAT,
+    REG_TYPE_SIZES,
+    REG_TYPE_UCHAR,
+    REG_TYPE_WORD,
+)
+from .register_plan import build_discovery_register_map, detect_hardware
 
 _LOGGER = logging.getLogger(__name__)
 
+# Funktionscodes
+FC_INPUT = "input"      # 0x04 Read Input Registers
+FC_HOLDING = "holding"  # 0x03 Read Holding Registers
+
+
+# ------------------------------------------------------------------
+# Read-Planer
+# ------------------------------------------------------------------
+
+# struct-Formatzeichen pro Typ (Little-Endian über die gepackten 16-bit-Register):
+# FLOAT = Low-Word + High-Word → "f", UCHAR = Low-Byte des Registers → "B" + Pad
+_LAYOUT_FORMATS = {
+    REG_TYPE_FLOAT: "f",
+    REG_TYPE_UCHAR: "Bx",
+    REG_TYPE_WORD: "H",
+}
+
+
+class BlockDecoder:
+    """Vorkompiliertes Layout eines Blocks: dekodiert alle Werte in einem Durchlauf.
+
+    Die Register des Blocks werden einmal mit struct.Struct("<nH") zu Bytes
+    gepackt und mit einem zweiten, beim Planen erzeugten struct.Struct
+    (FLOAT/UCHAR/WORD + Pad-Bytes für Lücken) in einem unpack_from() dekodiert.
+    Überlappende Register (z.B. FLOAT über einem UCHAR) werden einzeln dekodiert.
+    """
+
+    __slots__ = ("addresses", "_count", "_raw", "_layout", "_float_indices", "_overlaps")
+
+    def __init__(self, start: int, count: int, registers: tuple[tuple[int, str], ...]):
+        layout = ["<"]
+        position = 0
+        addresses: list[int] = []
+        float_indices: list[int] = []
+        overlaps: list[tuple[int, str, int]] = []
+
+        for address, reg_type in sorted(registers):
+            offset = address - start
+            if offset < position:
+                overlaps.append((address, reg_type, offset))
+                continue
+            if offset > position:
+                layout.append(f"{(offset - position) * 2}x")
+            if reg_type == REG_TYPE_FLOAT:
+                float_indices.append(len(addresses))
+            layout.append(_LAYOUT_FORMATS[reg_type])
+            addresses.append(address)
+            position = offset + REG_TYPE_SIZES[reg_type]
+
+        self.addresses = tuple(addresses)
+        self._count = count
+        self._raw = struct.Struct(f"<{count}H")
+        self._layout = struct.Struct("".join(layout))
+        self._float_indices = tuple(float_indices)
+        self._overlaps = tuple(overlaps)
+
+    def decode(self, registers: list[int]) -> dict[int, any]:
+        """Dekodiert die Register-Liste eines Block-Reads zu {adresse: wert}."""
+        if len(registers) != self._count:
+            registers = registers[:self._count]
+        values = list(self._layout.unpack_from(self._raw.pack(*registers)))
+        for index in self._float_indices:
+            values[index] = round(values[index], 2)
+        decoded = dict(zip(self.addresses, values))
+        for address, reg_type, offset in self._overlaps:
+            decoded[address] = decode_register(reg_type, registers, offset)
+        return decoded
+
+
+class ReadBlock(NamedTuple):
+    """Zusammenhängender Adressbereich, der mit einem Request gelesen wird."""
+
+    function: str
+    start: int
+    count: int
+    registers: tuple[tuple[int, str], ...]  # ((adresse, typ), ...)
+    fallback: str | None = None  # Alternativer Funktionscode bei Fehler
+    decoder: BlockDecoder | None = None  # Vorkompiliertes Layout (plan_read_blocks)
+
+
+def _other_function(function: str) -> str:
+    return FC_HOLDING if function == FC_INPUT else FC_INPUT
+
+
+def register_function(
+    address: int,
+    reg_type: str,
+    function_codes: dict[int, str] | None = None,
+) -> str:
+    """Funktionscode für ein Register.
+
+    FLOATs werden mit dem gelernten Funktionscode gelesen, unbekannte zuerst
+    als Input-Register. UCHAR/WORD sind immer Holding-Register.
+    """
+    if reg_type != REG_TYPE_FLOAT:
+        return FC_HOLDING
+    if function_codes:
+        return function_codes.get(address, FC_INPUT)
+    return FC_INPUT
+
+
+def _build_block(function: str, registers) -> ReadBlock:
+    """Erzeugt einen ReadBlock (inkl. Fallback und Decoder) für sortierte Register."""
+    registers = tuple(registers)
+    start = registers[0][0]
+    end = max(address + REG_TYPE_SIZES[reg_type] for address, reg_type in registers)
+    only_floats = all(reg_type == REG_TYPE_FLOAT for _, reg_type in registers)
+    fallback = _other_function(function) if only_floats else None
+    count = end - start
+    return ReadBlock(
+        function, start, count, registers, fallback,
+        BlockDecoder(start, count, registers),
+    )
+
+
+def _gap_indices(registers: tuple[tuple[int, str], ...]) -> list[int]:
+    """Indizes der Register, vor denen im Block eine Lücke mitgelesen wird."""
+    gaps = []
+    end = registers[0][0] + REG_TYPE_SIZES[registers[0][1]]
+    for index, (address, reg_type) in enumerate(registers[1:], 1):
+        if address > end:
+            gaps.append(index)
+        end = max(end, address + REG_TYPE_SIZES[reg_type])
+    return gaps
+
+
+def plan_read_blocks(
+    register_map: dict[int, str],
+    function_codes: dict[int, str] | None = None,
+    max_gap: int = READ_BLOCK_MAX_GAP,
+    max_count: int = MODBUS_MAX_READ_REGISTERS,
+    block_breaks: set[int] | None = None,
+) -> list[ReadBlock]:
+    """Gruppiert die Register-Map in Blöcke für Block-Reads.
+
+    Register mit gleichem Funktionscode werden nach Adresse sortiert und
+    zusammengefasst, solange die Lücke zum Vorgänger <= max_gap ist und der
+    Block max_count Register nicht überschreitet. Vor Adressen in block_breaks
+    (gelernte, nicht lesbare Lücken) beginnt immer ein neuer Block. Reine
+    FLOAT-Blöcke bekommen den anderen Funktionscode als Fallback. Jeder Block
+    erhält sein vorkompiliertes BlockDecoder-Layout.
+    """
+    block_breaks = block_breaks or set()
+    by_function: dict[str, list[tuple[int, str]]] = {}
+    for address, reg_type in register_map.items():
+        if reg_type not in REG_TYPE_SIZES:
+            continue
+        function = register_function(address, reg_type, function_codes)
+        by_function.setdefault(function, []).append((address, reg_type))
+
+    blocks: list[ReadBlock] = []
+
+    for function, registers in by_function.items():
+        registers.sort()
+        current: list[tuple[int, str]] = []
+        start = end = 0
+        for address, reg_type in registers:
+            reg_end = address + REG_TYPE_SIZES[reg_type]
+            if current and (
+                address - end > max_gap
+                or reg_end - start > max_count
+                or (address > end and address in block_breaks)
+            ):
+                blocks.append(_build_block(function, current))
+                current = []
+            if not current:
+                start = address
+                end = reg_end
+            current.append((address, reg_type))
+            end = max(end, reg_end)
+        if current:
+            blocks.append(_build_block(function, current))
+
+    blocks.sort(key=lambda b: b.start)
+    return blocks
+
+
+def decode_register(reg_type: str, registers: list[int], offset: int = 0):
+    """Dekodiert einen Wert aus einer Liste von 16-bit Registern."""
+    if reg_type == REG_TYPE_FLOAT:
+        raw = struct.pack("<HH", registers[offset], registers[offset + 1])
+        return round(struct.unpack("<f", raw)[0], 2)
+    if reg_type == REG_TYPE_UCHAR:
+        return registers[offset] & 0xFF
+    if reg_type == REG_TYPE_WORD:
+        return registers[offset]
+    return None
+
+
+def merge_writes(
+    pending: dict[int, list[int]],
+    max_count: int = MODBUS_MAX_WRITE_REGISTERS,
+) -> list[tuple[int, list[int], list[int]]]:
+    """Fasst anliegende Schreibzugriffe zu zusammenhängenden Blöcken zusammen.
+
+    pending: {adresse: register_werte}. Rückgabe: [(start, werte, adressen)],
+    ein Eintrag pro write_registers()-Request. Nur direkt aneinander
+    grenzende Register werden verbunden (keine Lücken – die würden
+    überschrieben).
+    """
+    blocks: list[tuple[int, list[int], list[int]]] = []
+    for address in sorted(pending):
+        values = pending[address]
+        if blocks:
+            start, block_values, addresses = blocks[-1]
+            if (
+                start + len(block_values) == address
+                and len(block_values) + len(values) <= max_count
+            ):
+                block_values.extend(values)
+                addresses.append(address)
+                continue
+        blocks.append((address, list(values), [address]))
+    return blocks
+
+
+# ------------------------------------------------------------------
+# EEPROM-Schreibbudget
+# ------------------------------------------------------------------
+
+class WriteBudgetExceededError(Exception):
+    """Schreibbudget eines Registers erschöpft: Write wird nicht ausgeführt."""
+
+
+class WriteBudget:
+    """Zählt Schreibzugriffe pro Register und begrenzt sie per Token-Bucket.
+
+    Jedes Register hat einen Bucket mit WRITE_BUDGET_BURST Tokens, der sich mit
+    daily_budget Tokens pro Tag auffüllt. Ein Write verbraucht ein Token;
+    zusammengefasste (coalesced) Writes kosten nichts, fehlgeschlagene Writes
+    bekommen ihr Token zurück (refund). Gezählt wird pro
+    Kalendertag und ISO-Woche; changed zeigt an, dass gespeichert werden muss.
+    """
+
+    def __init__(self, daily_budget: int = DEFAULT_WRITE_BUDGET, burst: int = WRITE_BUDGET_BURST):
+        self._daily_budget = max(0, int(daily_budget))
+        self._burst = min(burst, self._daily_budget) if self._daily_budget else burst
+        self._day: str | None = None
+        self._week: str | None = None
+        self._daily: dict[int, int] = {}
+        self._weekly: dict[int, int] = {}
+        self._rejected: dict[int, int] = {}
+        self._buckets: dict[int, list[float]] = {}  # {adresse: [tokens, zeitpunkt]}
+        self.changed = False
+
+    @property
+    def daily_budget(self) -> int:
+        return self._daily_budget
+
+    @property
+    def daily_counts(self) -> dict[int, int]:
+        """Schreibzugriffe pro Register heute."""
+        self._roll(time.time())
+        return dict(self._daily)
+
+    @property
+    def weekly_counts(self) -> dict[int, int]:
+        """Schreibzugriffe pro Register in der laufenden ISO-Woche."""
+        self._roll(time.time())
+        return dict(self._weekly)
+
+    @property
+    def rejected_counts(self) -> dict[int, int]:
+        """Heute wegen erschöpftem Budget verworfene Writes pro Register."""
+        self._roll(time.time())
+        return dict(self._rejected)
+
+    def _roll(self, now: float) -> None:
+        """Setzt Tages-/Wochenzähler beim Datumswechsel zurück."""
+        today = date.fromtimestamp(now)
+        day = today.isoformat()
+        year, week, _ = today.isocalendar()
+        week = f"{year}-W{week:02d}"
+        if day != self._day:
+            self._day = day
+            self._daily.clear()
+            self._rejected.clear()
+            self.changed = True
+        if week != self._week:
+            self._week = week
+            self._weekly.clear()
+            self.changed = True
+
+    def allow(self, address: int, now: float | None = None) -> bool:
+        """Verbraucht ein Token für address; False wenn der Bucket leer ist."""
+        if not self._daily_budget:
+            return True
+        now = time.time() if now is None else now
+        tokens, stamp = self._buckets.get(address, (self._burst, now))
+        tokens = min(self._burst, tokens + max(0.0, now - stamp) * self._daily_budget / 86400)
+        if tokens < 1:
+            self._buckets[address] = [tokens, now]
+            self._roll(now)
+            self._rejected[address] = self._rejected.get(address, 0) + 1
+            self.changed = True
+            return False
+        self._buckets[address] = [tokens - 1, now]
+        return True
+
+    def refund(self, addresses) -> None:
+        """Gibt die per allow() verbrauchten Tokens zurück (Write fehlgeschlagen)."""
+        if not self._daily_budget:
+            return
+        for address in addresses:
+            bucket = self._buckets.get(address)
+            if bucket is not None:
+                bucket[0] = min(self._burst, bucket[0] + 1)
+        self.changed = True
+
+    def record(self, addresses, now: float | None = None) -> None:
+        """Zählt erfolgreich geschriebene Register."""
+        self._roll(time.time() if now is None else now)
+        for address in addresses:
+            self._daily[address] = self._daily.get(address, 0) + 1
+            self._weekly[address] = self._weekly.get(address, 0) + 1
+        self.changed = True
+
+    def as_dict(self) -> dict:
+        """Zustand für die Persistenz (Keys als Strings)."""
+        self.changed = False
+        return {
+            "day": self._day,
+            "week": self._week,
+            "daily": {str(a): n for a, n in self._daily.items()},
+            "weekly": {str(a): n for a, n in self._weekly.items()},
+            "rejected": {str(a): n for a, n in self._rejected.items()},
+            "buckets": {str(a): bucket for a, bucket in self._buckets.items()},
+        }
+
+    def load(self, stored: dict) -> None:
+        """Übernimmt persistierte Zähler; veraltete Tage/Wochen verfallen."""
+        self._day = stored.get("day")
+        self._week = stored.get("week")
+        self._daily = {int(a): int(n) for a, n in stored.get("daily", {}).items()}
+        self._weekly = {int(a): int(n) for a, n in stored.get("weekly", {}).items()}
+        self._rejected = {int(a): int(n) for a, n in stored.get("rejected", {}).items()}
+        self._buckets = {
+            int(a): [float(bucket[0]), float(bucket[1])]
+            for a, bucket in stored.get("buckets", {}).items()
+        }
+        self._roll(time.time())
+        self.changed = False
+
+
+# ------------------------------------------------------------------
+# Verbindungsüberwachung
+# ------------------------------------------------------------------
+
+class ModbusCircuitOpenError(ConnectionError):
+    """Verbindung gestört (Breaker offen): Request wird ohne Versuch abgelehnt."""
+
+
+class ConnectionSupervisor:
+    """Circuit Breaker mit exponentiellem Backoff für eine Modbus-Verbindung.
+
+    - closed:    Requests laufen normal; Fehlschläge (Connect oder kompletter
+                 Poll ohne Antwort) werden gezählt.
+    - open:      nach CIRCUIT_FAILURE_THRESHOLD Fehlschlägen in Folge. Reads
+                 und Writes schlagen sofort fehl (kein Connect-Timeout), ein
+                 Hintergrund-Task versucht den Reconnect mit Backoff + Jitter.
+    - half_open: der Hintergrund-Task verbindet gerade; Erfolg schließt den
+                 Breaker, ein Fehlschlag öffnet ihn mit doppeltem Backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect,
+        is_connected,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        initial: float = RECONNECT_BACKOFF_INITIAL,
+        maximum: float = RECONNECT_BACKOFF_MAX,
+        jitter: float = RECONNECT_BACKOFF_JITTER,
+    ):
+        self._name = name
+        self._connect = connect            # async () -> bool
+        self._is_connected = is_connected  # () -> bool
+        self._threshold = threshold
+        self._initial = initial
+        self._maximum = maximum
+        self._jitter = jitter
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._delay = initial
+        self._retry_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True solange Requests sofort abgelehnt werden (open/half_open)."""
+        return self._state != CIRCUIT_CLOSED
+
+    @property
+    def retry_in(self) -> float | None:
+        """Sekunden bis zum nächsten Reconnect-Versuch (None wenn geschlossen)."""
+        if self._retry_at is None:
+            return None
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def diagnostics(self) -> dict:
+        return {
+            "state": self._state,
+            "consecutive_failures": self._failures,
+            "backoff": round(self._delay, 1),
+            "retry_in": round(self.retry_in, 1) if self.retry_in is not None else None,
+        }
+
+    def check(self) -> None:
+        """Fail-fast: wirft ModbusCircuitOpenError, solange der Breaker offen ist."""
+        if self.is_open:
+            retry_in = self.retry_in
+            raise ModbusCircuitOpenError(
+                f"Verbindung zu {self._name} gestört, nächster Versuch in "
+                f"{retry_in if retry_in is not None else 0:.0f}s"
+            )
+
+    async def async_connect(self) -> bool:
+        """Verbindungsversuch im Vordergrund (nur bei geschlossenem Breaker)."""
+        async with self._lock:
+            if self._is_connected():
+                return True
+            connected = await self._attempt()
+        if connected:
+            self.record_success()
+        else:
+            self.record_failure()
+        return connected
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Zählt einen Fehlschlag; öffnet den Breaker an der Schwelle."""
+        self._failures += 1
+        if self._state == CIRCUIT_CLOSED and self._failures >= self._threshold:
+            self._open()
+
+    async def async_stop(self) -> None:
+        """Beendet den Reconnect-Task (beim Entladen)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _attempt(self) -> bool:
+        try:
+            return bool(await self._connect())
+        except Exception as e:
+            _LOGGER.debug("iDM Modbus: Verbindung zu %s fehlgeschlagen: %s", self._name, e)
+            return False
+
+    def _open(self) -> None:
+        self._state = CIRCUIT_OPEN
+        _LOGGER.warning(
+            "iDM Modbus: %s nicht erreichbar (%d Fehlschläge) – Requests werden "
+            "abgelehnt, Reconnect im Hintergrund",
+            self._name, self._failures,
+        )
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        """Reconnect mit exponentiellem Backoff + Jitter, bis der Breaker schließt."""
+        self._delay = self._initial
+        while True:
+            delay = self._delay * random.uniform(1 - self._jitter, 1 + self._jitter)
+            self._retry_at = time.monotonic() + delay
+            await asyncio.sleep(delay)
+
+            self._state = CIRCUIT_HALF_OPEN
+            async with self._lock:
+                connected = await self._attempt()
+            if connected:
+                self._state = CIRCUIT_CLOSED
+                self._failures = 0
+                self._delay = self._initial
+                self._retry_at = None
+                _LOGGER.info("iDM Modbus: Verbindung zu %s wiederhergestellt", self._name)
+                return
+            self._state = CIRCUIT_OPEN
+            self._delay = min(self._delay * 2, self._maximum)
+            _LOGGER.debug(
+                "iDM Modbus: Reconnect zu %s fehlgeschlagen, nächster Versuch in ~%.0fs",
+                self._name, self._delay,
+            )
+
+
+class ModbusConnection:
+    """Modbus-TCP-Verbindung zu einem Host/Port, geteilt von allen Unit IDs.
+
+    Hinter einem Modbus-TCP-Gateway liegen mehrere Wärmepumpen auf derselben
+    Verbindung; jede hat ihren eigenen IDMModbusHandler (Unit ID, Register-Map,
+    Coordinator). Client und Circuit Breaker gehören der Verbindung. Requests
+    werden fair vergeben: der nächste freie Platz geht reihum an die Unit IDs
+    mit wartenden Requests, damit ein großer Poll die anderen nicht aushungert;
+    Writes (priority) werden vor wartenden Reads bedient.
+
+    Pipeline (pipeline_depth > 1): pymodbus serialisiert die Requests eines
+    Clients, parallele Requests brauchen daher eigene TCP-Verbindungen. Der
+    Pool wird bis pipeline_depth Clients aufgebaut; wie viele davon
+    gleichzeitig genutzt werden, regelt ein Fenster (AIMD): nach
+    PIPELINE_GROW_AFTER beantworteten Requests in Folge wächst es um eins, bei
+    einem Request ohne Antwort (Timeout, Verbindung) halbiert es sich.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        client: AsyncModbusTcpClient | None = None,
+        client_factory=None,
+    ):
+        self.host = host
+        self.port = port
+        self._client_factory = client_factory or (lambda: AsyncModbusTcpClient(host, port=port))
+        self.client = client or self._client_factory()
+        self.supervisor = ConnectionSupervisor(
+            f"{host}:{port}", self._async_open, lambda: self.client.connected,
+        )
+        self._units: dict[int, int] = {}  # {unit_id: pipeline_depth}
+        self._pool: list[AsyncModbusTcpClient] = [self.client]
+        self._idle: list[AsyncModbusTcpClient] = [self.client]
+        self._in_flight = 0
+        self._window = 1
+        self._answered = 0  # beantwortete Requests seit der letzten Fensteränderung
+        self._last_fill: float | None = None
+        self._priority: deque = deque()      # wartende Writes
+        self._waiters: dict[int, deque] = {}  # {unit_id: wartende Futures}
+        self._turn: deque[int] = deque()     # Reihum-Reihenfolge der Unit IDs
+
+    @property
+    def units(self) -> list[int]:
+        return sorted(self._units)
+
+    @property
+    def pipeline_depth(self) -> int:
+        """Gewünschte Pool-Größe (Maximum der angemeldeten Handler)."""
+        return max(self._units.values(), default=DEFAULT_PIPELINE_DEPTH)
+
+    @property
+    def concurrent(self) -> bool:
+        """True, wenn mehr als ein Client im Pool verbunden ist."""
+        return len(self._pool) > 1
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    def diagnostics(self) -> dict:
+        return {
+            "units": self.units,
+            "in_flight": self._in_flight,
+            "pipeline": {
+                "depth": self.pipeline_depth,
+                "pool": len(self._pool),
+                "window": self._window,
+            },
+            "waiting": {unit: len(queue) for unit, queue in self._waiters.items()},
+        }
+
+    def attach(self, unit_id: int, pipeline_depth: int = DEFAULT_PIPELINE_DEPTH) -> None:
+        """Meldet einen Handler (Unit ID) an der Verbindung an."""
+        if unit_id in self._units:
+            _LOGGER.warning(
+                "iDM Modbus: Unit ID %s an %s:%s mehrfach konfiguriert",
+                unit_id, self.host, self.port,
+            )
+        self._units[unit_id] = max(1, min(int(pipeline_depth), MAX_PIPELINE_DEPTH))
+
+    def detach(self, unit_id: int) -> bool:
+        """Meldet einen Handler ab. True, wenn kein Handler mehr angemeldet ist."""
+        self._units.pop(unit_id, None)
+        return not self._units
+
+    async def async_close(self) -> None:
+        await self.supervisor.async_stop()
+        for client in self._pool:
+            client.close()
+        self._pool = [self.client]
+        self._idle = [self.client]
+        self._window = 1
+
+    async def _async_open(self) -> bool:
+        """Baut die TCP-Verbindung (neu) auf. True bei Erfolg."""
+        self.client.close()
+        await self.client.connect()
+        return self.client.connected
+
+    async def async_fill_pool(self) -> None:
+        """Baut fehlende Pool-Verbindungen auf (höchstens alle PIPELINE_RECONNECT_INTERVAL s).
+
+        Lehnt die Gegenstelle weitere Verbindungen ab, bleibt der Pool kleiner;
+        der nächste Versuch folgt nach PIPELINE_RECONNECT_INTERVAL.
+        """
+        if len(self._pool) >= self.pipeline_depth or not self.client.connected:
+            return
+        now = time.monotonic()
+        if self._last_fill is not None and now - self._last_fill < PIPELINE_RECONNECT_INTERVAL:
+            return
+        self._last_fill = now
+        while len(self._pool) < self.pipeline_depth:
+            client = self._client_factory()
+            try:
+                await client.connect()
+            except Exception as e:
+                _LOGGER.debug("iDM Modbus: Pool-Verbindung zu %s:%s fehlgeschlagen: %s", self.host, self.port, e)
+            if not client.connected:
+                client.close()
+                _LOGGER.debug(
+                    "iDM Modbus: %s:%s nimmt keine weitere Verbindung an (Pool %d/%d)",
+                    self.host, self.port, len(self._pool), self.pipeline_depth,
+                )
+                return
+            self._pool.append(client)
+            self._idle.append(client)
+        _LOGGER.debug(
+            "iDM Modbus: Pool zu %s:%s mit %d Verbindungen", self.host, self.port, len(self._pool),
+        )
+
+    def record_answer(self, answered: bool) -> None:
+        """Regelt das Fenster (AIMD) nach einem Request mit/ohne Antwort."""
+        if not answered:
+            self._answered = 0
+            if self._window > 1:
+                self._window = max(1, self._window // 2)
+                _LOGGER.debug(
+                    "iDM Modbus: Request ohne Antwort, Pipeline-Fenster %s:%s → %d",
+                    self.host, self.port, self._window,
+                )
+            return
+        self._answered += 1
+        if self._answered >= PIPELINE_GROW_AFTER and self._window < len(self._pool):
+            self._answered = 0
+            self._window += 1
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, unit_id: int, priority: bool = False):
+        """Belegt einen Client für einen Request von unit_id (faire Vergabe)."""
+        client = await self._acquire(unit_id, priority)
+        try:
+            yield client
+        finally:
+            self._release(client)
+
+    def _free(self) -> bool:
+        return bool(self._idle) and self._in_flight < self._window
+
+    def _take(self) -> AsyncModbusTcpClient:
+        self._in_flight += 1
+        return self._idle.pop()
+
+    async def _acquire(self, unit_id: int, priority: bool) -> AsyncModbusTcpClient:
+        waiting = self._priority if priority else (self._priority or self._turn)
+        if not waiting and self._free():
+            return self._take()
+        future = asyncio.get_running_loop().create_future()
+        if priority:
+            queue = self._priority
+        else:
+            queue = self._waiters.get(unit_id)
+            if queue is None:
+                queue = self._waiters[unit_id] = deque()
+                self._turn.append(unit_id)
+        queue.append(future)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(future.result())  # Client wurde schon übergeben
+            elif future in queue:
+                queue.remove(future)
+                if not queue and not priority:
+                    del self._waiters[unit_id]
+                    self._turn.remove(unit_id)
+            raise
+
+    def _release(self, client: AsyncModbusTcpClient) -> None:
+        """Gibt den Client zurück und vergibt freie Plätze reihum."""
+        self._in_flight -= 1
+        if client is self.client or client.connected:
+            self._idle.append(client)
+        elif client in self._pool:
+            # Pool-Verbindung verloren: verwerfen, async_fill_pool() baut sie neu auf
+            client.close()
+            self._pool.remove(client)
+            self._window = max(1, min(self._window, len(self._pool)))
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._free() and (self._priority or self._turn):
+            if self._priority:
+                future = self._priority.popleft()
+            else:
+                unit_id = self._turn.popleft()
+                queue = self._waiters[unit_id]
+                future = queue.popleft()
+                if queue:
+                    self._turn.append(unit_id)
+                else:
+                    del self._waiters[unit_id]
+            if future.done():
+                continue  # abgebrochen
+            future.set_result(self._take())
+
 
 class IDMModbusHandler:
-    def __init__(self, host: str, port: int = DEFAULT_PORT, unit_id: int = DEFAULT_UNIT_ID):
+    def __init__(
+        self,
+        host: str,
+        port: int = DEFAULT_PORT,
+        unit_id: int = DEFAULT_UNIT_ID,
+        write_budget: int = DEFAULT_WRITE_BUDGET,
+        connection: ModbusConnection | None = None,
+        pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+    ):
         self._host = host
         self._port = port
         self._unit_id = unit_id
-        self._client = AsyncModbusTcpClient(host, port=port)
+        # Verbindung (ggf. mit anderen Unit IDs geteilt)
+        self._connection = connection or ModbusConnection(host, port)
+        self._connection.attach(unit_id, pipeline_depth)
+        self._client = self._connection.client
+        self._supervisor = self._connection.supervisor
+        self._poll_dropped = 0
+        # read_all() läuft pro Handler seriell: Poll und Read-Back teilen sich
+        # _metrics und _poll_dropped
+        self._read_lock = asyncio.Lock()
+        self._plan_cache: OrderedDict[frozenset, list[ReadBlock]] = OrderedDict()
+        # Gelernte, nicht lesbare Lücken: vor diesen Adressen beginnt ein neuer Block
+        self._block_breaks: set[int] = set()
+        # Gelernte Funktionscodes für FLOAT-Adressen {adresse: FC_INPUT|FC_HOLDING}
+        self._function_codes: dict[int, str] = {}
+        self._function_codes_changed = False
+        # Poll-Metriken: laufender Poll, letzter Poll, Summen, Latenz-Histogramme
+        self._metrics = dict.fromkeys(POLL_METRIC_KEYS, 0)
+        self._last_poll_metrics: dict[str, float] | None = None
+        self._total_metrics = dict.fromkeys(POLL_METRIC_KEYS, 0)
+        self._total_metrics["polls"] = 0
+        self._latency_histograms: dict[int, list[int]] = {}
+        # Write-Queue: {adresse: [register_werte, [futures]]}, ein Flush zur Zeit
+        self._pending_writes: dict[int, list] = {}
+        self._write_lock = asyncio.Lock()
+        self._write_stats = {"queued": 0, "coalesced": 0, "transactions": 0}
+        self.write_budget = WriteBudget(write_budget)
         _LOGGER.info(
             "iDM Modbus TCP Client für %s:%s (Unit ID %s) erstellt",
             host, port, unit_id,
@@ -33,55 +877,405 @@ class IDMModbusHandler:
     def is_connected(self) -> bool:
         return self._client.connected
 
-    async def connect(self):
-        await self._client.connect()
-        _LOGGER.info(
-            "iDM Modbus TCP verbunden mit %s:%s (Unit %s)",
-            self._host, self._port, self._unit_id,
+    @property
+    def connection_state(self) -> str:
+        """Zustand des Circuit Breakers (closed/open/half_open)."""
+        return self._supervisor.state
+
+    def connection_diagnostics(self) -> dict:
+        return {**self._supervisor.diagnostics(), **self._connection.diagnostics()}
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def unit_id(self) -> int:
+        return self._unit_id
+
+    @property
+    def write_stats(self) -> dict[str, int]:
+        """Schreibzugriffe: angefordert, zusammengefasst (coalesced), Requests."""
+        return dict(self._write_stats)
+
+    @property
+    def device_key(self) -> str:
+        """Schlüssel für persistierte, gerätespezifische Daten."""
+        return f"{self._host}:{self._port}/{self._unit_id}"
+
+    # ------------------------------------------------------------------
+    # Poll-Metriken
+    # ------------------------------------------------------------------
+
+    @property
+    def last_poll_metrics(self) -> dict[str, float] | None:
+        """Metriken des letzten read_all() (None vor dem ersten Poll)."""
+        return dict(self._last_poll_metrics) if self._last_poll_metrics else None
+
+    @property
+    def total_metrics(self) -> dict[str, float]:
+        """Aufsummierte Metriken aller Polls seit dem Start."""
+        return dict(self._total_metrics)
+
+    @property
+    def latency_histograms(self) -> dict[int, list[int]]:
+        """Latenz-Histogramme {adresse: [anzahl pro LATENCY_BUCKETS_MS + >max]}."""
+        return {address: list(counts) for address, counts in self._latency_histograms.items()}
+
+    def _record_latency(self, addresses, seconds: float) -> None:
+        """Trägt die Latenz eines Reads für alle gelieferten Register ein."""
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)
+        for address in addresses:
+            counts = self._latency_histograms.get(address)
+            if counts is None:
+                counts = self._latency_histograms[address] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            counts[bucket] += 1
+
+    def _finish_poll_metrics(self, data: dict, started: float) -> None:
+        metrics = self._metrics
+        metrics["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        metrics["registers"] = len(data)
+        metrics["failed_registers"] = sum(1 for value in data.values() if value is None)
+        self._last_poll_metrics = metrics
+        for key, value in metrics.items():
+            self._total_metrics[key] += value
+        self._total_metrics["polls"] += 1
+
+    # ------------------------------------------------------------------
+    # Funktionscode-Cache (Input vs. Holding)
+    # ------------------------------------------------------------------
+
+    @property
+    def function_codes(self) -> dict[int, str]:
+        """Gelernte Funktionscodes {adresse: "input"|"holding"} (Kopie)."""
+        return dict(self._function_codes)
+
+    @property
+    def function_codes_changed(self) -> bool:
+        """True wenn seit dem letzten Abholen neue Funktionscodes gelernt wurden."""
+        return self._function_codes_changed
+
+    def pop_function_codes(self) -> dict[int, str]:
+        """Liefert die gelernten Funktionscodes und setzt das Änderungs-Flag zurück."""
+        self._function_codes_changed = False
+        return self.function_codes
+
+    def load_function_codes(self, function_codes: dict) -> None:
+        """Übernimmt persistierte Funktionscodes (Keys dürfen Strings sein)."""
+        self._function_codes = {
+            int(address): function
+            for address, function in function_codes.items()
+            if function in (FC_INPUT, FC_HOLDING)
+        }
+        self._function_codes_changed = False
+        self._plan_cache.clear()
+        _LOGGER.debug(
+            "iDM Modbus: %d gelernte Funktionscodes geladen",
+            len(self._function_codes),
         )
 
+    def _learn_function(self, addresses, function: str) -> None:
+        """Merkt sich den funktionierenden Funktionscode für FLOAT-Adressen."""
+        changed = False
+        for address in addresses:
+            if self._function_codes.get(address) != function:
+                self._function_codes[address] = function
+                changed = True
+        if changed:
+            self._function_codes_changed = True
+            self._plan_cache.clear()
+
+    async def connect(self):
+        if self._supervisor.is_open:
+            return
+        if await self._supervisor.async_connect():
+            _LOGGER.info(
+                "iDM Modbus TCP verbunden mit %s:%s (Unit %s)",
+                self._host, self._port, self._unit_id,
+            )
+
     async def ensure_connected(self):
-        """Stellt die Verbindung her, falls nicht verbunden."""
+        """Stellt die Verbindung her, falls nicht verbunden.
+
+        Bei offenem Circuit Breaker wird sofort ModbusCircuitOpenError
+        geworfen; der Reconnect läuft dann im Hintergrund.
+        """
+        self._supervisor.check()
         if not self._client.connected:
             _LOGGER.info("iDM Modbus: Verbindung verloren, versuche Reconnect...")
-            try:
-                await self._client.connect()
-                _LOGGER.info("iDM Modbus: Reconnect erfolgreich")
-            except Exception as e:
-                _LOGGER.error("iDM Modbus: Reconnect fehlgeschlagen: %s", e)
-                raise
+            self._metrics["reconnects"] += 1
+            if not await self._supervisor.async_connect():
+                raise ConnectionError(f"Reconnect zu {self._host}:{self._port} fehlgeschlagen")
+            _LOGGER.info("iDM Modbus: Reconnect erfolgreich")
 
     async def close(self):
-        self._client.close()
+        """Meldet die Unit ID ab; die Verbindung schließt mit dem letzten Handler."""
+        if self._connection.detach(self._unit_id):
+            await self._connection.async_close()
 
     # ------------------------------------------------------------------
     # Batch-Lesen (für DataUpdateCoordinator)
     # ------------------------------------------------------------------
 
-    async def read_all(self, register_map: dict[int, str]) -> dict[int, any]:
+    async def read_all(self, register_map: dict[int, str], poll: bool = True) -> dict[int, any]:
         """Liest alle Register aus der Map und gibt {adresse: wert} zurück.
 
-        Fehlgeschlagene Reads werden als None eingetragen, aber stoppen
-        nicht den Rest. So bleiben einzelne defekte/nicht vorhandene
-        Register toleriert.
+        Die Register werden per plan_read_blocks() zu Blöcken zusammengefasst
+        und pro Block mit einem Request gelesen. Fehlgeschlagene Reads werden
+        als None eingetragen, aber stoppen nicht den Rest. So bleiben einzelne
+        defekte/nicht vorhandene Register toleriert.
+
+        Aufrufe laufen nacheinander (_read_lock). poll=False (Read-Back nach
+        Schreibzugriffen) zählt weder für den Circuit Breaker noch für die
+        Poll-Metriken.
         """
-        await self.ensure_connected()
-        data = {}
-        for address, reg_type in register_map.items():
-            try:
-                if reg_type == REG_TYPE_FLOAT:
-                    data[address] = await self._read_float_raw(address)
-                elif reg_type == REG_TYPE_UCHAR:
-                    data[address] = await self._read_uchar_raw(address)
-                elif reg_type == REG_TYPE_WORD:
-                    data[address] = await self._read_word_raw(address)
-                else:
+        async with self._read_lock:
+            started = time.monotonic()
+            self._metrics = dict.fromkeys(POLL_METRIC_KEYS, 0)
+            self._poll_dropped = 0
+            await self.ensure_connected()
+            data = dict.fromkeys(register_map)
+            plan = self.get_read_plan(register_map)
+
+            # Pipeline: Blöcke gleichzeitig anstoßen, die Verbindung vergibt
+            # höchstens "Fenster" Clients des Pools
+            await self._connection.async_fill_pool()
+            if self._connection.concurrent:
+                await asyncio.gather(*(self._read_block(block, data) for block in plan))
+            else:
+                for block in plan:
+                    await self._read_block(block, data)
+
+            if not poll:
+                return data
+
+            # Kein einziger Block beantwortet → zählt als Verbindungsfehler
+            if plan and self._poll_dropped >= len(plan):
+                self._supervisor.record_failure()
+            else:
+                self._supervisor.record_success()
+
+            self._finish_poll_metrics(data, started)
+            return data
+
+    def get_read_plan(self, register_map: dict[int, str]) -> list[ReadBlock]:
+        """Liefert den (gecachten) Block-Plan für eine Register-Map.
+
+        Der Cache ist ein LRU mit READ_PLAN_CACHE_SIZE Einträgen: die festen
+        Stufen-Maps bleiben darin, einmalige Maps (Read-Back nach Writes,
+        Dead-Register-Probes) werden wieder verdrängt.
+        """
+        key = frozenset(register_map.items())
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+        else:
+            plan = plan_read_blocks(
+                register_map, self._function_codes, block_breaks=self._block_breaks,
+            )
+            self._plan_cache[key] = plan
+            if len(self._plan_cache) > READ_PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+            _LOGGER.debug(
+                "iDM Read-Plan: %d Register in %d Blöcken",
+                len(register_map), len(plan),
+            )
+            for address, reg_type in register_map.items():
+                if reg_type not in REG_TYPE_SIZES:
                     _LOGGER.warning("Unbekannter Register-Typ %s für Adresse %s", reg_type, address)
+        return plan
+
+    @property
+    def block_breaks(self) -> list[int]:
+        """Adressen, vor denen eine nicht lesbare Lücke gelernt wurde."""
+        return sorted(self._block_breaks)
+
+    async def _read_block(self, block: ReadBlock, data: dict):
+        """Liest einen Block und dekodiert alle enthaltenen Register.
+
+        Schlägt der Block-Read fehl (z.B. weil eine mitgelesene Lücke nicht
+        lesbar ist), wird der Block per _read_split() an seinen Lücken geteilt.
+        """
+        # Schreibzugriffe haben Vorrang vor dem nächsten Block
+        if self._pending_writes or self._write_lock.locked():
+            await self._flush_writes()
+
+        registers = function = None
+        answered = True
+        started = time.monotonic()
+        try:
+            registers, function = await self._read_range(
+                block.function, block.start, block.count, block.fallback,
+            )
+        except Exception as e:
+            # Keine Antwort (Timeout/Verbindung) – zählt für die Verbindungsüberwachung
+            answered = False
+            self._poll_dropped += 1
+            _LOGGER.debug(
+                "Fehler beim Block-Read %s-%s: %s",
+                block.start, block.start + block.count - 1, e,
+            )
+
+        if registers is not None:
+            self._decode_block(block, registers, function, started, data)
+            return
+
+        # Verbindung weg: keine Einzel-Reads, die alle in den Timeout laufen
+        if not self._client.connected:
+            for address, _ in block.registers:
+                data[address] = None
+            return
+
+        await self._read_split(block, data, learn=answered)
+
+    def _decode_block(
+        self, block: ReadBlock, registers: list[int], function: str, started: float, data: dict,
+    ) -> None:
+        """Übernimmt einen erfolgreichen Block-Read (Latenz, Funktionscode, Werte)."""
+        self._record_latency(
+            (address for address, _ in block.registers), time.monotonic() - started,
+        )
+        self._learn_function(
+            (address for address, reg_type in block.registers if reg_type == REG_TYPE_FLOAT),
+            function,
+        )
+        if block.decoder is not None:
+            data.update(block.decoder.decode(registers))
+        else:
+            for address, reg_type in block.registers:
+                data[address] = decode_register(reg_type, registers, address - block.start)
+
+    async def _read_split(self, block: ReadBlock, data: dict, learn: bool = True) -> None:
+        """Liest einen fehlgeschlagenen Block in zwei Hälften (an der mittleren Lücke).
+
+        Sind beide Hälften mit demselben Funktionscode lesbar, war die Lücke die
+        Ursache: sie wird gelernt (_block_breaks) und der Block ab dem nächsten
+        Poll ohne sie geplant.
+        Schlägt eine Hälfte fehl, wird sie weiter geteilt; Blöcke ohne Lücke
+        fallen auf Einzel-Reads zurück (nicht lesbares Register → Dead-Register).
+        Gelernt wird nur, wenn der Block mit einem Fehler beantwortet wurde
+        (learn); ein Timeout sagt nichts über die Lücke aus.
+        """
+        gaps = _gap_indices(block.registers)
+        if not gaps:
+            await self._read_singles(block, data)
+            return
+
+        split = gaps[len(gaps) // 2]
+        halves = (
+            _build_block(block.function, block.registers[:split]),
+            _build_block(block.function, block.registers[split:]),
+        )
+        gap_failed = True
+        functions = set()
+        for half in halves:
+            self._metrics["retries"] += 1
+            registers = function = None
+            answered = True
+            started = time.monotonic()
+            try:
+                registers, function = await self._read_range(
+                    half.function, half.start, half.count, half.fallback,
+                )
+            except Exception as e:
+                answered = False
+                _LOGGER.debug(
+                    "Fehler beim Block-Read %s-%s: %s",
+                    half.start, half.start + half.count - 1, e,
+                )
+            if registers is not None:
+                self._decode_block(half, registers, function, started, data)
+                functions.add(function)
+                continue
+            gap_failed = False
+            if not self._client.connected:
+                for address, _ in half.registers:
                     data[address] = None
+                continue
+            await self._read_split(half, data, learn=answered)
+
+        # Unterschiedliche Funktionscodes der Hälften: nicht die Lücke war schuld
+        if learn and gap_failed and len(functions) == 1:
+            address = block.registers[split][0]
+            self._block_breaks.add(address)
+            self._plan_cache.clear()
+            _LOGGER.info(
+                "iDM Modbus: Lücke vor Register %s nicht lesbar, Block %s-%s wird geteilt",
+                address, block.start, block.start + block.count - 1,
+            )
+
+    async def _read_singles(self, block: ReadBlock, data: dict) -> None:
+        """Fallback: liest die Register eines Blocks einzeln."""
+        self._metrics["retries"] += len(block.registers)
+        for address, reg_type in block.registers:
+            try:
+                data[address] = await self._read_single(address, reg_type)
             except Exception as e:
                 _LOGGER.debug("Fehler beim Lesen von Register %s (%s): %s", address, reg_type, e)
                 data[address] = None
-        return data
+
+    async def _read_range(
+        self, function: str, address: int, count: int, fallback: str | None = None,
+    ):
+        """Liest count Register mit dem Funktionscode, bei Fehler mit fallback.
+
+        Gibt (register_liste, funktionscode) oder (None, None) zurück.
+        """
+        registers = await self._request(function, address, count)
+        if registers is None and fallback is not None:
+            self._metrics["retries"] += 1
+            function = fallback
+            registers = await self._request(function, address, count)
+        if registers is None:
+            return None, None
+        return registers, function
+
+    async def _request(self, function: str, address: int, count: int):
+        """Ein einzelner Read-Request. Gibt die Register oder None zurück."""
+        metrics = self._metrics
+        metrics["requests"] += 1
+        metrics["bytes"] += MODBUS_READ_REQUEST_BYTES
+        try:
+            async with self._connection.slot(self._unit_id) as client:
+                if function == FC_INPUT:
+                    rr = await client.read_input_registers(
+                        address=address, count=count, device_id=self._unit_id,
+                    )
+                else:
+                    rr = await client.read_holding_registers(
+                        address=address, count=count, device_id=self._unit_id,
+                    )
+        except Exception:
+            metrics["failed_requests"] += 1
+            self._connection.record_answer(False)
+            raise
+        self._connection.record_answer(rr is not None)
+        if rr is None or rr.isError() or len(rr.registers) < count:
+            metrics["failed_requests"] += 1
+            if rr is not None:
+                metrics["bytes"] += MODBUS_EXCEPTION_BYTES
+            return None
+        metrics["bytes"] += MODBUS_READ_RESPONSE_BYTES + 2 * count
+        return rr.registers
+
+    async def _read_single(self, address: int, reg_type: str):
+        """Liest ein einzelnes Register gemäß Typ."""
+        started = time.monotonic()
+        if reg_type == REG_TYPE_FLOAT:
+            value = await self._read_float_raw(address)
+        elif reg_type == REG_TYPE_UCHAR:
+            value = await self._read_uchar_raw(address)
+        elif reg_type == REG_TYPE_WORD:
+            value = await self._read_word_raw(address)
+        else:
+            return None
+        if value is not None:
+            self._record_latency((address,), time.monotonic() - started)
+        return value
 
     # ------------------------------------------------------------------
     # Interne Read-Methoden (ohne Exception-Fang, für read_all)
@@ -89,27 +1283,28 @@ class IDMModbusHandler:
 
     async def _read_float_raw(self, address: int):
         """Liest einen 32-bit FLOAT. Gibt None bei Fehler zurück."""
-        rr = await self._client.read_input_registers(address=address, count=2)
-        if rr is None or rr.isError():
-            rr = await self._client.read_holding_registers(address=address, count=2)
-        if rr is None or rr.isError():
+        function = register_function(address, REG_TYPE_FLOAT, self._function_codes)
+        registers, function = await self._read_range(
+            function, address, 2, _other_function(function),
+        )
+        if registers is None:
             return None
-        raw = struct.pack("<HH", rr.registers[0], rr.registers[1])
-        return round(struct.unpack("<f", raw)[0], 2)
+        self._learn_function((address,), function)
+        return decode_register(REG_TYPE_FLOAT, registers)
 
     async def _read_uchar_raw(self, address: int):
         """Liest ein 8-bit UCHAR. Gibt None bei Fehler zurück."""
-        rr = await self._client.read_holding_registers(address=address, count=1)
-        if rr is None or rr.isError():
+        registers, _ = await self._read_range(FC_HOLDING, address, 1)
+        if registers is None:
             return None
-        return rr.registers[0] & 0xFF
+        return decode_register(REG_TYPE_UCHAR, registers)
 
     async def _read_word_raw(self, address: int):
         """Liest ein 16-bit WORD. Gibt None bei Fehler zurück."""
-        rr = await self._client.read_holding_registers(address=address, count=1)
-        if rr is None or rr.isError():
+        registers, _ = await self._read_range(FC_HOLDING, address, 1)
+        if registers is None:
             return None
-        return rr.registers[0]
+        return decode_register(REG_TYPE_WORD, registers)
 
     # ------------------------------------------------------------------
     # Öffentliche Einzelmethoden (Kompatibilität + Schreibzugriffe)
@@ -120,6 +1315,9 @@ class IDMModbusHandler:
         try:
             await self.ensure_connected()
             return await self._read_float_raw(address)
+        except ModbusCircuitOpenError as e:
+            _LOGGER.debug("FLOAT Reg %s nicht gelesen: %s", address, e)
+            return None
         except Exception as e:
             _LOGGER.error("Exception FLOAT Reg %s: %s", address, e)
             return None
@@ -129,6 +1327,9 @@ class IDMModbusHandler:
         try:
             await self.ensure_connected()
             return await self._read_word_raw(address)
+        except ModbusCircuitOpenError as e:
+            _LOGGER.debug("WORD Reg %s nicht gelesen: %s", address, e)
+            return None
         except Exception as e:
             _LOGGER.error("Exception WORD Reg %s: %s", address, e)
             return None
@@ -149,28 +1350,232 @@ class IDMModbusHandler:
     async def write_float(self, address: int, value: float):
         """Schreibt einen 32-bit FLOAT-Wert (2 Register)."""
         try:
-            await self.ensure_connected()
             raw = struct.pack("<f", float(value))
-            regs = struct.unpack("<HH", raw)
-            await self._client.write_registers(address=address, values=list(regs))
+            await self._queue_write(address, list(struct.unpack("<HH", raw)))
             _LOGGER.debug("Wrote FLOAT %.2f to Reg %s", value, address)
+        except (ModbusCircuitOpenError, WriteBudgetExceededError) as e:
+            _LOGGER.warning("Schreiben FLOAT Reg %s verworfen: %s", address, e)
         except Exception as e:
             _LOGGER.error("Exception WRITE FLOAT Reg %s: %s", address, e)
 
+    async def write_floats(self, values: dict[int, float]) -> bool:
+        """Schreibt mehrere FLOAT-Werte {adresse: wert} gemeinsam.
+
+        Direkt aneinander grenzende Adressen gehen in einem write_registers()
+        raus. Gibt True zurück, wenn alle Werte geschrieben wurden.
+        """
+        if not values:
+            return True
+        try:
+            await self._queue_writes({
+                address: list(struct.unpack("<HH", struct.pack("<f", float(value))))
+                for address, value in values.items()
+            })
+            _LOGGER.debug("Wrote FLOATs %s", values)
+            return True
+        except (ModbusCircuitOpenError, WriteBudgetExceededError) as e:
+            _LOGGER.warning("Schreiben FLOAT Reg %s verworfen: %s", sorted(values), e)
+        except Exception as e:
+            _LOGGER.error("Exception WRITE FLOAT Reg %s: %s", sorted(values), e)
+        return False
+
     async def write_word(self, address: int, value: int):
         """Schreibt ein 16-bit WORD."""
         try:
-            await self.ensure_connected()
-            await self._client.write_register(address=address, value=int(value))
+            await self._queue_write(address, [int(value)])
             _LOGGER.debug("Wrote WORD %d to Reg %s", value, address)
+        except (ModbusCircuitOpenError, WriteBudgetExceededError) as e:
+            _LOGGER.warning("Schreiben WORD Reg %s verworfen: %s", address, e)
         except Exception as e:
             _LOGGER.error("Exception WRITE WORD Reg %s: %s", address, e)
 
     async def write_uchar(self, address: int, value: int):
         """Schreibt ein 8-bit Unsigned Integer als WORD (nur Low-Byte)."""
         try:
-            await self.ensure_connected()
-            await self._client.write_register(address=address, value=int(value) & 0xFF)
+            await self._queue_write(address, [int(value) & 0xFF])
             _LOGGER.debug("Wrote UCHAR %d to Reg %s", value, address)
+        except (ModbusCircuitOpenError, WriteBudgetExceededError) as e:
+            _LOGGER.warning("Schreiben UCHAR Reg %s verworfen: %s", address, e)
         except Exception as e:
             _LOGGER.error("Exception WRITE UCHAR Reg %s: %s", address, e)
+
+    # ------------------------------------------------------------------
+    # Write-Queue
+    # ------------------------------------------------------------------
+
+    async def _queue_write(self, address: int, values: list[int]) -> None:
+        """Reiht einen Schreibzugriff ein und wartet, bis er geschrieben ist."""
+        await self._queue_writes({address: values})
+
+    async def _queue_writes(self, writes: dict[int, list[int]]) -> None:
+        """Reiht Schreibzugriffe {adresse: register_werte} gemeinsam ein.
+
+        Liegt für eine Adresse schon ein Wert an, wird er ersetzt (der letzte
+        Wert gewinnt, z.B. beim Ziehen eines Sliders); alle Aufrufer werden
+        mit dem Ergebnis des gemeinsamen Requests fertig. Geschrieben wird
+        erst nach WRITE_COALESCE_WINDOW, damit auch Werte zusammengefasst
+        werden, die ohne laufenden Flush kurz nacheinander eintreffen; ein
+        Block-Read schreibt anliegende Werte schon vorher (Vorrang).
+        """
+        self._supervisor.check()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for address, values in writes.items():
+            future = loop.create_future()
+            futures.append(future)
+            self._write_stats["queued"] += 1
+            pending = self._pending_writes.get(address)
+            if pending is None:
+                self._pending_writes[address] = [values, [future]]
+            else:
+                self._write_stats["coalesced"] += 1
+                pending[0] = values
+                pending[1].append(future)
+        await asyncio.sleep(WRITE_COALESCE_WINDOW)
+        await self._flush_writes()
+        for result in await asyncio.gather(*futures, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _flush_writes(self) -> None:
+        """Schreibt alle anliegenden Werte; benachbarte Register in einem Request.
+
+        Läuft bereits ein Flush, wird auf ihn gewartet – bis dahin
+        eingereihte Werte werden dabei weiter zusammengefasst.
+        """
+        async with self._write_lock:
+            if not self._pending_writes:
+                return
+            pending, self._pending_writes = self._pending_writes, {}
+            now = time.time()
+            for address in list(pending):
+                if not self.write_budget.allow(address, now):
+                    error = WriteBudgetExceededError(
+                        f"Schreibbudget für Reg {address} erschöpft "
+                        f"({self.write_budget.daily_budget}/Tag)"
+                    )
+                    for future in pending.pop(address)[1]:
+                        future.set_exception(error)
+            blocks = merge_writes({address: entry[0] for address, entry in pending.items()})
+            for start, values, addresses in blocks:
+                futures = [future for address in addresses for future in pending[address][1]]
+                try:
+                    await self._write_block(start, values)
+                except Exception as e:
+                    # Nichts geschrieben: Tokens zurück, Zähler bleiben unverändert
+                    self.write_budget.refund(addresses)
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self.write_budget.record(addresses, now)
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def _write_block(self, start: int, values: list[int]) -> None:
+        """Ein Write-Request: FC 06 für ein Register, sonst FC 16."""
+        await self.ensure_connected()
+        self._write_stats["transactions"] += 1
+        async with self._connection.slot(self._unit_id, priority=True) as client:
+            if len(values) == 1:
+                rr = await client.write_register(
+                    address=start, value=values[0], device_id=self._unit_id,
+                )
+            else:
+                rr = await client.write_registers(
+                    address=start, values=values, device_id=self._unit_id,
+                )
+        if rr is None or rr.isError():
+            raise ModbusException(f"Schreiben Reg {start}-{start + len(values) - 1} abgelehnt: {rr}")
+
+
+# ------------------------------------------------------------------
+# Verbindungstest / Hardware-Erkennung
+# ------------------------------------------------------------------
+
+class ModbusProbeError(Exception):
+    """Verbindungstest fehlgeschlagen; reason ist der Fehlerschlüssel im Flow."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+async def async_probe(
+    host: str,
+    port: int = DEFAULT_PORT,
+    unit_id: int = DEFAULT_UNIT_ID,
+    timeout: float = PROBE_TIMEOUT,
+) -> dict:
+    """Modbus-Handshake für den Config-Flow (blockiert den Event-Loop nicht).
+
+    Liest REG_OUTDOOR_TEMP über die Unit ID (Input, bei Fehler Holding) und
+    prüft, dass die Antwort von dieser Unit stammt. Gibt {"latency_ms",
+    "outdoor_temp"} zurück oder wirft ModbusProbeError mit reason
+    cannot_connect / no_response / invalid_unit_id.
+    """
+    client = AsyncModbusTcpClient(host, port=port, timeout=timeout, retries=0)
+    try:
+        if not await client.connect():
+            raise ModbusProbeError("cannot_connect", f"{host}:{port} nicht erreichbar")
+
+        function = register_function(REG_OUTDOOR_TEMP, REG_TYPE_FLOAT, {})
+        for function in (function, _other_function(function)):
+            read = (
+                client.read_input_registers if function == FC_INPUT
+                else client.read_holding_registers
+            )
+            started = time.monotonic()
+            try:
+                rr = await read(address=REG_OUTDOOR_TEMP, count=2, device_id=unit_id)
+            except ModbusException as e:
+                raise ModbusProbeError(
+                    "no_response", f"Keine Antwort von Unit {unit_id}: {e}",
+                ) from e
+            latency = time.monotonic() - started
+
+            if rr.isError():
+                if getattr(rr, "exception_code", None) in PROBE_GATEWAY_EXCEPTIONS:
+                    raise ModbusProbeError(
+                        "invalid_unit_id", f"Gateway erreicht Unit {unit_id} nicht",
+                    )
+                continue  # Funktionscode nicht unterstützt → anderer Funktionscode
+            if rr.dev_id != unit_id:
+                raise ModbusProbeError(
+                    "invalid_unit_id", f"Antwort von Unit {rr.dev_id} statt {unit_id}",
+                )
+            return {
+                "latency_ms": round(latency * 1000, 1),
+                "outdoor_temp": decode_register(REG_TYPE_FLOAT, rr.registers),
+            }
+        raise ModbusProbeError(
+            "no_response", f"Register {REG_OUTDOOR_TEMP} von Unit {unit_id} nicht lesbar",
+        )
+    finally:
+        client.close()
+
+
+async def async_discover(
+    host: str,
+    port: int = DEFAULT_PORT,
+    unit_id: int = DEFAULT_UNIT_ID,
+) -> tuple[list[str], list[str]]:
+    """Hardware-Scan: verbaute Heizkreise und Sensor-Gruppen erkennen.
+
+    Liest die Kennregister aller Heizkreise (A–G) und die Fühler der Gruppen
+    mit wenigen Block-Reads (read_all) über eine eigene Verbindung und wertet
+    sie per detect_hardware() aus.
+    """
+    register_map = build_discovery_register_map()
+    handler = IDMModbusHandler(host, port, unit_id)
+    try:
+        await handler.connect()
+        values = await handler.read_all(register_map)
+    finally:
+        await handler.close()
+    _LOGGER.debug(
+        "iDM Hardware-Scan %s:%s (Unit %s): %d Register in %d Requests",
+        host, port, unit_id, len(register_map), handler.last_poll_metrics["requests"],
+    )
+    return detect_hardware(values)
@@ -1,7 +1,17 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v0.7.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Nach Schreibzugriffen wird nur das geschriebene Register zurückgelesen
+  (coordinator.async_request_register_refresh) statt eines vollen Refresh
+- Listener-Context = Register: Update nur bei Änderung des Registers
+- Register-Entities erben von IDMRegisterEntity (Attribut "veraltet" bis zum ersten Poll nach einem Snapshot-Start)
+- unique_id und device_info pro Config-Entry (mehrere Wärmepumpen)
+- Tabellengesteuert: Register-Numbers in einem Durchlauf über die Entity-Tabelle
+  (descriptions.py, per plan.entities_for aufgelöst – Gruppen und Heizkreise);
+  Adressen und Grenzen kommen aus der Beschreibung statt aus hc_reg()
 
 Änderungen v0.7.0:
 - Temperatur-Offset Number-Entity pro HK (±5°C, Step 0.5)
@@ -16,28 +26,24 @@ Stand: 2026-02-26
 
 import logging
 from homeassistant.components.number import NumberEntity
-from homeassistant.const import UnitOfTemperature, UnitOfPower
+from homeassistant.const import UnitOfTemperature
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .entity import IDMRegisterEntity, description_kwargs
+
 from .const import (
     DOMAIN,
-    DEFAULT_HEATING_CIRCUITS,
-    DEFAULT_SENSOR_GROUPS,
     DEFAULT_ROOM_TEMP_ENTITIES,
     ROOM_TEMP_OFFSET_MIN,
     ROOM_TEMP_OFFSET_MAX,
     ROOM_TEMP_OFFSET_STEP,
     ROOM_TEMP_OFFSET_DEFAULT,
-    REG_WW_TARGET,
-    REG_WW_START,
-    REG_WW_STOP,
-    REG_POWER_LIMIT,
-    REG_PV_TARGET,
-    hc_reg,
     get_device_info,
+    scoped_unique_id,
 )
+from .descriptions import PLATFORM_NUMBER, KIND_FLOAT, KIND_UCHAR
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,121 +51,20 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_entities):
     entry_data = hass.data[DOMAIN][entry.entry_id]
     coordinator = entry_data["coordinator"]
+    plan = entry_data["register_plan"]
     client = entry_data["client"]
     host = entry_data["host"]
-    heating_circuits = entry_data.get("heating_circuits", DEFAULT_HEATING_CIRCUITS)
-    sensor_groups = entry_data.get("sensor_groups", DEFAULT_SENSOR_GROUPS)
     room_temp_entities = entry_data.get("room_temp_entities", DEFAULT_ROOM_TEMP_ENTITIES)
     forwarder = entry_data.get("room_temp_forwarder")
 
-    entities = []
-
-    # ===================================================================
-    # BASIS: Heizkreis-Numbers (immer aktiv)
-    # ===================================================================
-    for hc in heating_circuits:
-        key = hc.lower()
-        entities.extend([
-            IDMFloatNumber(
-                coordinator, client, host,
-                f"idm_hk{key}_temp_normal", f"hk{key}_temp_normal",
-                hc_reg(hc, "temp_normal"), 15, 30, 0.5, 22,
-            ),
-            IDMFloatNumber(
-                coordinator, client, host,
-                f"idm_hk{key}_temp_eco", f"hk{key}_temp_eco",
-                hc_reg(hc, "temp_eco"), 10, 25, 0.5, 18,
-            ),
-            IDMFloatNumber(
-                coordinator, client, host,
-                f"idm_hk{key}_curve", f"hk{key}_curve",
-                hc_reg(hc, "curve"), 0.1, 3.5, 0.1, 0.6,
-            ),
-            IDMUcharNumber(
-                coordinator, client, host,
-                f"idm_hk{key}_parallel", f"hk{key}_parallel",
-                hc_reg(hc, "parallel"), 0, 30, 1, 0,
-            ),
-            IDMUcharNumber(
-                coordinator, client, host,
-                f"idm_hk{key}_heat_limit", f"hk{key}_heat_limit",
-                hc_reg(hc, "heat_limit"), 0, 50, 1, 15,
-            ),
-        ])
-
-    # Warmwasser (Basis)
-    entities.extend([
-        IDMUcharNumber(coordinator, client, host,
-                       "idm_ww_target", "ww_target", REG_WW_TARGET,
-                       30, 60, 1, 46),
-        IDMUcharNumber(coordinator, client, host,
-                       "idm_ww_start", "ww_start", REG_WW_START,
-                       30, 50, 1, 46),
-        IDMUcharNumber(coordinator, client, host,
-                       "idm_ww_stop", "ww_stop", REG_WW_STOP,
-                       46, 67, 1, 50),
-    ])
-
-    # ===================================================================
-    # KÜHLUNGS-GRUPPE: Kühl-Numbers pro HK
-    # ===================================================================
-    if "cooling" in sensor_groups:
-        for hc in heating_circuits:
-            key = hc.lower()
-            entities.extend([
-                # Raumsolltemp Kühlen Normal (FLOAT, 18–30 °C)
-                IDMFloatNumber(
-                    coordinator, client, host,
-                    f"idm_hk{key}_cool_normal", f"hk{key}_cool_normal",
-                    hc_reg(hc, "cool_normal"), 18, 30, 0.5, 24,
-                ),
-                # Raumsolltemp Kühlen Eco (FLOAT, 20–32 °C)
-                IDMFloatNumber(
-                    coordinator, client, host,
-                    f"idm_hk{key}_cool_eco", f"hk{key}_cool_eco",
-                    hc_reg(hc, "cool_eco"), 20, 32, 0.5, 26,
-                ),
-                # Kühlgrenze (UCHAR, 10–40 °C)
-                IDMUcharNumber(
-                    coordinator, client, host,
-                    f"idm_hk{key}_cool_limit", f"hk{key}_cool_limit",
-                    hc_reg(hc, "cool_limit"), 10, 40, 1, 20,
-                ),
-                # Soll-Vorlauf Kühlen (UCHAR, 10–25 °C)
-                IDMUcharNumber(
-                    coordinator, client, host,
-                    f"idm_hk{key}_cool_vl", f"hk{key}_cool_vl",
-                    hc_reg(hc, "cool_vl"), 10, 25, 1, 18,
-                ),
-            ])
-
-    # ===================================================================
-    # DIAGNOSE-GRUPPE: Leistungsbegrenzung WP
-    # ===================================================================
-    if "diagnostic" in sensor_groups:
-        entities.append(
-            IDMFloatNumber(
-                coordinator, client, host,
-                "idm_leistungsbegrenzung", "leistungsbegrenzung",
-                REG_POWER_LIMIT, 0.0, 100.0, 1.0, 100.0,
-                unit=UnitOfPower.KILO_WATT,
-                entity_category=EntityCategory.CONFIG,
-                default_enabled=False,
-            ),
-        )
-
-    # ===================================================================
-    # PV / BATTERIE-GRUPPE: PV-Zielwert
-    # ===================================================================
-    if "pv_battery" in sensor_groups:
-        entities.append(
-            IDMFloatNumber(
-                coordinator, client, host,
-                "idm_pv_zielwert", "pv_zielwert",
-                REG_PV_TARGET, 0.0, 50.0, 0.1, 0.0,
-                unit=UnitOfPower.KILO_WATT,
-            ),
+    # Eine Entity pro Zeile der Entity-Tabelle (Gruppen + Heizkreise aufgelöst)
+    entities = [
+        NUMBER_CLASSES[entity.description.kind](
+            coordinator, client, host, entity.key, entity.translation_key,
+            entity.address, **description_kwargs(entity.description),
         )
+        for entity in plan.entities_for(PLATFORM_NUMBER)
+    ]
 
     # ===================================================================
     # RAUMTEMPERATUR-OFFSET pro HK (v0.7.0)
@@ -181,7 +86,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # -------------------------------------------------------------------
 # FLOAT-Number
 # -------------------------------------------------------------------
-class IDMFloatNumber(CoordinatorEntity, NumberEntity):
+class IDMFloatNumber(IDMRegisterEntity, NumberEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, client, host,
@@ -189,12 +94,11 @@ class IDMFloatNumber(CoordinatorEntity, NumberEntity):
                  min_value, max_value, step, default,
                  unit=None, entity_category=None,
                  default_enabled=True):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._client = client
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_native_min_value = float(min_value)
         self._attr_native_max_value = float(max_value)
         self._attr_native_step = float(step)
@@ -207,7 +111,7 @@ class IDMFloatNumber(CoordinatorEntity, NumberEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -218,17 +122,17 @@ class IDMFloatNumber(CoordinatorEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float):
         await self._client.write_float(self._register, float(value))
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_register_refresh(self._register)
 
     @property
     def extra_state_attributes(self):
-        return {"default_value": self._default}
+        return {**(super().extra_state_attributes or {}), "default_value": self._default}
 
 
 # -------------------------------------------------------------------
 # UCHAR-Number
 # -------------------------------------------------------------------
-class IDMUcharNumber(CoordinatorEntity, NumberEntity):
+class IDMUcharNumber(IDMRegisterEntity, NumberEntity):
     _attr_has_entity_name = True
     _attr_device_class = "temperature"
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -236,12 +140,11 @@ class IDMUcharNumber(CoordinatorEntity, NumberEntity):
     def __init__(self, coordinator, client, host,
                  unique_id, translation_key, register,
                  min_value, max_value, step, default):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._client = client
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_native_min_value = int(min_value)
         self._attr_native_max_value = int(max_value)
         self._attr_native_step = int(step)
@@ -249,7 +152,7 @@ class IDMUcharNumber(CoordinatorEntity, NumberEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -260,11 +163,18 @@ class IDMUcharNumber(CoordinatorEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float):
         await self._client.write_uchar(self._register, int(value))
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_register_refresh(self._register)
 
     @property
     def extra_state_attributes(self):
-        return {"default_value": self._default}
+        return {**(super().extra_state_attributes or {}), "default_value": self._default}
+
+
+# Entity-Klasse pro Entity-Art der Tabelle
+NUMBER_CLASSES = {
+    KIND_FLOAT: IDMFloatNumber,
+    KIND_UCHAR: IDMUcharNumber,
+}
 
 
 # -------------------------------------------------------------------
@@ -295,13 +205,13 @@ class IDMRoomTempOffset(CoordinatorEntity, RestoreEntity, NumberEntity):
         self._host = host
         self._forwarder = forwarder
         self._hc = hc
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
         self._value = ROOM_TEMP_OFFSET_DEFAULT
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
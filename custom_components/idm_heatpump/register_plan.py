@@ -0,0 +1,227 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- RegisterPlan: unveränderlicher, einmal pro Config-Entry vorberechneter
+  Register-Plan (Adresse, Typ, Polling-Stufe und zugehörige unique_ids). Coordinator, alle Plattformen und das Aufräumen
+  verwaister Entitäten teilen sich denselben Plan, statt Register-Map und
+  HC-Adressen jeweils neu zu berechnen.
+- Register-Map, Stufen und Auto-Detect-Register werden aus der Entity-Tabelle
+  (descriptions.ENTITY_DESCRIPTIONS) abgeleitet; plan.entities liefert den
+  Plattformen ihre Entities. Register-Typen für die Hardware-Erkennung
+  (build_discovery_register_map/detect_hardware, bisher in const.py) ebenfalls.
+- diagnostics(): zusätzlich die Entity-Keys (unique_ids) pro Register (owners,
+  Adressen als String-Keys wie in den übrigen Diagnose-Daten)
+"""
+
+from array import array
+from types import MappingProxyType
+
+from .const import (
+    ALL_HEATING_CIRCUITS,
+    ALL_SENSOR_GROUPS,
+    DEFAULT_SENSOR_GROUPS,
+    DISCOVERY_GROUP_HC_REGISTERS,
+    DISCOVERY_GROUP_REGISTERS,
+    DISCOVERY_HC_REGISTERS,
+    POLL_TIERS,
+    hc_reg,
+    is_valid_value,
+)
+from .descriptions import ENTITY_DESCRIPTIONS, ExpandedEntity, expand_descriptions
+
+_TIER_SLOT = {tier: slot for slot, tier in enumerate(POLL_TIERS)}
+
+
+def _register_types() -> tuple[dict[int, str], dict[str, str]]:
+    """Register-Typen aus der Entity-Tabelle: ({adresse: typ}, {hc_name: typ})."""
+    static: dict[int, str] = {}
+    per_circuit: dict[str, str] = {}
+    for description in ENTITY_DESCRIPTIONS:
+        if description.register is None:
+            continue
+        types = per_circuit if description.per_circuit else static
+        types[description.register] = description.reg_type
+    return static, per_circuit
+
+
+STATIC_REGISTER_TYPES, HC_REGISTER_TYPES = _register_types()
+
+
+class RegisterPlan:
+    """Unveränderlicher Register-Plan eines Config-Entries.
+
+    Wird aus den Entities der Konfiguration (expand_descriptions) gebaut:
+    gepollt werden genau die Register, die eine aktive Entity anzeigt oder
+    schreibt. Die Register liegen als parallele Tupel/Arrays vor (Adresse,
+    unique_ids). Die vom
+    Coordinator und den Plattformen benötigten Sichten (register_map, tiers,
+    tier_maps, entities) werden einmal beim Bauen erzeugt und nur lesend
+    herausgegeben.
+    """
+
+    __slots__ = (
+        "heating_circuits",
+        "sensor_groups",
+        "entities",
+        "addresses",
+        "owners",
+        "register_map",
+        "tiers",
+        "tier_maps",
+        "auto_detect",
+        "unique_ids",
+        "_index",
+    )
+
+    def __init__(self, heating_circuits, sensor_groups, entities, tier_overrides=None):
+        # {adresse: [typ, stufe, unique_ids]}
+        rows: dict[int, list] = {}
+        auto_detect = set()
+        for entity in entities:
+            address = entity.address
+            if address is None:
+                continue
+            description = entity.description
+            row = rows.get(address)
+            if row is None:
+                rows[address] = [description.reg_type, description.tier, (entity.key,)]
+            else:
+                # Mehrere Entities auf einem Register: schnellste Stufe gewinnt
+                if _TIER_SLOT[description.tier] < _TIER_SLOT[row[1]]:
+                    row[1] = description.tier
+                row[2] += (entity.key,)
+            if description.auto_detect:
+                auto_detect.add(address)
+
+        for address, tier in (tier_overrides or {}).items():
+            try:
+                address = int(address)
+            except (TypeError, ValueError):
+                continue
+            if address in rows and tier in POLL_TIERS:
+                rows[address][1] = tier
+
+        ordered = sorted(rows.items())
+        init = object.__setattr__
+        init(self, "heating_circuits", tuple(heating_circuits))
+        init(self, "sensor_groups", tuple(sensor_groups))
+        init(self, "entities", tuple(entities))
+        init(self, "addresses", array("H", (address for address, _ in ordered)))
+        init(self, "owners", tuple(row[2] for _, row in ordered))
+        init(self, "_index", MappingProxyType({address: i for i, (address, _) in enumerate(ordered)}))
+
+        register_map = {address: row[0] for address, row in ordered}
+        tiers = {address: row[1] for address, row in ordered}
+        tier_maps = {tier: {} for tier in POLL_TIERS}
+        for address, reg_type in register_map.items():
+            tier_maps[tiers[address]][address] = reg_type
+        init(self, "register_map", MappingProxyType(register_map))
+        init(self, "tiers", MappingProxyType(tiers))
+        init(self, "tier_maps", MappingProxyType(
+            {tier: MappingProxyType(regs) for tier, regs in tier_maps.items()}
+        ))
+        init(self, "auto_detect", frozenset(auto_detect))
+        init(self, "unique_ids", frozenset(entity.key for entity in entities))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RegisterPlan ist unveränderlich")
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __contains__(self, address) -> bool:
+        return address in self._index
+
+    def entities_for(self, platform: str) -> tuple[ExpandedEntity, ...]:
+        """Entities einer Plattform in Tabellen-Reihenfolge."""
+        return tuple(entity for entity in self.entities if entity.description.platform == platform)
+
+    def diagnostics(self) -> dict:
+        """Kurzübersicht für den Diagnose-Download."""
+        return {
+            "registers": len(self),
+            "entities": len(self.entities),
+            "tiers": {tier: len(regs) for tier, regs in self.tier_maps.items()},
+            "auto_detect": sorted(self.auto_detect),
+            # Welche Entities (unique_id-Keys) ein Register anzeigen/schreiben
+            "owners": {
+                str(address): list(owners) for address, owners in zip(self.addresses, self.owners)
+            },
+        }
+
+
+def build_register_plan(
+    heating_circuits: list[str],
+    sensor_groups: list[str] | None = None,
+    tier_overrides: dict | None = None,
+) -> RegisterPlan:
+    """Baut den Register-Plan aus der Entity-Tabelle (ENTITY_DESCRIPTIONS).
+
+    Args:
+        heating_circuits: Aktive Heizkreise
+        sensor_groups: Aktive Sensor-Gruppen. None = alle aktiv.
+        tier_overrides: {adresse: stufe} aus den Options (Keys dürfen Strings sein)
+    """
+    if sensor_groups is None:
+        sensor_groups = ALL_SENSOR_GROUPS
+    return RegisterPlan(
+        heating_circuits,
+        sensor_groups,
+        expand_descriptions(heating_circuits, sensor_groups),
+        tier_overrides,
+    )
+
+
+# -------------------------------------------------------------------
+# Hardware-Erkennung (Config-Flow): welche HK/Gruppen sind verbaut?
+# -------------------------------------------------------------------
+
+def build_discovery_register_map() -> dict[int, str]:
+    """Register für den Hardware-Scan: HK-Kennregister (A–G) + Gruppen-Fühler."""
+    registers = {}
+    for hc in ALL_HEATING_CIRCUITS:
+        for name in DISCOVERY_HC_REGISTERS:
+            registers[hc_reg(hc, name)] = HC_REGISTER_TYPES[name]
+        for names in DISCOVERY_GROUP_HC_REGISTERS.values():
+            for name in names:
+                registers[hc_reg(hc, name)] = HC_REGISTER_TYPES[name]
+    for addresses in DISCOVERY_GROUP_REGISTERS.values():
+        for address in addresses:
+            registers[address] = STATIC_REGISTER_TYPES[address]
+    return registers
+
+
+def detect_hardware(values: dict[int, any]) -> tuple[list[str], list[str]]:
+    """Leitet verbaute Heizkreise und Sensor-Gruppen aus einem Scan ab.
+
+    Args:
+        values: {adresse: wert} aus build_discovery_register_map()
+
+    Returns: (heizkreise, sensor_gruppen) für die Vorauswahl im Config-Flow
+    """
+    register_map = build_discovery_register_map()
+
+    def valid(address: int) -> bool:
+        return is_valid_value(register_map[address], values.get(address))
+
+    circuits = [
+        hc for hc in ALL_HEATING_CIRCUITS
+        if all(valid(hc_reg(hc, name)) for name in DISCOVERY_HC_REGISTERS)
+    ]
+
+    groups = []
+    for group in ALL_SENSOR_GROUPS:
+        if group not in DISCOVERY_GROUP_REGISTERS:
+            if group in DEFAULT_SENSOR_GROUPS:
+                groups.append(group)
+            continue
+        addresses = list(DISCOVERY_GROUP_REGISTERS[group])
+        for name in DISCOVERY_GROUP_HC_REGISTERS.get(group, []):
+            addresses.extend(hc_reg(hc, name) for hc in circuits)
+        if any(valid(address) for address in addresses):
+            groups.append(group)
+
+    return circuits, groups
@@ -0,0 +1,59 @@
+"""
+iDM Wärmepumpe (Modbus TCP)
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- IDMPollScheduler: gemeinsamer Scheduler aller konfigurierten Wärmepumpen.
+  Die read_all()-Zyklen der Coordinators werden gestaffelt gestartet, damit
+  Kaskaden nicht im selben Moment pollen. Wärmepumpen am selben Host/Port
+  teilen sich eine ModbusConnection (hass.data DATA_MODBUS_CONNECTIONS), deren
+  Requests nacheinander laufen (mit Pipeline über deren Verbindungs-Pool); die
+  Staffelung verteilt zusätzlich die Last auf getrennte Verbindungen.
+"""
+
+import asyncio
+import logging
+import time
+
+from .const import POLL_STAGGER_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IDMPollScheduler:
+    """Staffelt die Poll-Starts mehrerer Coordinators.
+
+    Zwischen zwei read_all()-Starts liegen mindestens POLL_STAGGER_SECONDS,
+    höchstens aber Tick / Anzahl Wärmepumpen, damit kein Coordinator seinen
+    Tick verpasst. Da der DataUpdateCoordinator den nächsten Tick relativ zum
+    Ende des letzten plant, bleiben die Phasen danach versetzt.
+    """
+
+    def __init__(self, stagger: float = POLL_STAGGER_SECONDS):
+        self._stagger = stagger
+        self._members: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @property
+    def members(self) -> int:
+        return len(self._members)
+
+    def register(self, member: str) -> None:
+        self._members.add(member)
+
+    def unregister(self, member: str) -> None:
+        self._members.discard(member)
+
+    async def async_wait_for_slot(self, member: str, tick_seconds: float) -> None:
+        """Wartet, bis der Poll von member starten darf."""
+        if len(self._members) < 2:
+            return
+        spacing = min(self._stagger, tick_seconds / len(self._members))
+        async with self._lock:
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                _LOGGER.debug("iDM Poll %s um %.2fs versetzt", member, delay)
+                await asyncio.sleep(delay)
+            self._next_start = time.monotonic() + spacing
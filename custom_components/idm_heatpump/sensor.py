@@ -1,7 +1,24 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v5.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Entities registrieren sich mit ihrem Register als Listener-Context und werden
+  nur bei Änderung ihres Registers aktualisiert
+- Auto-Detect: Zähler für ungültige Reads liegt im Coordinator (pro Register)
+- Deadband-Filter (DeadbandFilterMixin) für IDMFloatSensor/IDMAutoDetectFloatSensor:
+  State-Write nur bei Änderung > max(absolut, relativ) oder nach Heartbeat
+- Poll-Diagnose-Sensoren (IDMPollMetricSensor, standardmäßig deaktiviert):
+  Dauer, Requests, Bytes, Fehler, Wiederholungen, Reconnects
+- Register-Entities erben von IDMRegisterEntity (Attribut "veraltet" bis zum ersten Poll nach einem Snapshot-Start)
+- unique_id und device_info pro Config-Entry (mehrere Wärmepumpen)
+- Diagnose-Sensoren für EEPROM-Schreibzugriffe (heute, Woche, verworfen) mit
+  Zählern pro Register als Attribute
+- Tabellengesteuert: Setup als ein Durchlauf über die Entity-Tabelle
+  (descriptions.py, per plan.entities_for aufgelöst – Gruppen und Heizkreise);
+  Adresse, Sensor-Klasse und unique_id kommen aus der Beschreibung, Register-Map
+  und erwartete unique_ids stammen aus derselben Tabelle
 
 Änderungen v5.0 (Schritt 2 – Neue Features):
 - Neue Sensoren: SmartGrid, Verdichter, Ladepumpe, EVU-Sperre, Summenstörung,
@@ -13,87 +30,38 @@ Stand: 2026-02-26
 - Default-Disabled: Diagnose-Entities (entity_registry_enabled_default=False)
 """
 
+import time
+
 from homeassistant.components.persistent_notification import async_create as pn_create
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import (
-    PERCENTAGE,
-    UnitOfEnergy,
-    UnitOfPower,
-    UnitOfTemperature,
-)
+from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .entity import IDMRegisterEntity, description_kwargs
 from .const import (
     DOMAIN,
-    DEFAULT_HEATING_CIRCUITS,
-    DEFAULT_SENSOR_GROUPS,
-    INVALID_FLOAT,
     AUTO_DETECT_THRESHOLD,
-    hc_reg,
+    DEFAULT_DEADBANDS,
+    DEFAULT_DEADBAND_HEARTBEAT,
     get_device_info,
-    # Basis-Register
-    REG_AIR_INLET_TEMP,
-    REG_AIR_INLET_TEMP_2,
-    REG_FLOW_SENSOR,
-    REG_HEATBUFFER_TEMP,
-    REG_LOAD_TEMP,
-    REG_OUTDOOR_TEMP,
-    REG_OUTDOOR_TEMP_AVG,
-    REG_RETURN_TEMP,
-    REG_WP_VL_TEMP,
-    REG_WW_BOTTOM_TEMP,
-    REG_WW_TAP_TEMP,
-    REG_WW_TOP_TEMP,
-    REG_INTERNAL_MESSAGE,
-    REG_THERMAL_POWER,
-    REG_WP_MODE,
-    REG_WP_POWER,
-    REG_WP_STATUS,
-    REG_EN_COOLING,
-    REG_EN_DEFROST,
-    REG_EN_DHW,
-    REG_EN_EHEATER,
-    REG_EN_HEATING,
-    REG_EN_PASSIVE_COOL,
-    REG_EN_SOLAR,
-    REG_EN_TOTAL,
-    # Solar-Gruppe
-    REG_SOLAR_CHARGE_TEMP,
-    REG_SOLAR_COLLECTOR_TEMP,
-    REG_SOLAR_POWER,
-    REG_SOLAR_RETURN_TEMP,
-    # PV/Batterie-Gruppe
-    REG_BATTERIE_ENTLADUNG,
-    REG_BATTERIE_FUELLSTAND,
-    REG_EHEIZSTAB,
-    REG_HAUSVERBRAUCH,
-    REG_PV_PRODUKTION,
-    REG_PV_SURPLUS,
-    REG_SMARTGRID_STATUS,
-    REG_CURRENT_ELEC_PRICE,
-    # Kühlungs-Gruppe
-    REG_COOLING_REQUEST_WP,
-    REG_WW_REQUEST_WP,
-    # Diagnose-Gruppe
-    REG_FAULT_SUMMARY,
-    REG_EVU_LOCK,
-    REG_COMPRESSOR_1,
-    REG_CHARGE_PUMP,
-    REG_VARIABLE_INPUT,
-    REG_SWITCH_VALVE_HC,
-    REG_CIRC_PUMP,
-    # Einzelraumregelung-Gruppe
-    REG_HUMIDITY_SENSOR,
-    # Erweiterte Temperaturen-Gruppe
-    REG_HEAT_EXCHANGER_TEMP,
-    REG_HEATSINK_RETURN,
-    REG_HEATSINK_SUPPLY,
-    REG_COLD_STORAGE_TEMP,
+    scoped_unique_id,
+)
+from .descriptions import (
+    PLATFORM_SENSOR,
+    KIND_AUTO_FLOAT,
+    KIND_FLOAT,
+    KIND_FLOW,
+    KIND_MAPPED,
+    KIND_MESSAGE,
+    KIND_POLL_METRIC,
+    KIND_WORD,
+    KIND_WRITE_COUNT,
 )
 
 
@@ -202,391 +170,36 @@ def code_to_text(code: int) -> str:
     return MESSAGE_CODES.get(code, "Unbekannte Meldung – siehe NAVIGATOR-Handbuch")
 
 
-# SmartGrid Status Mapping
-SMARTGRID_MAP = {
-    0: "Aus",
-    1: "Normalbetrieb",
-    2: "Empfehlung: Einschalten",
-    3: "Einschaltbefehl",
-    4: "Abschaltbefehl",
-}
-
-# Variabler Eingang Mapping
-VARIABLE_INPUT_MAP = {
-    0: "Keine Funktion",
-    1: "EVU-Sperre",
-    2: "Sperre Verdichter",
-    3: "Externer Fehler",
-    4: "Sommerbetrieb",
-    5: "Winterbetrieb",
-}
-
-
 # -------------------------------------------------------------------
 # Setup
 # -------------------------------------------------------------------
 async def async_setup_entry(hass, entry, async_add_entities):
     entry_data = hass.data[DOMAIN][entry.entry_id]
     coordinator = entry_data["coordinator"]
+    plan = entry_data["register_plan"]
     host = entry_data["host"]
-    heating_circuits = entry_data.get("heating_circuits", DEFAULT_HEATING_CIRCUITS)
-    sensor_groups = entry_data.get("sensor_groups", DEFAULT_SENSOR_GROUPS)
 
+    # Eine Entity pro Zeile der Entity-Tabelle (Gruppen + Heizkreise aufgelöst)
     sensors = []
-
-    # ===================================================================
-    # BASIS-SENSOREN (immer aktiv)
-    # ===================================================================
-    sensors.extend([
-        # Außentemperaturen
-        IDMFloatSensor(coordinator, host, "idm_aussentemperatur", "aussentemperatur",
-                       REG_OUTDOOR_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_aussentemperatur_gemittelt", "aussentemperatur_gemittelt",
-                       REG_OUTDOOR_TEMP_AVG, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-
-        # Wärmepumpe direkt
-        IDMFloatSensor(coordinator, host, "idm_wp_vorlauf", "wp_vorlauf",
-                       REG_WP_VL_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_ruecklauf", "ruecklauf",
-                       REG_RETURN_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_ladefuehler", "ladefuehler",
-                       REG_LOAD_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFlowSensor(coordinator, host, "idm_durchfluss", "durchfluss", REG_FLOW_SENSOR),
-        IDMFloatSensor(coordinator, host, "idm_luftansaug", "luftansaug",
-                       REG_AIR_INLET_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_luftansaug_2", "luftansaug_2",
-                       REG_AIR_INLET_TEMP_2, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-
-        # Wärmespeicher / Warmwasser
-        IDMFloatSensor(coordinator, host, "idm_waermespeicher", "waermespeicher",
-                       REG_HEATBUFFER_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_ww_oben", "ww_oben",
-                       REG_WW_TOP_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_ww_unten", "ww_unten",
-                       REG_WW_BOTTOM_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_ww_zapftemp", "ww_zapftemp",
-                       REG_WW_TAP_TEMP, UnitOfTemperature.CELSIUS,
-                       SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-
-        # System: Interne Meldung
-        IDMInternalMessageSensor(coordinator, host, "idm_interne_meldung", "interne_meldung",
-                                 REG_INTERNAL_MESSAGE,
-                                 entity_category=EntityCategory.DIAGNOSTIC),
-
-        # Betriebsart + Status WP
-        IDMMappedSensor(
-            coordinator, host,
-            "idm_betriebsart_warmepumpe", "betriebsart_warmepumpe",
-            REG_WP_MODE,
-            {0: "Bereit", 1: "Heizbetrieb", 2: "Kühlbetrieb", 3: "Unbekannt",
-             4: "Warmwasser", 8: "Abtauen"},
-            icon_map={
-                "Bereit": "mdi:power-standby",
-                "Heizbetrieb": "mdi:radiator",
-                "Kühlbetrieb": "mdi:snowflake",
-                "Abtauen": "mdi:water-sync",
-                "Warmwasser": "mdi:water-boiler",
-            },
-        ),
-        IDMMappedSensor(
-            coordinator, host,
-            "idm_status_warmepumpe", "status_warmepumpe",
-            REG_WP_STATUS,
-            {0: "Bereit", 1: "Heizbetrieb"},
-            icon_map={
-                "Bereit": "mdi:power-standby",
-                "Heizbetrieb": "mdi:radiator",
-            },
-        ),
-
-        # Leistungen
-        IDMFloatSensor(coordinator, host, "idm_wp_power", "wp_power",
-                       REG_WP_POWER, UnitOfPower.KILO_WATT,
-                       SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-        IDMFloatSensor(coordinator, host, "idm_thermische_leistung", "thermische_leistung",
-                       REG_THERMAL_POWER, UnitOfPower.KILO_WATT,
-                       SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-
-        # Energiemengen
-        IDMFloatSensor(coordinator, host, "idm_en_heizen", "en_heizen",
-                       REG_EN_HEATING, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_gesamt", "en_gesamt",
-                       REG_EN_TOTAL, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_kuehlen", "en_kuehlen",
-                       REG_EN_COOLING, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_warmwasser", "en_warmwasser",
-                       REG_EN_DHW, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_abtauung", "en_abtauung",
-                       REG_EN_DEFROST, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_passivkuehlung", "en_passivkuehlung",
-                       REG_EN_PASSIVE_COOL, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_solar", "en_solar",
-                       REG_EN_SOLAR, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-        IDMFloatSensor(coordinator, host, "idm_en_eheizer", "en_eheizer",
-                       REG_EN_EHEATER, UnitOfEnergy.KILO_WATT_HOUR,
-                       SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
-    ])
-
-    # Dynamische Heizkreis-Sensoren (Basis – immer)
-    for hc in heating_circuits:
-        key = hc.lower()
-        sensors.extend([
-            IDMFloatSensor(
-                coordinator, host,
-                f"idm_hk{key}_vorlauftemperatur", f"hk{key}_vorlauf",
-                hc_reg(hc, "vl"), UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-            IDMFloatSensor(
-                coordinator, host,
-                f"idm_hk{key}_soll_vorlauf", f"hk{key}_soll_vorlauf",
-                hc_reg(hc, "vl_soll"), UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-            IDMMappedSensor(
-                coordinator, host,
-                f"idm_hk{key}_aktive_betriebsart", f"hk{key}_aktive_betriebsart",
-                hc_reg(hc, "active_mode"),
-                {0: "Aus", 1: "Heizen", 2: "Kühlen"},
-                icon_map={
-                    "Aus": "mdi:power-standby",
-                    "Heizen": "mdi:radiator",
-                    "Kühlen": "mdi:snowflake",
-                },
-            ),
-        ])
-
-    # ===================================================================
-    # SOLAR-GRUPPE
-    # ===================================================================
-    if "solar" in sensor_groups:
-        sensors.extend([
-            IDMFloatSensor(coordinator, host, "idm_solar_kollektor", "solar_kollektor",
-                           REG_SOLAR_COLLECTOR_TEMP, UnitOfTemperature.CELSIUS,
-                           SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_solar_ruecklauf", "solar_ruecklauf",
-                           REG_SOLAR_RETURN_TEMP, UnitOfTemperature.CELSIUS,
-                           SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_solar_ladetemp", "solar_ladetemp",
-                           REG_SOLAR_CHARGE_TEMP, UnitOfTemperature.CELSIUS,
-                           SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_solar_leistung", "solar_leistung",
-                           REG_SOLAR_POWER, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-        ])
-
-    # ===================================================================
-    # PV / BATTERIE-GRUPPE
-    # ===================================================================
-    if "pv_battery" in sensor_groups:
-        sensors.extend([
-            IDMFloatSensor(coordinator, host, "idm_pv_ueberschuss", "pv_ueberschuss",
-                           REG_PV_SURPLUS, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_e_heizstab", "e_heizstab",
-                           REG_EHEIZSTAB, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_pv_produktion", "pv_produktion",
-                           REG_PV_PRODUKTION, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_hausverbrauch", "hausverbrauch",
-                           REG_HAUSVERBRAUCH, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-            IDMFloatSensor(coordinator, host, "idm_batterie_entladung", "batterie_entladung",
-                           REG_BATTERIE_ENTLADUNG, UnitOfPower.KILO_WATT,
-                           SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
-            IDMWordSensor(coordinator, host, "idm_batterie_fuellstand", "batterie_fuellstand",
-                          REG_BATTERIE_FUELLSTAND, PERCENTAGE,
-                          entity_category=EntityCategory.DIAGNOSTIC),
-            # NEU: SmartGrid Status
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_smartgrid_status", "smartgrid_status",
-                REG_SMARTGRID_STATUS,
-                SMARTGRID_MAP,
-                icon_map={
-                    "Aus": "mdi:transmission-tower-off",
-                    "Normalbetrieb": "mdi:transmission-tower",
-                    "Empfehlung: Einschalten": "mdi:flash",
-                    "Einschaltbefehl": "mdi:flash-alert",
-                    "Abschaltbefehl": "mdi:flash-off",
-                },
-            ),
-            # NEU: Aktueller Strompreis
-            IDMFloatSensor(coordinator, host, "idm_strompreis", "strompreis",
-                           REG_CURRENT_ELEC_PRICE, "ct/kWh",
-                           None, SensorStateClass.MEASUREMENT),
-        ])
-
-    # ===================================================================
-    # KÜHLUNGS-GRUPPE (Sensoren)
-    # ===================================================================
-    if "cooling" in sensor_groups:
-        sensors.extend([
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_kuehlanforderung_wp", "kuehlanforderung_wp",
-                REG_COOLING_REQUEST_WP,
-                {0: "Keine Anforderung", 1: "Anforderung aktiv"},
-                icon_map={
-                    "Keine Anforderung": "mdi:snowflake-off",
-                    "Anforderung aktiv": "mdi:snowflake-alert",
-                },
-            ),
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_ww_anforderung_wp", "ww_anforderung_wp",
-                REG_WW_REQUEST_WP,
-                {0: "Keine Anforderung", 1: "Anforderung aktiv"},
-                icon_map={
-                    "Keine Anforderung": "mdi:water-boiler-off",
-                    "Anforderung aktiv": "mdi:water-boiler-alert",
-                },
-            ),
-        ])
-
-    # ===================================================================
-    # DIAGNOSE-GRUPPE (Default-Disabled!)
-    # ===================================================================
-    if "diagnostic" in sensor_groups:
-        sensors.extend([
-            # Summenstörung
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_summenstoerung", "summenstoerung",
-                REG_FAULT_SUMMARY,
-                {0: "Keine Störung", 1: "Störung aktiv"},
-                icon_map={
-                    "Keine Störung": "mdi:check-circle-outline",
-                    "Störung aktiv": "mdi:alert-circle",
-                },
-                entity_category=EntityCategory.DIAGNOSTIC,
-                default_enabled=False,
-            ),
-            # EVU-Sperrkontakt
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_evu_sperre", "evu_sperre",
-                REG_EVU_LOCK,
-                {0: "Nicht gesperrt", 1: "Gesperrt"},
-                icon_map={
-                    "Nicht gesperrt": "mdi:lock-open-outline",
-                    "Gesperrt": "mdi:lock",
-                },
-                entity_category=EntityCategory.DIAGNOSTIC,
-                default_enabled=False,
-            ),
-            # Verdichter 1
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_verdichter_1", "verdichter_1",
-                REG_COMPRESSOR_1,
-                {0: "Aus", 1: "Ein"},
-                icon_map={
-                    "Aus": "mdi:engine-off-outline",
-                    "Ein": "mdi:engine",
-                },
-                entity_category=EntityCategory.DIAGNOSTIC,
-                default_enabled=False,
-            ),
-            # Ladepumpe (WORD → %)
-            IDMWordSensor(coordinator, host, "idm_ladepumpe", "ladepumpe",
-                          REG_CHARGE_PUMP, PERCENTAGE,
-                          entity_category=EntityCategory.DIAGNOSTIC,
-                          default_enabled=False),
-            # Variabler Eingang
-            IDMMappedSensor(
-                coordinator, host,
-                "idm_variabler_eingang", "variabler_eingang",
-                REG_VARIABLE_INPUT,
-                VARIABLE_INPUT_MAP,
-                entity_category=EntityCategory.DIAGNOSTIC,
-                default_enabled=False,
-            ),
-            # Umschaltventil Heizen/Kühlen
-            IDMWordSensor(coordinator, host, "idm_umschaltventil", "umschaltventil",
-                          REG_SWITCH_VALVE_HC, PERCENTAGE,
-                          entity_category=EntityCategory.DIAGNOSTIC,
-                          default_enabled=False),
-            # Zirkulationspumpe
-            IDMWordSensor(coordinator, host, "idm_zirkulationspumpe", "zirkulationspumpe",
-                          REG_CIRC_PUMP, PERCENTAGE,
-                          entity_category=EntityCategory.DIAGNOSTIC,
-                          default_enabled=False),
-        ])
-
-    # ===================================================================
-    # EINZELRAUMREGELUNG-GRUPPE
-    # ===================================================================
-    if "room_control" in sensor_groups:
-        # Raumtemperatur pro Heizkreis (Auto-Detect!)
-        for hc in heating_circuits:
-            key = hc.lower()
-            sensors.append(
-                IDMAutoDetectFloatSensor(
-                    coordinator, host,
-                    f"idm_hk{key}_raumtemperatur", f"hk{key}_raumtemperatur",
-                    hc_reg(hc, "room_temp"), UnitOfTemperature.CELSIUS,
-                    SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-                )
-            )
-        # Feuchtesensor (Auto-Detect!)
-        sensors.append(
-            IDMAutoDetectFloatSensor(
-                coordinator, host,
-                "idm_feuchtesensor", "feuchtesensor",
-                REG_HUMIDITY_SENSOR, PERCENTAGE,
-                SensorDeviceClass.HUMIDITY, SensorStateClass.MEASUREMENT,
-            )
-        )
-
-    # ===================================================================
-    # ERWEITERTE TEMPERATUREN-GRUPPE (Auto-Detect!)
-    # ===================================================================
-    if "extended_temps" in sensor_groups:
-        sensors.extend([
-            IDMAutoDetectFloatSensor(
-                coordinator, host,
-                "idm_luftwaermetauscher", "luftwaermetauscher",
-                REG_HEAT_EXCHANGER_TEMP, UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-            IDMAutoDetectFloatSensor(
-                coordinator, host,
-                "idm_waermesenke_ruecklauf", "waermesenke_ruecklauf",
-                REG_HEATSINK_RETURN, UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-            IDMAutoDetectFloatSensor(
-                coordinator, host,
-                "idm_waermesenke_vorlauf", "waermesenke_vorlauf",
-                REG_HEATSINK_SUPPLY, UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-            IDMAutoDetectFloatSensor(
-                coordinator, host,
-                "idm_kaeltespeicher", "kaeltespeicher",
-                REG_COLD_STORAGE_TEMP, UnitOfTemperature.CELSIUS,
-                SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT,
-            ),
-        ])
+    for entity in plan.entities_for(PLATFORM_SENSOR):
+        description = entity.description
+        kwargs = description_kwargs(description)
+        if kwargs.get("device_class") is not None:
+            kwargs["device_class"] = SensorDeviceClass(kwargs["device_class"])
+        if kwargs.get("state_class") is not None:
+            kwargs["state_class"] = SensorStateClass(kwargs["state_class"])
+        args = (coordinator, host, entity.key, entity.translation_key)
+        if entity.address is not None:
+            args += (entity.address,)
+        sensors.append(SENSOR_CLASSES[description.kind](*args, **kwargs))
+
+    # Deadband-Filter pro Sensor-Klasse
+    deadbands = entry_data.get("deadbands", DEFAULT_DEADBANDS)
+    heartbeat = entry_data.get("deadband_heartbeat", DEFAULT_DEADBAND_HEARTBEAT)
+    for sensor in sensors:
+        if isinstance(sensor, DeadbandFilterMixin):
+            absolute, relative = deadbands.get(sensor.device_class, (0.0, 0.0))
+            sensor.set_deadband(absolute, relative, heartbeat)
 
     async_add_entities(sensors)
 
@@ -595,18 +208,92 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # Entity-Klassen
 # -------------------------------------------------------------------
 
-class IDMFloatSensor(CoordinatorEntity, SensorEntity):
+class DeadbandFilterMixin:
+    """Unterdrückt State-Writes für Änderungen innerhalb der Deadband.
+
+    Ein Wert wird nur geschrieben, wenn er um mindestens
+    max(absolut, relativ% * |letzter Wert|) vom zuletzt geschriebenen Wert
+    abweicht. Wechsel von/zu None und Verfügbarkeitswechsel werden immer
+    geschrieben. Unterdrückte Werte werden spätestens nach dem Heartbeat
+    nachgetragen (eigener Timer, da der Coordinator bei konstantem Wert
+    nicht mehr benachrichtigt).
+    """
+
+    _deadband_abs = 0.0
+    _deadband_rel = 0.0
+    _deadband_heartbeat = DEFAULT_DEADBAND_HEARTBEAT
+    _written_value = None
+    _written_available = None
+    _written_stale = False
+    _written_at = 0.0
+    _unsub_heartbeat = None
+
+    def set_deadband(self, absolute: float, relative: float, heartbeat: float) -> None:
+        self._deadband_abs = max(float(absolute), 0.0)
+        self._deadband_rel = max(float(relative), 0.0) / 100
+        self._deadband_heartbeat = max(float(heartbeat), 0.0)
+
+    def _within_deadband(self, value, available: bool) -> bool:
+        last = self._written_value
+        if value is None or last is None or available != self._written_available:
+            return False
+        if self.coordinator.is_stale != self._written_stale:
+            return False
+        threshold = max(self._deadband_abs, self._deadband_rel * abs(last))
+        # Toleranz gegen Float-Rundung (Werte sind auf 2 Stellen gerundet)
+        return threshold > 0 and abs(value - last) < threshold - 1e-9
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        value = self.native_value
+        available = self.available
+        if self._within_deadband(value, available):
+            elapsed = time.monotonic() - self._written_at
+            if elapsed < self._deadband_heartbeat:
+                if self._unsub_heartbeat is None:
+                    self._unsub_heartbeat = async_call_later(
+                        self.hass,
+                        self._deadband_heartbeat - elapsed,
+                        self._async_heartbeat,
+                    )
+                return
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_heartbeat(self, _now) -> None:
+        self._unsub_heartbeat = None
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._cancel_heartbeat()
+        self._written_value = self.native_value
+        self._written_available = self.available
+        self._written_stale = self.coordinator.is_stale
+        self._written_at = time.monotonic()
+        super().async_write_ha_state()
+
+    def _cancel_heartbeat(self) -> None:
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._cancel_heartbeat()
+        await super().async_will_remove_from_hass()
+
+
+class IDMFloatSensor(DeadbandFilterMixin, IDMRegisterEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, host, unique_id, translation_key,
                  register, unit, device_class=None,
                  state_class=SensorStateClass.MEASUREMENT,
                  entity_category=None):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = state_class
@@ -614,7 +301,7 @@ class IDMFloatSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -626,37 +313,37 @@ class IDMFloatSensor(CoordinatorEntity, SensorEntity):
         return value
 
 
-class IDMAutoDetectFloatSensor(CoordinatorEntity, SensorEntity):
+class IDMAutoDetectFloatSensor(DeadbandFilterMixin, IDMRegisterEntity, SensorEntity):
     """Float-Sensor mit Auto-Erkennung nicht verbauter Fühler.
 
     Wird unavailable wenn nach AUTO_DETECT_THRESHOLD aufeinanderfolgenden
     Lesungen nur ungültige Werte (-1.0) kommen. Wird automatisch wieder
-    available sobald gültige Werte empfangen werden.
+    available sobald gültige Werte empfangen werden. Die Lesungen zählt der
+    Coordinator pro Register, da Entities nur bei Änderungen benachrichtigt
+    werden.
     """
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, host, unique_id, translation_key,
                  register, unit, device_class=None,
                  state_class=SensorStateClass.MEASUREMENT):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
         self._attr_state_class = state_class
-        self._invalid_count = 0
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def available(self) -> bool:
         if not super().available:
             return False
-        return self._invalid_count < AUTO_DETECT_THRESHOLD
+        return self.coordinator.invalid_count(self._register) < AUTO_DETECT_THRESHOLD
 
     @property
     def native_value(self):
@@ -665,26 +352,17 @@ class IDMAutoDetectFloatSensor(CoordinatorEntity, SensorEntity):
             return None
         return value
 
-    def _handle_coordinator_update(self) -> None:
-        value = self.coordinator.data.get(self._register)
-        if value is None or value == INVALID_FLOAT:
-            self._invalid_count += 1
-        else:
-            self._invalid_count = 0
-        super()._handle_coordinator_update()
-
 
-class IDMMappedSensor(CoordinatorEntity, SensorEntity):
+class IDMMappedSensor(IDMRegisterEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, host, unique_id, translation_key,
                  register, value_map, icon_map=None, entity_category=None,
                  default_enabled=True):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._value_map = value_map
         self._icon_map = icon_map or {}
         self._attr_entity_category = entity_category
@@ -693,7 +371,7 @@ class IDMMappedSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -708,16 +386,15 @@ class IDMMappedSensor(CoordinatorEntity, SensorEntity):
         return self._icon_map.get(val, "mdi:alert-circle-outline")
 
 
-class IDMWordSensor(CoordinatorEntity, SensorEntity):
+class IDMWordSensor(IDMRegisterEntity, SensorEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, host, unique_id, translation_key,
                  register, unit, entity_category=None, default_enabled=True):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = None
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -727,29 +404,28 @@ class IDMWordSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
         return self.coordinator.data.get(self._register)
 
 
-class IDMFlowSensor(CoordinatorEntity, SensorEntity):
+class IDMFlowSensor(IDMRegisterEntity, SensorEntity):
     _attr_has_entity_name = True
     _attr_native_unit_of_measurement = "l/min"
     _attr_device_class = None
     _attr_state_class = SensorStateClass.MEASUREMENT
 
     def __init__(self, coordinator, host, unique_id, translation_key, register):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -759,24 +435,23 @@ class IDMFlowSensor(CoordinatorEntity, SensorEntity):
         return round(raw / 10.0, 1)
 
 
-class IDMInternalMessageSensor(CoordinatorEntity, SensorEntity):
+class IDMInternalMessageSensor(IDMRegisterEntity, SensorEntity):
     _attr_has_entity_name = True
     _attr_device_class = None
     _attr_state_class = SensorStateClass.MEASUREMENT
 
     def __init__(self, coordinator, host, unique_id, translation_key,
                  register, entity_category=None):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._attr_entity_category = entity_category
         self._last_code = None
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def native_value(self):
@@ -803,9 +478,109 @@ class IDMInternalMessageSensor(CoordinatorEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         code = self.native_value
-        return {"code_text": code_to_text(int(code)) if code is not None else None}
+        return {
+            **(super().extra_state_attributes or {}),
+            "code_text": code_to_text(int(code)) if code is not None else None,
+        }
 
     @property
     def icon(self):
         code = self.native_value or 0
         return "mdi:information-outline" if code == 0 else "mdi:alert-circle-outline"
+
+
+class IDMPollMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnose-Sensor für Poll-Metriken des Modbus-Handlers.
+
+    Registriert sich ohne Register-Context und wird daher nach jedem
+    Coordinator-Update aktualisiert.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, host, unique_id, translation_key,
+                 metric, unit=None, device_class=None, total=False):
+        super().__init__(coordinator)
+        self._host = host
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
+        self._attr_translation_key = translation_key
+        self._metric = metric
+        self._total = total
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = (
+            SensorStateClass.TOTAL_INCREASING if total else SensorStateClass.MEASUREMENT
+        )
+
+    @property
+    def device_info(self):
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
+
+    @property
+    def native_value(self):
+        client = self.coordinator.client
+        if self._total:
+            return client.total_metrics.get(self._metric)
+        metrics = client.last_poll_metrics
+        if metrics is None:
+            return None
+        return metrics.get(self._metric)
+
+    @property
+    def extra_state_attributes(self):
+        totals = self.coordinator.client.total_metrics
+        return {
+            "gesamt": totals.get(self._metric),
+            "polls": totals.get("polls"),
+        }
+
+
+class IDMWriteCountSensor(CoordinatorEntity, SensorEntity):
+    """Diagnose-Sensor für die EEPROM-Schreibzähler des Modbus-Handlers.
+
+    State = Summe über alle Register, Attribute = Zähler pro Register.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chip"
+
+    def __init__(self, coordinator, host, unique_id, translation_key, counter):
+        super().__init__(coordinator)
+        self._host = host
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
+        self._attr_translation_key = translation_key
+        self._counter = counter
+
+    @property
+    def device_info(self):
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
+
+    def _counts(self) -> dict[int, int]:
+        return getattr(self.coordinator.client.write_budget, self._counter)
+
+    @property
+    def native_value(self):
+        return sum(self._counts().values())
+
+    @property
+    def extra_state_attributes(self):
+        attrs = {f"reg_{address}": count for address, count in sorted(self._counts().items())}
+        attrs["budget_pro_tag"] = self.coordinator.client.write_budget.daily_budget
+        return attrs
+
+
+# Entity-Klasse pro Entity-Art der Tabelle
+SENSOR_CLASSES = {
+    KIND_FLOAT: IDMFloatSensor,
+    KIND_AUTO_FLOAT: IDMAutoDetectFloatSensor,
+    KIND_MAPPED: IDMMappedSensor,
+    KIND_WORD: IDMWordSensor,
+    KIND_FLOW: IDMFlowSensor,
+    KIND_MESSAGE: IDMInternalMessageSensor,
+    KIND_POLL_METRIC: IDMPollMetricSensor,
+    KIND_WRITE_COUNT: IDMWriteCountSensor,
+}
@@ -1,7 +1,18 @@
 """
 iDM Wärmepumpe (Modbus TCP)
-Version: v0.6.0
-Stand: 2026-02-26
+Version: v0.8.0
+Stand: 2026-10-18
+
+Änderungen v0.8.0:
+- Nach Schreibzugriffen wird nur das geschriebene Register zurückgelesen
+  (coordinator.async_request_register_refresh) statt eines vollen Refresh
+- Listener-Context = Register: Update nur bei Änderung des Registers
+- Register-Entities erben von IDMRegisterEntity (Attribut "veraltet" bis zum ersten Poll nach einem Snapshot-Start)
+- unique_id und device_info pro Config-Entry (mehrere Wärmepumpen); Master-Switch
+  reagiert nur auf Saison-Events der eigenen Wärmepumpe
+- Tabellengesteuert: Anforderungs-Switches pro Zeile der Entity-Tabelle
+  (descriptions.py), Gruppen per plan.entities_for aufgelöst; der
+  Master-Switch bleibt eine eigene Klasse
 
 Änderungen v0.6.0:
 - Neuer Master-Switch: Raumtemperatur-Übernahme
@@ -13,16 +24,15 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
+from .entity import IDMRegisterEntity, description_kwargs
+
 from .const import (
     DOMAIN,
-    DEFAULT_SENSOR_GROUPS,
     DEFAULT_ROOM_TEMP_ENTITIES,
-    REG_HEAT_REQUEST,
-    REG_WW_REQUEST,
-    REG_WW_ONETIME,
-    REG_COOL_REQUEST,
     get_device_info,
+    scoped_unique_id,
 )
+from .descriptions import PLATFORM_SWITCH
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,36 +40,20 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass, entry, async_add_entities):
     entry_data = hass.data[DOMAIN][entry.entry_id]
     coordinator = entry_data["coordinator"]
+    plan = entry_data["register_plan"]
     client = entry_data["client"]
     host = entry_data["host"]
-    sensor_groups = entry_data.get("sensor_groups", DEFAULT_SENSOR_GROUPS)
     room_temp_entities = entry_data.get("room_temp_entities", DEFAULT_ROOM_TEMP_ENTITIES)
     forwarder = entry_data.get("room_temp_forwarder")
 
+    # Ein Switch pro Zeile der Entity-Tabelle (Gruppen aufgelöst)
     entities = [
-        # Basis-Switches (immer)
-        IDMSwitch(coordinator, client, host,
-                  "idm_heat_request", "heat_request",
-                  REG_HEAT_REQUEST,
-                  icon_on="mdi:radiator", icon_off="mdi:radiator-off"),
-        IDMSwitch(coordinator, client, host,
-                  "idm_ww_request", "ww_request",
-                  REG_WW_REQUEST,
-                  icon_on="mdi:water-boiler", icon_off="mdi:water-boiler-off"),
-        IDMSwitch(coordinator, client, host,
-                  "idm_ww_onetime", "ww_onetime",
-                  REG_WW_ONETIME,
-                  icon_on="mdi:water-boiler", icon_off="mdi:water-boiler-off"),
-    ]
-
-    # Kühlungs-Gruppe: Anforderung Kühlen
-    if "cooling" in sensor_groups:
-        entities.append(
-            IDMSwitch(coordinator, client, host,
-                      "idm_cool_request", "cool_request",
-                      REG_COOL_REQUEST,
-                      icon_on="mdi:snowflake", icon_off="mdi:snowflake-off"),
+        IDMSwitch(
+            coordinator, client, host, entity.key, entity.translation_key,
+            entity.address, **description_kwargs(entity.description),
         )
+        for entity in plan.entities_for(PLATFORM_SWITCH)
+    ]
 
     # Raumtemperatur-Master-Switch (nur wenn Entities konfiguriert)
     if room_temp_entities and forwarder:
@@ -72,24 +66,23 @@ async def async_setup_entry(hass, entry, async_add_entities):
     async_add_entities(entities)
 
 
-class IDMSwitch(CoordinatorEntity, SwitchEntity):
+class IDMSwitch(IDMRegisterEntity, SwitchEntity):
     _attr_has_entity_name = True
 
     def __init__(self, coordinator, client, host,
                  unique_id, translation_key, register,
                  icon_on="mdi:toggle-switch", icon_off="mdi:toggle-switch-off"):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self._client = client
         self._host = host
-        self._attr_unique_id = unique_id
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, unique_id)
         self._attr_translation_key = translation_key
-        self._register = register
         self._icon_on = icon_on
         self._icon_off = icon_off
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def is_on(self):
@@ -98,11 +91,11 @@ class IDMSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         await self._client.write_uchar(self._register, 1)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_register_refresh(self._register)
 
     async def async_turn_off(self, **kwargs):
         await self._client.write_uchar(self._register, 0)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_register_refresh(self._register)
 
     @property
     def icon(self):
@@ -117,11 +110,11 @@ class IDMRoomTempMasterSwitch(CoordinatorEntity, SwitchEntity):
     """
 
     _attr_has_entity_name = True
-    _attr_unique_id = "idm_room_temp_master"
     _attr_translation_key = "room_temp_master"
 
     def __init__(self, hass, coordinator, host, forwarder):
         super().__init__(coordinator)
+        self._attr_unique_id = scoped_unique_id(coordinator.device_id, "idm_room_temp_master")
         self._hass = hass
         self._host = host
         self._forwarder = forwarder
@@ -130,7 +123,7 @@ class IDMRoomTempMasterSwitch(CoordinatorEntity, SwitchEntity):
 
     @property
     def device_info(self):
-        return get_device_info(self._host)
+        return get_device_info(self._host, self.coordinator.device_id, self.coordinator.device_name)
 
     @property
     def is_on(self):
@@ -168,6 +161,9 @@ class IDMRoomTempMasterSwitch(CoordinatorEntity, SwitchEntity):
 
         @callback
         def _handle_season_event(event):
+            # Events anderer Wärmepumpen (Kaskade) ignorieren
+            if event.data.get("entry_id") != self._forwarder.entry_id:
+                return
             self._is_on = event.data.get("active", False)
             self.async_write_ha_state()
 
@@ -0,0 +1,19 @@
+"""Gemeinsame Test-Einrichtung.
+
+Die Integration wird wie von Simulator und Benchmark ohne __init__.py
+geladen (tools/idm_simulator.load_integration), damit die reinen
+Python-Bausteine ohne Home Assistant testbar sind.
+"""
+
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from idm_simulator import load_integration  # noqa: E402
+
+load_integration()
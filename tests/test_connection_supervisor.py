@@ -0,0 +1,127 @@
+"""Circuit Breaker (ConnectionSupervisor): closed → open → half_open → closed."""
+
+import asyncio
+
+import pytest
+
+from idm_heatpump.const import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+from idm_heatpump.modbus_handler import ConnectionSupervisor, ModbusCircuitOpenError
+
+
+class _Link:
+    """Verbindungs-Attrappe: Ergebnis der Connect-Versuche vorgebbar."""
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.connected = False
+        self.attempts = 0
+        self.gate: asyncio.Event | None = None
+
+    async def connect(self) -> bool:
+        self.attempts += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        self.connected = self.results.pop(0) if self.results else False
+        return self.connected
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+
+def _supervisor(link: _Link, **kwargs) -> ConnectionSupervisor:
+    kwargs.setdefault("threshold", 2)
+    kwargs.setdefault("initial", 0.01)
+    kwargs.setdefault("maximum", 0.04)
+    kwargs.setdefault("jitter", 0.0)
+    return ConnectionSupervisor("test", link.connect, link.is_connected, **kwargs)
+
+
+async def _wait_for(predicate, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.001)
+
+
+def test_opens_at_threshold():
+    async def run():
+        supervisor = _supervisor(_Link(), initial=10)
+        supervisor.record_failure()
+        assert supervisor.state == CIRCUIT_CLOSED
+        supervisor.check()
+
+        supervisor.record_failure()
+        assert supervisor.state == CIRCUIT_OPEN
+        assert supervisor.is_open
+        with pytest.raises(ModbusCircuitOpenError):
+            supervisor.check()
+        await supervisor.async_stop()
+
+    asyncio.run(run())
+
+
+def test_success_resets_failure_count():
+    async def run():
+        supervisor = _supervisor(_Link())
+        supervisor.record_failure()
+        supervisor.record_success()
+        supervisor.record_failure()
+        assert supervisor.state == CIRCUIT_CLOSED
+        assert supervisor.diagnostics()["consecutive_failures"] == 1
+
+    asyncio.run(run())
+
+
+def test_failed_connects_count_towards_threshold():
+    async def run():
+        link = _Link([False, False])
+        supervisor = _supervisor(link, initial=10)
+        assert not await supervisor.async_connect()
+        assert not await supervisor.async_connect()
+        assert supervisor.state == CIRCUIT_OPEN
+        await supervisor.async_stop()
+
+    asyncio.run(run())
+
+
+def test_half_open_while_reconnecting_then_closed():
+    async def run():
+        link = _Link([True])
+        link.gate = asyncio.Event()
+        supervisor = _supervisor(link)
+        supervisor.record_failure()
+        supervisor.record_failure()
+
+        await _wait_for(lambda: link.attempts == 1)
+        assert supervisor.state == CIRCUIT_HALF_OPEN
+        with pytest.raises(ModbusCircuitOpenError):
+            supervisor.check()
+
+        link.gate.set()
+        await _wait_for(lambda: supervisor.state == CIRCUIT_CLOSED)
+        assert supervisor.retry_in is None
+        assert supervisor.diagnostics()["consecutive_failures"] == 0
+        supervisor.check()
+
+    asyncio.run(run())
+
+
+def test_backoff_doubles_up_to_maximum():
+    async def run():
+        link = _Link([False, False, False])
+        link.gate = asyncio.Event()
+        supervisor = _supervisor(link, initial=0.1, maximum=0.3)
+        supervisor.record_failure()
+        supervisor.record_failure()
+
+        delays = []
+        for attempt in range(1, 4):
+            await _wait_for(lambda: link.attempts == attempt)
+            link.gate.set()
+            await _wait_for(lambda: supervisor.state == CIRCUIT_OPEN)
+            link.gate.clear()
+            delays.append(supervisor.diagnostics()["backoff"])
+        await supervisor.async_stop()
+        return delays
+
+    assert asyncio.run(run()) == [0.2, 0.3, 0.3]
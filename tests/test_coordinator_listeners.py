@@ -0,0 +1,92 @@
+"""Change-only Benachrichtigung der Entities (Listener-Context = Register).
+
+Benötigt Home Assistant (pytest-homeassistant-custom-component); ohne wird
+das Modul übersprungen.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from idm_heatpump.const import DEFAULT_SENSOR_GROUPS, POLL_TIERS  # noqa: E402
+from idm_heatpump.coordinator import IDMDataUpdateCoordinator  # noqa: E402
+from idm_heatpump.register_plan import build_register_plan  # noqa: E402
+
+pytestmark = pytest.mark.asyncio
+
+
+def _coordinator(hass) -> IDMDataUpdateCoordinator:
+    plan = build_register_plan(["A"], DEFAULT_SENSOR_GROUPS)
+    return IDMDataUpdateCoordinator(
+        hass, client=None, plan=plan,
+        tier_intervals=dict.fromkeys(POLL_TIERS, 30), name="test",
+    )
+
+
+def _update(coordinator, fresh: dict) -> None:
+    coordinator.data = coordinator._merge(fresh)
+    coordinator.async_update_listeners()
+
+
+async def test_only_changed_registers_are_notified(hass):
+    coordinator = _coordinator(hass)
+    calls = []
+    removers = [
+        coordinator.async_add_listener(lambda: calls.append(1000), 1000),
+        coordinator.async_add_listener(lambda: calls.append(1002), 1002),
+        coordinator.async_add_listener(lambda: calls.append(None)),
+    ]
+
+    # Erstes Update: alle Listener
+    _update(coordinator, {1000: 1.0, 1002: 2.0})
+    assert sorted(calls, key=str) == [1000, 1002, None]
+
+    calls.clear()
+    _update(coordinator, {1000: 1.5, 1002: 2.0})
+    assert sorted(calls, key=str) == [1000, None]
+
+    calls.clear()
+    _update(coordinator, {1000: 1.5, 1002: 2.0})
+    # Listener ohne Context werden immer benachrichtigt
+    assert calls == [None]
+
+    for remove in removers:
+        remove()
+
+
+async def test_removed_listener_is_not_notified(hass):
+    coordinator = _coordinator(hass)
+    calls = []
+    remove = coordinator.async_add_listener(lambda: calls.append(1000), 1000)
+    keep = coordinator.async_add_listener(lambda: calls.append(1002), 1002)
+    _update(coordinator, {1000: 1.0, 1002: 2.0})
+
+    remove()
+    calls.clear()
+    _update(coordinator, {1000: 3.0, 1002: 4.0})
+
+    assert calls == [1002]
+    keep()
+
+
+async def test_availability_change_notifies_everyone(hass):
+    coordinator = _coordinator(hass)
+    calls = []
+    removers = [
+        coordinator.async_add_listener(lambda: calls.append(1000), 1000),
+        coordinator.async_add_listener(lambda: calls.append(1002), 1002),
+    ]
+    _update(coordinator, {1000: 1.0, 1002: 2.0})
+
+    calls.clear()
+    coordinator.last_update_success = False
+    _update(coordinator, {1000: 1.0, 1002: 2.0})
+    assert sorted(calls) == [1000, 1002]
+
+    calls.clear()
+    coordinator.last_update_success = True
+    _update(coordinator, {1000: 1.0, 1002: 2.0})
+    assert sorted(calls) == [1000, 1002]
+
+    for remove in removers:
+        remove()
@@ -0,0 +1,74 @@
+"""Poll-Metriken des Handlers gegen den Navigator-Simulator (tools/)."""
+
+import asyncio
+
+from idm_heatpump.const import DEFAULT_SENSOR_GROUPS, LATENCY_BUCKETS_MS, POLL_METRIC_KEYS
+from idm_heatpump.modbus_handler import IDMModbusHandler
+from idm_heatpump.register_plan import build_register_plan
+from idm_simulator import build_simulator
+
+
+def _poll(scenario):
+    """Startet Simulator + Handler und führt scenario(handler, register_map) aus."""
+
+    async def run():
+        simulator = build_simulator()
+        await simulator.start()
+        handler = IDMModbusHandler("127.0.0.1", simulator.port)
+        try:
+            await handler.connect()
+            register_map = dict(build_register_plan(["A"], DEFAULT_SENSOR_GROUPS).register_map)
+            return await scenario(handler, register_map, simulator)
+        finally:
+            await handler.close()
+            await simulator.stop()
+
+    return asyncio.run(run())
+
+
+def test_poll_metrics():
+    async def scenario(handler, register_map, simulator):
+        assert handler.last_poll_metrics is None
+        before = simulator.stats.requests
+        data = await handler.read_all(register_map)
+        blocks = handler.get_read_plan(register_map)
+        return data, handler.last_poll_metrics, simulator.stats.requests - before, blocks
+
+    data, metrics, requests, blocks = _poll(scenario)
+
+    assert set(POLL_METRIC_KEYS) <= set(metrics)
+    assert metrics["registers"] == len(data)
+    # Ein Request pro Block, ohne Fehler keine Wiederholungen
+    assert metrics["requests"] == requests == len(blocks)
+    assert metrics["failed_requests"] == metrics["failed_registers"] == 0
+    assert metrics["bytes"] > 0
+    assert metrics["duration_ms"] > 0
+
+
+def test_totals_and_latency_histograms():
+    async def scenario(handler, register_map, simulator):
+        await handler.read_all(register_map)
+        await handler.read_all(register_map)
+        return handler.last_poll_metrics, handler.total_metrics, handler.latency_histograms
+
+    last, total, histograms = _poll(scenario)
+
+    assert total["polls"] == 2
+    assert total["requests"] == 2 * last["requests"]
+    assert total["registers"] == 2 * last["registers"]
+    assert all(len(counts) == len(LATENCY_BUCKETS_MS) + 1 for counts in histograms.values())
+    assert all(sum(counts) == 2 for counts in histograms.values())
+
+
+def test_read_back_is_not_a_poll():
+    async def scenario(handler, register_map, simulator):
+        await handler.read_all(register_map)
+        last, total = handler.last_poll_metrics, handler.total_metrics
+        data = await handler.read_all({1000: register_map[1000]}, poll=False)
+        return data, last, total, handler.last_poll_metrics, handler.total_metrics
+
+    data, last, total, last_after, total_after = _poll(scenario)
+
+    assert set(data) == {1000}
+    assert last_after == last
+    assert total_after == total
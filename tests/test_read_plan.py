@@ -0,0 +1,114 @@
+"""Block-Plan (plan_read_blocks) und BlockDecoder."""
+
+import struct
+
+from idm_heatpump.const import (
+    REG_TYPE_FLOAT,
+    REG_TYPE_UCHAR,
+    REG_TYPE_WORD,
+)
+from idm_heatpump.modbus_handler import (
+    FC_HOLDING,
+    FC_INPUT,
+    BlockDecoder,
+    _gap_indices,
+    decode_register,
+    plan_read_blocks,
+)
+
+
+def _float_registers(value: float) -> list[int]:
+    return list(struct.unpack("<HH", struct.pack("<f", value)))
+
+
+def test_adjacent_floats_form_one_block_with_fallback():
+    blocks = plan_read_blocks({1000: REG_TYPE_FLOAT, 1002: REG_TYPE_FLOAT, 1004: REG_TYPE_FLOAT})
+
+    assert len(blocks) == 1
+    block = blocks[0]
+    assert (block.function, block.start, block.count) == (FC_INPUT, 1000, 6)
+    assert block.fallback == FC_HOLDING
+
+
+def test_mixed_types_split_by_function_code():
+    blocks = plan_read_blocks({1000: REG_TYPE_FLOAT, 1005: REG_TYPE_UCHAR, 1006: REG_TYPE_WORD})
+
+    assert [(b.function, b.start, b.count) for b in blocks] == [
+        (FC_INPUT, 1000, 2),
+        (FC_HOLDING, 1005, 2),
+    ]
+    # UCHAR/WORD-Blöcke haben keinen Fallback
+    assert blocks[1].fallback is None
+
+
+def test_learned_function_codes_are_used():
+    blocks = plan_read_blocks(
+        {1000: REG_TYPE_FLOAT, 1002: REG_TYPE_FLOAT},
+        function_codes={1002: FC_HOLDING},
+    )
+
+    assert [(b.function, b.start) for b in blocks] == [(FC_INPUT, 1000), (FC_HOLDING, 1002)]
+
+
+def test_max_gap_splits_blocks():
+    register_map = {1000: REG_TYPE_FLOAT, 1010: REG_TYPE_FLOAT, 1030: REG_TYPE_FLOAT}
+
+    blocks = plan_read_blocks(register_map, max_gap=8)
+
+    assert [(b.start, b.count) for b in blocks] == [(1000, 12), (1030, 2)]
+    assert _gap_indices(blocks[0].registers) == [1]
+
+
+def test_max_count_splits_blocks():
+    register_map = {address: REG_TYPE_FLOAT for address in range(1000, 1020, 2)}
+
+    blocks = plan_read_blocks(register_map, max_count=8)
+
+    assert [(b.start, b.count) for b in blocks] == [(1000, 8), (1008, 8), (1016, 4)]
+
+
+def test_block_breaks_start_a_new_block_only_after_a_gap():
+    register_map = {1000: REG_TYPE_FLOAT, 1002: REG_TYPE_FLOAT, 1006: REG_TYPE_FLOAT}
+
+    blocks = plan_read_blocks(register_map, block_breaks={1002, 1006})
+
+    # 1002 grenzt direkt an, nur vor 1006 liegt eine (gelernte) Lücke
+    assert [(b.start, b.count) for b in blocks] == [(1000, 4), (1006, 2)]
+
+
+def test_unknown_register_types_are_skipped():
+    assert plan_read_blocks({1000: "unknown"}) == []
+
+
+def test_decoder_matches_decode_register():
+    registers = ((1000, REG_TYPE_FLOAT), (1004, REG_TYPE_UCHAR), (1005, REG_TYPE_WORD))
+    raw = _float_registers(21.5) + [0xFFFF, 0xFFFF, 0x1203, 4711]
+
+    decoded = BlockDecoder(1000, 6, registers).decode(raw)
+
+    assert decoded == {1000: 21.5, 1004: 0x03, 1005: 4711}
+    for address, reg_type in registers:
+        assert decoded[address] == decode_register(reg_type, raw, address - 1000)
+
+
+def test_decoder_rounds_floats_and_handles_overlaps():
+    # UCHAR liegt im Low-Word des FLOATs (wird einzeln dekodiert)
+    registers = ((1000, REG_TYPE_FLOAT), (1001, REG_TYPE_UCHAR))
+    raw = _float_registers(1.23456)
+
+    decoded = BlockDecoder(1000, 2, registers).decode(raw)
+
+    assert decoded[1000] == 1.23
+    assert decoded[1001] == raw[1] & 0xFF
+
+
+def test_decoder_ignores_surplus_registers():
+    decoder = BlockDecoder(1000, 1, ((1000, REG_TYPE_WORD),))
+
+    assert decoder.decode([7, 8, 9]) == {1000: 7}
+
+
+def test_planned_blocks_carry_a_decoder():
+    blocks = plan_read_blocks({1000: REG_TYPE_FLOAT, 1004: REG_TYPE_FLOAT})
+
+    assert blocks[0].decoder.addresses == (1000, 1004)
@@ -0,0 +1,191 @@
+"""Register-Plan aus der Entity-Tabelle und Hardware-Erkennung.
+
+fixtures/register_tables_legacy.json enthält die früheren Tabellen aus
+const.py (BASE_REGISTERS, GROUP_REGISTERS, HC-Register, REGISTER_TIERS,
+AUTO_DETECT_*); der Plan muss daraus dieselbe Register-Map ergeben.
+"""
+
+import itertools
+import json
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from idm_heatpump.const import (
+    ALL_HEATING_CIRCUITS,
+    ALL_SENSOR_GROUPS,
+    DEFAULT_SENSOR_GROUPS,
+    DISCOVERY_GROUP_REGISTERS,
+    INVALID_FLOAT,
+    INVALID_UCHAR,
+    REG_TYPE_FLOAT,
+    TIER_FAST,
+    TIER_SLOW,
+    hc_reg,
+)
+from idm_heatpump.register_plan import (
+    build_discovery_register_map,
+    build_register_plan,
+    detect_hardware,
+)
+
+LEGACY = json.loads((FIXTURES_DIR / "register_tables_legacy.json").read_text())
+
+GROUP_COMBINATIONS = [
+    list(groups)
+    for size in range(len(ALL_SENSOR_GROUPS) + 1)
+    for groups in itertools.combinations(ALL_SENSOR_GROUPS, size)
+]
+
+
+def _legacy_registers(heating_circuits, sensor_groups) -> dict[int, tuple[str, str]]:
+    """{adresse: (typ, stufe)} wie früher build_register_map/build_register_tiers."""
+    registers = {int(a): tuple(entry) for a, entry in LEGACY["base"].items()}
+    for group in sensor_groups:
+        registers.update(
+            (int(a), tuple(entry)) for a, entry in LEGACY["groups"].get(group, {}).items()
+        )
+    for hc in heating_circuits:
+        for address, reg_type, tier, group in LEGACY["heating_circuits"][hc].values():
+            if group is None or group in sensor_groups:
+                registers[address] = (reg_type, tier)
+    return registers
+
+
+@pytest.mark.parametrize("heating_circuits", [["A"], ["A", "C"], ALL_HEATING_CIRCUITS])
+@pytest.mark.parametrize("sensor_groups", GROUP_COMBINATIONS, ids=lambda g: "+".join(g) or "none")
+def test_plan_matches_legacy_tables(heating_circuits, sensor_groups):
+    plan = build_register_plan(heating_circuits, sensor_groups)
+    expected = _legacy_registers(heating_circuits, sensor_groups)
+
+    assert dict(plan.register_map) == {a: entry[0] for a, entry in expected.items()}
+    assert dict(plan.tiers) == {a: entry[1] for a, entry in expected.items()}
+
+    auto_detect = set(LEGACY["auto_detect"]) | {
+        hc_reg(hc, name) for hc in heating_circuits for name in LEGACY["auto_detect_hc"]
+    }
+    assert plan.auto_detect == auto_detect & set(plan.register_map)
+
+
+def test_all_groups_by_default():
+    plan = build_register_plan(["A"])
+
+    assert plan.sensor_groups == tuple(ALL_SENSOR_GROUPS)
+    assert dict(plan.register_map) == {
+        a: entry[0] for a, entry in _legacy_registers(["A"], ALL_SENSOR_GROUPS).items()
+    }
+
+
+def test_tier_maps_partition_the_register_map():
+    plan = build_register_plan(ALL_HEATING_CIRCUITS, ALL_SENSOR_GROUPS)
+
+    merged = {}
+    for tier, registers in plan.tier_maps.items():
+        assert all(plan.tiers[address] == tier for address in registers)
+        merged.update(registers)
+    assert merged == dict(plan.register_map)
+
+
+def test_tier_overrides():
+    vl = hc_reg("A", "vl")
+    overrides = {"1000": TIER_SLOW, str(vl): TIER_SLOW, 1002: TIER_FAST,
+                 "99999": TIER_FAST, "x": TIER_FAST, "1004": "unknown"}
+
+    plan = build_register_plan(["A"], DEFAULT_SENSOR_GROUPS, overrides)
+    default = build_register_plan(["A"], DEFAULT_SENSOR_GROUPS)
+
+    assert plan.tiers[1000] == TIER_SLOW
+    assert plan.tiers[vl] == TIER_SLOW
+    assert plan.tiers[1002] == TIER_FAST
+    assert 1000 in plan.tier_maps[TIER_SLOW]
+    # Unbekannte Adressen/Stufen werden ignoriert
+    assert 99999 not in plan
+    assert plan.tiers[1004] == default.tiers[1004]
+    assert dict(plan.register_map) == dict(default.register_map)
+
+
+def test_owners_and_unique_ids():
+    plan = build_register_plan(["A"], DEFAULT_SENSOR_GROUPS)
+
+    assert len(plan.owners) == len(plan)
+    assert plan.unique_ids == {entity.key for entity in plan.entities}
+    owners = plan.diagnostics()["owners"]
+    assert set(owners) == {str(address) for address in plan.register_map}
+    assert all(key in plan.unique_ids for keys in owners.values() for key in keys)
+
+
+def test_plan_is_immutable():
+    plan = build_register_plan(["A"])
+
+    with pytest.raises(AttributeError):
+        plan.tiers = {}
+    with pytest.raises(TypeError):
+        plan.register_map[1000] = REG_TYPE_FLOAT
+
+
+# -------------------------------------------------------------------
+# Hardware-Erkennung
+# -------------------------------------------------------------------
+
+def _scan(valid_circuits=(), valid_addresses=()) -> dict:
+    """Scan-Ergebnis: alles ungültig außer den angegebenen HK/Adressen."""
+    register_map = build_discovery_register_map()
+    values = {
+        address: INVALID_FLOAT if reg_type == REG_TYPE_FLOAT else INVALID_UCHAR
+        for address, reg_type in register_map.items()
+    }
+    for hc in valid_circuits:
+        values[hc_reg(hc, "vl")] = 35.0
+        values[hc_reg(hc, "active_mode")] = 1
+    for address in valid_addresses:
+        values[address] = 1
+    return values
+
+
+def test_discovery_map_covers_all_circuits():
+    register_map = build_discovery_register_map()
+
+    for hc in ALL_HEATING_CIRCUITS:
+        assert hc_reg(hc, "vl") in register_map
+        assert hc_reg(hc, "active_mode") in register_map
+        assert hc_reg(hc, "room_temp") in register_map
+
+
+def test_detect_nothing_installed():
+    circuits, groups = detect_hardware(_scan())
+
+    assert circuits == []
+    # Nicht erkennbare Gruppen behalten ihre Vorauswahl
+    assert groups == [
+        group for group in ALL_SENSOR_GROUPS
+        if group in DEFAULT_SENSOR_GROUPS and group not in DISCOVERY_GROUP_REGISTERS
+    ]
+
+
+def test_detect_circuits_and_groups():
+    collector = DISCOVERY_GROUP_REGISTERS["solar"][0]
+
+    circuits, groups = detect_hardware(_scan(["A", "C"], [collector]))
+
+    assert circuits == ["A", "C"]
+    assert "solar" in groups
+    assert "pv_battery" not in groups
+
+
+def test_circuit_needs_all_identification_registers():
+    values = _scan(["A"])
+    values[hc_reg("A", "active_mode")] = INVALID_UCHAR
+
+    assert detect_hardware(values)[0] == []
+
+
+def test_room_sensor_of_a_detected_circuit_counts_for_room_control():
+    room = hc_reg("B", "room_temp")
+
+    assert "room_control" in detect_hardware(_scan(["B"], [room]))[1]
+    # Raumfühler eines nicht verbauten Heizkreises zählt nicht
+    assert "room_control" not in detect_hardware(_scan(["A"], [room]))[1]
+
+
+def test_missing_values_are_invalid():
+    assert detect_hardware({}) == detect_hardware(_scan())
@@ -0,0 +1,126 @@
+"""EEPROM-Schreibbudget (WriteBudget): Token-Bucket, Tag/Woche, Persistenz."""
+
+import time
+from datetime import date, timedelta
+
+from idm_heatpump.modbus_handler import WriteBudget
+
+DAY = 86400
+
+
+def _week(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def test_burst_then_reject():
+    budget = WriteBudget(daily_budget=100, burst=3)
+    now = time.time()
+
+    assert [budget.allow(1650, now) for _ in range(4)] == [True, True, True, False]
+    assert budget.rejected_counts == {1650: 1}
+    # Buckets sind pro Register
+    assert budget.allow(1652, now)
+
+
+def test_burst_is_capped_by_daily_budget():
+    budget = WriteBudget(daily_budget=2, burst=20)
+    now = time.time()
+
+    assert [budget.allow(1650, now) for _ in range(3)] == [True, True, False]
+
+
+def test_refill_over_time():
+    budget = WriteBudget(daily_budget=24, burst=2)
+    now = time.time()
+    budget.allow(1650, now)
+    budget.allow(1650, now)
+
+    assert not budget.allow(1650, now + 1800)
+    # 24 Tokens pro Tag = eines pro Stunde
+    assert budget.allow(1650, now + 3600)
+    assert not budget.allow(1650, now + 3600)
+
+
+def test_refill_never_exceeds_burst():
+    budget = WriteBudget(daily_budget=100, burst=2)
+    now = time.time()
+    budget.allow(1650, now)
+
+    later = now + 10 * DAY
+    assert [budget.allow(1650, later) for _ in range(3)] == [True, True, False]
+
+
+def test_refund_returns_the_token():
+    budget = WriteBudget(daily_budget=100, burst=1)
+    now = time.time()
+
+    assert budget.allow(1650, now)
+    budget.refund([1650])
+    assert budget.allow(1650, now)
+    assert not budget.allow(1650, now)
+
+
+def test_unlimited_budget():
+    budget = WriteBudget(daily_budget=0)
+    now = time.time()
+
+    assert all(budget.allow(1650, now) for _ in range(100))
+
+
+def test_record_counts_day_and_week():
+    budget = WriteBudget()
+    budget.record([1650, 1652])
+    budget.record([1650])
+
+    assert budget.daily_counts == {1650: 2, 1652: 1}
+    assert budget.weekly_counts == {1650: 2, 1652: 1}
+    assert budget.changed
+
+
+def test_day_rollover_keeps_week():
+    today = date.today()
+    budget = WriteBudget()
+    budget.load({
+        "day": (today - timedelta(days=1)).isoformat(),
+        "week": _week(today),
+        "daily": {"1650": 5},
+        "weekly": {"1650": 7},
+        "rejected": {"1650": 1},
+    })
+
+    assert budget.daily_counts == {}
+    assert budget.rejected_counts == {}
+    assert budget.weekly_counts == {1650: 7}
+
+
+def test_week_rollover():
+    budget = WriteBudget()
+    budget.record([1650], time.time() - 8 * DAY)
+
+    assert budget.daily_counts == {}
+    assert budget.weekly_counts == {}
+
+
+def test_as_dict_load_round_trip():
+    now = time.time()
+    budget = WriteBudget(daily_budget=100, burst=3)
+    budget.allow(1650, now)
+    budget.record([1650], now)
+    for _ in range(4):
+        budget.allow(1652, now)
+
+    stored = budget.as_dict()
+    assert not budget.changed
+    assert set(stored["daily"]) == {"1650"}
+
+    restored = WriteBudget(daily_budget=100, burst=3)
+    restored.load(stored)
+
+    assert not restored.changed
+    assert restored.as_dict() == stored
+    assert restored.daily_counts == {1650: 1}
+    assert restored.rejected_counts == {1652: 1}
+    # Bucket-Stand bleibt erhalten: 1652 ist weiterhin leer
+    assert not restored.allow(1652, now)
+    assert restored.allow(1650, now)
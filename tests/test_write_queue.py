@@ -0,0 +1,77 @@
+"""Write-Queue: merge_writes() und Zusammenfassen im Sammelfenster."""
+
+import asyncio
+
+from idm_heatpump.modbus_handler import IDMModbusHandler, merge_writes
+
+
+def test_adjacent_registers_share_one_request():
+    blocks = merge_writes({1650: [1, 2], 1652: [3, 4]})
+
+    assert blocks == [(1650, [1, 2, 3, 4], [1650, 1652])]
+
+
+def test_gaps_are_not_bridged():
+    blocks = merge_writes({1652: [3, 4], 1656: [5, 6], 1000: [7]})
+
+    assert blocks == [
+        (1000, [7], [1000]),
+        (1652, [3, 4], [1652]),
+        (1656, [5, 6], [1656]),
+    ]
+
+
+def test_max_count_starts_a_new_request():
+    blocks = merge_writes({1650: [1, 2], 1652: [3, 4], 1654: [5, 6]}, max_count=4)
+
+    assert blocks == [(1650, [1, 2, 3, 4], [1650, 1652]), (1654, [5, 6], [1654])]
+
+
+def test_empty_queue():
+    assert merge_writes({}) == []
+
+
+def _handler(written: list) -> IDMModbusHandler:
+    """Handler ohne Verbindung: _write_block protokolliert nur."""
+    handler = IDMModbusHandler("127.0.0.1", 502, 1)
+
+    async def write_block(start, values):
+        written.append((start, values))
+
+    handler._write_block = write_block
+    return handler
+
+
+def test_concurrent_writes_are_coalesced():
+    written = []
+
+    async def run():
+        handler = _handler(written)
+        await asyncio.gather(
+            handler.write_word(1700, 1),
+            handler.write_word(1700, 2),
+            handler.write_word(1701, 3),
+        )
+        return handler.write_stats
+
+    stats = asyncio.run(run())
+
+    assert written == [(1700, [2, 3])]
+    assert (stats["queued"], stats["coalesced"]) == (3, 1)
+
+
+def test_writes_within_window_are_coalesced_without_running_flush():
+    written = []
+
+    async def run():
+        handler = _handler(written)
+
+        async def later(delay, value):
+            await asyncio.sleep(delay)
+            await handler.write_word(1700, value)
+
+        await asyncio.gather(*(later(i * 0.01, i) for i in range(4)))
+
+    asyncio.run(run())
+
+    assert written == [(1700, [3])]
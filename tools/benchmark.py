@@ -0,0 +1,243 @@
+"""
+iDM Wärmepumpe (Modbus TCP) – Poll-Benchmark
+Version: v0.8.0
+Stand: 2026-10-18
+
+End-to-End-Benchmark des I/O-Pfads: IDMModbusHandler.read_all() gegen den
+lokalen Navigator-Simulator (tools/idm_simulator.py).
+
+Szenarien:
+- minimal: Standard-Heizkreise/-Gruppen aus const.py
+- full:    alle Heizkreise und alle Sensor-Gruppen
+Pro Szenario wird der volle Poll sowie die Polling-Stufen (fast,
+fast+normal) gemessen.
+
+Ausgabe pro Messung: Poll-Dauer (p50/p95), Requests pro Poll,
+Request-Latenz (p50/p95), Fehler. Mit --save/--baseline lassen sich
+Regressionen erkennen (Exit-Code 1).
+
+Benötigt pymodbus (wie die Integration), aber kein Home Assistant:
+    python tools/benchmark.py --polls 20 --latency 20 --jitter 5
+    python tools/benchmark.py --pipeline-depth 4 --latency 20
+    python tools/benchmark.py --save bench.json
+    python tools/benchmark.py --baseline bench.json --tolerance 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+
+from idm_simulator import FLOAT_MODES, build_simulator, load_integration
+
+const = load_integration()
+
+from pymodbus.client import AsyncModbusTcpClient  # noqa: E402
+
+from idm_heatpump.modbus_handler import IDMModbusHandler, ModbusConnection  # noqa: E402
+from idm_heatpump.register_plan import build_register_plan  # noqa: E402
+
+SCENARIOS = {
+    "minimal": (const.DEFAULT_HEATING_CIRCUITS, const.DEFAULT_SENSOR_GROUPS),
+    "full": (const.ALL_HEATING_CIRCUITS, const.ALL_SENSOR_GROUPS),
+}
+
+# Polling-Stufen, die pro Tick gemeinsam gelesen werden
+TICK_MIXES = {
+    "all": tuple(const.POLL_TIERS),
+    "fast": (const.TIER_FAST,),
+    "fast+normal": (const.TIER_FAST, const.TIER_NORMAL),
+}
+
+
+class TimedModbusHandler(IDMModbusHandler):
+    """IDMModbusHandler mit Zeitmessung pro Request und kurzem Timeout."""
+
+    def __init__(self, host, port, timeout, pipeline_depth):
+        # Kurzer Timeout ohne Retries, damit verlorene Antworten messbar bleiben
+        connection = ModbusConnection(
+            host, port,
+            client_factory=lambda: AsyncModbusTcpClient(host, port=port, timeout=timeout, retries=0),
+        )
+        super().__init__(host, port, connection=connection, pipeline_depth=pipeline_depth)
+        self.latencies: list[float] = []
+        self.failures = 0
+
+    async def _request(self, function, address, count):
+        start = time.perf_counter()
+        try:
+            registers = await super()._request(function, address, count)
+        except Exception:
+            self.failures += 1
+            raise
+        self.latencies.append(time.perf_counter() - start)
+        if registers is None:
+            self.failures += 1
+        return registers
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Perzentil (nächster Rang); 0.0 bei leerer Liste."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def _tier_map(register_map, register_tiers, tiers) -> dict[int, str]:
+    return {
+        address: reg_type
+        for address, reg_type in register_map.items()
+        if register_tiers.get(address, const.TIER_NORMAL) in tiers
+    }
+
+
+async def _measure(simulator, client, register_map, polls) -> dict:
+    """Führt polls x read_all() aus und wertet Simulator + Client aus."""
+    durations = []
+    requests = []
+    client.latencies.clear()
+    client.failures = 0
+    for _ in range(polls):
+        before = simulator.stats.requests
+        start = time.perf_counter()
+        await client.read_all(register_map)
+        durations.append(time.perf_counter() - start)
+        requests.append(simulator.stats.requests - before)
+    return {
+        "registers": len(register_map),
+        "blocks": len(client.get_read_plan(register_map)),
+        "requests_per_poll": statistics.mean(requests),
+        "poll_p50_ms": percentile(durations, 50) * 1000,
+        "poll_p95_ms": percentile(durations, 95) * 1000,
+        "request_p50_ms": percentile(client.latencies, 50) * 1000,
+        "request_p95_ms": percentile(client.latencies, 95) * 1000,
+        "failures": client.failures,
+    }
+
+
+async def run_scenario(name: str, args) -> dict[str, dict]:
+    heating_circuits, sensor_groups = SCENARIOS[name]
+    plan = build_register_plan(heating_circuits, sensor_groups)
+    register_map = dict(plan.register_map)
+    register_tiers = plan.tiers
+
+    simulator = build_simulator(
+        float_mode=args.float_mode,
+        strict_gaps=args.strict_gaps,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        drop_rate=args.drop,
+        concurrent=args.concurrent,
+        seed=args.seed,
+    )
+    await simulator.start()
+    client = TimedModbusHandler(
+        "127.0.0.1", simulator.port, args.timeout, args.pipeline_depth,
+    )
+    try:
+        await client.connect()
+        # Aufwärm-Poll: Funktionscodes lernen (wie der erste Poll nach dem Start)
+        first = await _measure(simulator, client, register_map, 1)
+        results = {"first_poll": first}
+        for mix, tiers in TICK_MIXES.items():
+            tier_map = _tier_map(register_map, register_tiers, tiers)
+            if tier_map:
+                results[mix] = await _measure(simulator, client, tier_map, args.polls)
+        return results
+    finally:
+        await client.close()
+        await simulator.stop()
+
+
+def print_results(all_results: dict[str, dict[str, dict]]) -> None:
+    header = (
+        f"{'Szenario':<10} {'Stufen':<12} {'Reg':>4} {'Blöcke':>6} {'Req/Poll':>8} "
+        f"{'Poll p50':>9} {'Poll p95':>9} {'Req p50':>8} {'Req p95':>8} {'Fehler':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for scenario, results in all_results.items():
+        for mix, r in results.items():
+            print(
+                f"{scenario:<10} {mix:<12} {r['registers']:>4} {r['blocks']:>6} "
+                f"{r['requests_per_poll']:>8.1f} {r['poll_p50_ms']:>7.1f}ms {r['poll_p95_ms']:>7.1f}ms "
+                f"{r['request_p50_ms']:>6.1f}ms {r['request_p95_ms']:>6.1f}ms {r['failures']:>6}"
+            )
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Vergleicht mit einer gespeicherten Messung.
+
+    Requests pro Poll sind deterministisch und dürfen nicht steigen; die
+    Poll-Dauer (p95) darf um höchstens tolerance Prozent steigen.
+    """
+    regressions = []
+    for scenario, results in current.items():
+        for mix, r in results.items():
+            base = baseline.get(scenario, {}).get(mix)
+            if base is None:
+                continue
+            if r["requests_per_poll"] > base["requests_per_poll"]:
+                regressions.append(
+                    f"{scenario}/{mix}: Requests pro Poll "
+                    f"{base['requests_per_poll']:.1f} → {r['requests_per_poll']:.1f}"
+                )
+            limit = base["poll_p95_ms"] * (1 + tolerance / 100)
+            if r["poll_p95_ms"] > limit:
+                regressions.append(
+                    f"{scenario}/{mix}: Poll p95 "
+                    f"{base['poll_p95_ms']:.1f}ms → {r['poll_p95_ms']:.1f}ms (> {tolerance:.0f}%)"
+                )
+    return regressions
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="iDM Poll-Benchmark gegen den Navigator-Simulator")
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20.0, help="Simulator-Latenz in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Simulator-Jitter (±) in ms")
+    parser.add_argument("--drop", type=float, default=0.0, help="Anteil verlorener Antworten (0..1)")
+    parser.add_argument("--float-mode", choices=FLOAT_MODES, default="both")
+    parser.add_argument("--strict-gaps", action="store_true")
+    parser.add_argument("--concurrent", action="store_true")
+    parser.add_argument("--pipeline-depth", type=int, default=const.DEFAULT_PIPELINE_DEPTH,
+                        help="TCP-Verbindungen für parallele Block-Reads (1 = seriell)")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Client-Timeout in s")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="Ergebnis als JSON speichern")
+    parser.add_argument("--baseline", help="Mit gespeichertem JSON vergleichen")
+    parser.add_argument("--tolerance", type=float, default=20.0,
+                        help="Erlaubter Anstieg der Poll-Dauer p95 in Prozent")
+    return parser.parse_args(argv)
+
+
+async def _main(args) -> int:
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    all_results = {name: await run_scenario(name, args) for name in scenarios}
+    print_results(all_results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(all_results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, all_results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("pymodbus").setLevel(logging.CRITICAL)
+    sys.exit(asyncio.run(_main(_parse_args())))
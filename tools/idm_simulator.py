@@ -0,0 +1,375 @@
+"""
+iDM Wärmepumpe (Modbus TCP) – Navigator-10-Simulator
+Version: v0.8.0
+Stand: 2026-10-18
+
+Lokaler Modbus-TCP-Server mit dem Register-Layout der Integration
+(Register-Plan mit allen Heizkreisen und Sensor-Gruppen). Nur für
+Entwicklung und Benchmarks, wird nicht mit der Integration ausgeliefert.
+
+Simuliert:
+- FLOAT (2 Register, Low-Word zuerst), UCHAR und WORD wie der Navigator
+- Latenz + Jitter pro Request
+- Verlorene Antworten (Request wird gelesen, aber nicht beantwortet)
+- Input/Holding-Unterschiede für FLOAT-Register (--float-mode)
+- Nicht verbaute Fühler (-1.0) und nicht lesbare Lücken (--strict-gaps)
+- Mehrere Unit IDs mit eigenem Register-Abbild
+- Raumtemperatur-Schreibregister (1650+i*2) für Write-Tests
+
+Nur Standardbibliothek (asyncio), keine Abhängigkeit von pymodbus.
+
+Start:
+    python tools/idm_simulator.py --port 5020 --latency 20 --jitter 5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import struct
+import sys
+import types
+from pathlib import Path
+
+_LOGGER = logging.getLogger("idm_simulator")
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "idm_heatpump"
+
+
+def load_integration():
+    """Importiert das Integrations-Paket ohne dessen __init__.py.
+
+    __init__.py benötigt Home Assistant; Simulator und Benchmark brauchen nur
+    const, register_plan und modbus_handler.
+    """
+    if "idm_heatpump" not in sys.modules:
+        package = types.ModuleType("idm_heatpump")
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["idm_heatpump"] = package
+    from idm_heatpump import const
+
+    return const
+
+
+const = load_integration()
+
+from idm_heatpump.register_plan import build_register_plan  # noqa: E402
+
+FC_READ_HOLDING = 0x03
+FC_READ_INPUT = 0x04
+FC_WRITE_SINGLE = 0x06
+FC_WRITE_MULTIPLE = 0x10
+
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_ADDRESS = 0x02
+EXC_ILLEGAL_VALUE = 0x03
+EXC_GATEWAY_TARGET = 0x0B
+
+# --float-mode: über welche Funktionscodes FLOAT-Register lesbar sind
+FLOAT_MODES = ["both", "input", "holding", "mixed"]
+
+
+def float_to_registers(value: float) -> tuple[int, int]:
+    """FLOAT → (Low-Word, High-Word) wie vom Navigator geliefert."""
+    return struct.unpack("<HH", struct.pack("<f", float(value)))
+
+
+def _initial_value(address: int, reg_type: str):
+    """Deterministischer Startwert pro Register."""
+    if reg_type == const.REG_TYPE_FLOAT:
+        return round(15.0 + (address % 37) * 0.75, 2)
+    if reg_type == const.REG_TYPE_UCHAR:
+        return address % 3
+    return address % 100
+
+
+class NavigatorUnit:
+    """Register-Abbild einer Unit ID."""
+
+    def __init__(
+        self,
+        register_map: dict[int, str],
+        float_mode: str = "both",
+        missing: set[int] | None = None,
+        strict_gaps: bool = False,
+    ):
+        self.register_map = dict(register_map)
+        self.float_mode = float_mode
+        self.strict_gaps = strict_gaps
+        self.registers: dict[int, int] = {}
+        # Adresse → (Startadresse, Typ) für jedes belegte 16-bit-Register
+        self._owner: dict[int, tuple[int, str]] = {}
+
+        for address, reg_type in self.register_map.items():
+            for offset in range(const.REG_TYPE_SIZES.get(reg_type, 1)):
+                self._owner[address + offset] = (address, reg_type)
+            if reg_type == const.REG_TYPE_FLOAT:
+                value = const.INVALID_FLOAT if missing and address in missing else _initial_value(address, reg_type)
+                self.set_float(address, value)
+            else:
+                self.registers[address] = _initial_value(address, reg_type)
+
+    def set_float(self, address: int, value: float) -> None:
+        self.registers[address], self.registers[address + 1] = float_to_registers(value)
+
+    def set_word(self, address: int, value: int) -> None:
+        self.registers[address] = int(value) & 0xFFFF
+
+    def _float_functions(self, address: int) -> tuple[int, ...]:
+        if self.float_mode == "input":
+            return (FC_READ_INPUT,)
+        if self.float_mode == "holding":
+            return (FC_READ_HOLDING,)
+        if self.float_mode == "mixed":
+            # Jeder dritte FLOAT nur als Holding, der Rest nur als Input
+            return (FC_READ_HOLDING,) if (address // 2) % 3 == 0 else (FC_READ_INPUT,)
+        return (FC_READ_INPUT, FC_READ_HOLDING)
+
+    def read(self, function: int, start: int, count: int) -> list[int] | int:
+        """Liest count Register oder liefert einen Exception-Code."""
+        values = []
+        for address in range(start, start + count):
+            owner = self._owner.get(address)
+            if owner is None:
+                if self.strict_gaps:
+                    return EXC_ILLEGAL_ADDRESS
+                values.append(0)
+                continue
+            owner_address, reg_type = owner
+            if reg_type == const.REG_TYPE_FLOAT:
+                if function not in self._float_functions(owner_address):
+                    return EXC_ILLEGAL_ADDRESS
+            elif function != FC_READ_HOLDING and self.float_mode != "both":
+                return EXC_ILLEGAL_ADDRESS
+            values.append(self.registers.get(address, 0))
+        return values
+
+    def write(self, start: int, values: list[int]) -> int | None:
+        """Schreibt Register. None bei Erfolg, sonst Exception-Code."""
+        for offset, value in enumerate(values):
+            address = start + offset
+            if address not in self._owner:
+                return EXC_ILLEGAL_ADDRESS
+            self.registers[address] = value & 0xFFFF
+        return None
+
+
+class SimulatorStats:
+    """Zähler des Simulators (für den Benchmark)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.reads = 0
+        self.writes = 0
+        self.registers_read = 0
+        self.exceptions = 0
+        self.dropped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.connections = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+class NavigatorSimulator:
+    """Asynchroner Modbus-TCP-Server (MBAP) für ein oder mehrere Units."""
+
+    def __init__(
+        self,
+        units: dict[int, NavigatorUnit],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        concurrent: bool = False,
+        seed: int | None = None,
+    ):
+        self.units = units
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.concurrent = concurrent
+        self.stats = SimulatorStats()
+        self._random = random.Random(seed)
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        _LOGGER.info("iDM Simulator lauscht auf %s:%s (Units %s)", host, self.port, sorted(self.units))
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Offene Verbindungen schließen und Handler sauber auslaufen lassen
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader, writer) -> None:
+        self.stats.connections += 1
+        self._connections[writer] = asyncio.current_task()
+        lock = None if self.concurrent else asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                transaction, protocol, length, unit_id = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                self.stats.bytes_in += 7 + len(pdu)
+                task = asyncio.create_task(
+                    self._answer(writer, lock, transaction, protocol, unit_id, pdu)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _answer(self, writer, lock, transaction, protocol, unit_id, pdu) -> None:
+        # Der Navigator arbeitet Requests nacheinander ab (ohne --concurrent)
+        if lock is not None:
+            async with lock:
+                response = await self._process(unit_id, pdu)
+        else:
+            response = await self._process(unit_id, pdu)
+        if response is None or writer.is_closing():
+            return
+        frame = struct.pack(">HHHB", transaction, protocol, len(response) + 1, unit_id) + response
+        self.stats.bytes_out += len(frame)
+        writer.write(frame)
+        await writer.drain()
+
+    async def _process(self, unit_id: int, pdu: bytes) -> bytes | None:
+        self.stats.requests += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            self.stats.dropped += 1
+            return None
+
+        function = pdu[0]
+        unit = self.units.get(unit_id)
+        if unit is None:
+            return self._exception(function, EXC_GATEWAY_TARGET)
+
+        if function in (FC_READ_HOLDING, FC_READ_INPUT):
+            start, count = struct.unpack(">HH", pdu[1:5])
+            if not 1 <= count <= const.MODBUS_MAX_READ_REGISTERS:
+                return self._exception(function, EXC_ILLEGAL_VALUE)
+            self.stats.reads += 1
+            result = unit.read(function, start, count)
+            if isinstance(result, int):
+                return self._exception(function, result)
+            self.stats.registers_read += count
+            return struct.pack(f">BB{count}H", function, count * 2, *result)
+
+        if function == FC_WRITE_SINGLE:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            self.stats.writes += 1
+            error = unit.write(address, [value])
+            return self._exception(function, error) if error else pdu[:5]
+
+        if function == FC_WRITE_MULTIPLE:
+            start, count, _ = struct.unpack(">HHB", pdu[1:6])
+            values = list(struct.unpack(f">{count}H", pdu[6:6 + count * 2]))
+            self.stats.writes += 1
+            error = unit.write(start, values)
+            return self._exception(function, error) if error else pdu[:5]
+
+        return self._exception(function, EXC_ILLEGAL_FUNCTION)
+
+    def _exception(self, function: int, code: int) -> bytes:
+        self.stats.exceptions += 1
+        return struct.pack(">BB", function | 0x80, code)
+
+
+def full_register_map() -> dict[int, str]:
+    """Komplettes Register-Layout (alle Heizkreise, alle Gruppen).
+
+    Enthält zusätzlich die Raumtemperatur-Schreibregister (1650+i*2), die nicht
+    gepollt, aber vom RoomTempForwarder beschrieben werden.
+    """
+    register_map = dict(
+        build_register_plan(const.ALL_HEATING_CIRCUITS, const.ALL_SENSOR_GROUPS).register_map
+    )
+    for hc in const.ALL_HEATING_CIRCUITS:
+        register_map[const.hc_room_temp_write_reg(hc)] = const.REG_TYPE_FLOAT
+    return register_map
+
+
+def build_simulator(
+    unit_ids=(const.DEFAULT_UNIT_ID,),
+    float_mode: str = "both",
+    missing: set[int] | None = None,
+    strict_gaps: bool = False,
+    **kwargs,
+) -> NavigatorSimulator:
+    """Simulator mit vollem Register-Layout für jede Unit ID."""
+    register_map = full_register_map()
+    units = {
+        unit_id: NavigatorUnit(register_map, float_mode, missing, strict_gaps)
+        for unit_id in unit_ids
+    }
+    return NavigatorSimulator(units, **kwargs)
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="iDM Navigator 10 Modbus-TCP-Simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--unit-id", type=int, action="append", dest="unit_ids",
+                        help="Unit ID (mehrfach möglich, Standard: 1)")
+    parser.add_argument("--latency", type=float, default=20.0, help="Latenz pro Request in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Jitter (±) in ms")
+    parser.add_argument("--drop", type=float, default=0.0, help="Anteil verlorener Antworten (0..1)")
+    parser.add_argument("--float-mode", choices=FLOAT_MODES, default="both")
+    parser.add_argument("--missing", type=int, action="append", default=[],
+                        help="FLOAT-Adresse liefert -1.0 (nicht verbauter Fühler)")
+    parser.add_argument("--strict-gaps", action="store_true",
+                        help="Nicht belegte Adressen liefern eine Modbus-Exception")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Requests einer Verbindung parallel beantworten")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+async def _main(args) -> None:
+    simulator = build_simulator(
+        unit_ids=args.unit_ids or (const.DEFAULT_UNIT_ID,),
+        float_mode=args.float_mode,
+        missing=set(args.missing),
+        strict_gaps=args.strict_gaps,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        drop_rate=args.drop,
+        concurrent=args.concurrent,
+        seed=args.seed,
+    )
+    await simulator.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(_main(_parse_args()))
+    except KeyboardInterrupt:
+        pass